@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from captura_multicanal import CapturaMulticanal
+from procesador_senial import ProcesadorSenial
+from detector_notas import DetectorNotas
+from analizador_multicanal import AnalizadorMulticanal
+from motor_analisis import MotorAnalisis
+from pool_analisis import PoolAnalisis
+
+
+def leer_fuente(texto):
+    """Convierte 'DISPOSITIVO:C1,C2,...' en (indice_dispositivo, [canales])."""
+    try:
+        dispositivo, canales = texto.split(':')
+        return int(dispositivo), [int(canal) for canal in canales.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fuente invalida '{texto}' (formato DISPOSITIVO:C1,C2,...)")
+
+
+def crear_parser():
+    """Define los argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Afinador de varios canales a la vez: un resultado por canal desde un solo proceso."
+    )
+    parser.add_argument('--fuente', type=leer_fuente, action='append', required=True,
+                        help="Dispositivo y canales (desde 0), p. ej. 3:0,1; se puede repetir")
+    parser.add_argument('--tasa', type=int, default=44100, help="Frecuencia de muestreo en Hz")
+    parser.add_argument('--ventana', type=int, default=4096, help="Muestras por ventana de analisis")
+    parser.add_argument('--salto', type=int, default=1024, help="Muestras entre analisis consecutivos")
+    parser.add_argument('--metodo', default='yin', help="Backend de pitch: piptrack, yin, mpm o espectral")
+    parser.add_argument('--umbral-rms', type=float, default=0.005, help="RMS minimo de la compuerta de cada canal")
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Procesos de deteccion con memoria compartida (0 = lote en el hilo de analisis)")
+    parser.add_argument('--refresco', type=float, default=10.0, help="Lineas de estado por segundo")
+    return parser
+
+
+def formatear_resultado(etiqueta, resultado):
+    """Texto de una columna de estado para un canal."""
+    if resultado is None or resultado['nota'] is None:
+        return f"[{etiqueta}] ---"
+    return f"[{etiqueta}] {resultado['nota']:>4} {resultado['cents']:+6.1f}c"
+
+
+def main():
+    """Captura y analiza todos los canales indicados hasta Ctrl+C."""
+    argumentos = crear_parser().parse_args()
+    ruta_notas = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'notas_referencia.json')
+
+    captura = CapturaMulticanal(argumentos.fuente, argumentos.tasa, argumentos.ventana,
+                                opciones_compuerta={'nivel_minimo': argumentos.umbral_rms})
+    procesador = ProcesadorSenial(argumentos.tasa, argumentos.ventana, argumentos.metodo)
+    detector = DetectorNotas(ruta_notas)
+    pool = None
+    if argumentos.procesos > 0:
+        pool = PoolAnalisis(argumentos.tasa, argumentos.ventana, argumentos.metodo, argumentos.procesos,
+                            canales=captura.canales_totales)
+    analizador = AnalizadorMulticanal(captura, procesador, detector, pool=pool)
+    motor = MotorAnalisis(analizador.analizar, captura, argumentos.salto)
+
+    if not captura.iniciar_stream():
+        if pool is not None:
+            pool.cerrar()
+        return 1
+    print(f"Analizando {captura.canales_totales} canales ({', '.join(captura.etiquetas)}). Ctrl+C para salir.")
+    motor.iniciar()
+
+    secuencias = [0] * captura.canales_totales
+    try:
+        while True:
+            time.sleep(1.0 / argumentos.refresco)
+            columnas = []
+            hay_cambios = False
+            for canal, etiqueta in enumerate(captura.etiquetas):
+                secuencia, resultado = analizador.obtener_resultado_canal(canal)
+                hay_cambios = hay_cambios or secuencia != secuencias[canal]
+                secuencias[canal] = secuencia
+                columnas.append(formatear_resultado(etiqueta, resultado))
+            if hay_cambios:
+                print('  '.join(columnas))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        motor.detener()
+        captura.detener_stream()
+        if pool is not None:
+            pool.cerrar()
+    print(f"\nLotes analizados: {motor.tramas_procesadas}, descartados: {motor.tramas_descartadas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from analisis_offline import analizar_archivo, TIPOS_PCM
+
+
+def crear_parser():
+    """Define los argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Analisis offline de archivos de audio: seguimiento de pitch, nota y cents por trama."
+    )
+    parser.add_argument('archivos', nargs='+', help="Archivos WAV, FLAC o PCM crudo (.raw/.pcm/.f32)")
+    parser.add_argument('--formato-salida', choices=['csv', 'npz'], default='csv',
+                        help="CSV o columnar comprimido (.npz, un array por columna)")
+    parser.add_argument('--directorio-salida', default=None,
+                        help="Directorio para los resultados (por defecto junto a cada archivo)")
+    parser.add_argument('--ventana', type=int, default=4096, help="Muestras por ventana de analisis")
+    parser.add_argument('--salto', type=int, default=1024, help="Muestras entre ventanas consecutivas")
+    parser.add_argument('--metodo', default='yin', help="Backend de pitch: piptrack, yin, mpm o espectral")
+    parser.add_argument('--umbral-rms', type=float, default=0.005, help="RMS minimo para analizar una trama")
+    parser.add_argument('--decimar', action='store_true',
+                        help="Decimar antes de la deteccion de pitch (mas rapido, refinado a tasa completa)")
+    parser.add_argument('--procesos', type=int, default=1,
+                        help="Procesos en paralelo (0 = uno por nucleo); con un solo archivo se reparten "
+                             "sus ventanas (memoria compartida)")
+    parser.add_argument('--tasa-raw', type=int, default=None, help="Tasa de muestreo de archivos PCM crudos")
+    parser.add_argument('--dtype-raw', choices=sorted(TIPOS_PCM), default='int16',
+                        help="Tipo de muestra de archivos PCM crudos (los .f32 son siempre float32)")
+    parser.add_argument('--canales-raw', type=int, default=1, help="Canales intercalados en archivos PCM crudos")
+    return parser
+
+
+def ruta_salida_para(archivo, argumentos):
+    """Calcula la ruta de salida de un archivo segun el directorio y formato elegidos."""
+    if argumentos.directorio_salida is None:
+        return None
+    base = os.path.splitext(os.path.basename(archivo))[0]
+    extension = '.pitch.csv' if argumentos.formato_salida == 'csv' else '.pitch.npz'
+    return os.path.join(argumentos.directorio_salida, base + extension)
+
+
+def main():
+    """Analiza todos los archivos indicados, opcionalmente repartidos en varios procesos."""
+    argumentos = crear_parser().parse_args()
+    ruta_notas = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'notas_referencia.json')
+    if argumentos.directorio_salida is not None:
+        os.makedirs(argumentos.directorio_salida, exist_ok=True)
+
+    opciones = dict(
+        formato_salida=argumentos.formato_salida,
+        tamanio_ventana=argumentos.ventana,
+        salto=argumentos.salto,
+        metodo_deteccion=argumentos.metodo,
+        umbral_rms=argumentos.umbral_rms,
+        tasa_raw=argumentos.tasa_raw,
+        dtype_raw=argumentos.dtype_raw,
+        canales_raw=argumentos.canales_raw,
+        decimar=argumentos.decimar,
+    )
+
+    procesos = argumentos.procesos if argumentos.procesos > 0 else os.cpu_count()
+    inicio = time.perf_counter()
+    errores = 0
+
+    if procesos == 1 or len(argumentos.archivos) == 1:
+        # Un solo archivo con varios procesos: se reparten sus ventanas en lugar de los archivos
+        opciones['procesos'] = procesos
+        for archivo in argumentos.archivos:
+            try:
+                salida, tramas = analizar_archivo(archivo, ruta_notas, ruta_salida_para(archivo, argumentos), **opciones)
+                print(f"{archivo}: {tramas} tramas -> {salida}")
+            except Exception as e:
+                errores += 1
+                print(f"Error al analizar {archivo}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = {
+                ejecutor.submit(analizar_archivo, archivo, ruta_notas,
+                                ruta_salida_para(archivo, argumentos), **opciones): archivo
+                for archivo in argumentos.archivos
+            }
+            for futuro in as_completed(futuros):
+                archivo = futuros[futuro]
+                try:
+                    salida, tramas = futuro.result()
+                    print(f"{archivo}: {tramas} tramas -> {salida}")
+                except Exception as e:
+                    errores += 1
+                    print(f"Error al analizar {archivo}: {e}")
+
+    print(f"{len(argumentos.archivos) - errores}/{len(argumentos.archivos)} archivos analizados "
+          f"en {time.perf_counter() - inicio:.1f} s")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
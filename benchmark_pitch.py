@@ -0,0 +1,203 @@
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from procesador_senial import ProcesadorSenial
+from detector_notas import DetectorNotas
+from backends_pitch import BACKENDS_PITCH
+from generador_senales import generar_caso, frecuencia_desafinada
+
+
+NOTAS_PRUEBA = ['E1', 'A1', 'E2', 'A2', 'D3', 'G3', 'B3', 'E4', 'A4', 'E5', 'A5']
+DESAFINACIONES_CENTS = [-30.0, -10.0, 0.0, 7.0, 25.0]
+TIPOS_SENIAL = ['puro', 'pulsado', 'ruidoso', 'bajo']
+
+# Tolerancias por defecto para marcar regresiones al comparar con una linea base
+TOLERANCIA_LATENCIA = 0.20      # +20 % en la mediana de latencia
+TOLERANCIA_CENTS = 1.0          # +1 cent en el percentil 95 del error
+TOLERANCIA_DETECCION = 0.02     # -2 puntos en la tasa de detección
+
+
+def crear_parser():
+    """Define los argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de velocidad y precisión del pipeline de pitch.")
+    parser.add_argument('--backends', nargs='+', default=sorted(BACKENDS_PITCH),
+                        help="Backends a evaluar")
+    parser.add_argument('--tamanios', nargs='+', type=int, default=[2048, 4096, 8192],
+                        help="Tamaños de buffer a evaluar")
+    parser.add_argument('--tasa', type=int, default=44100, help="Tasa de muestreo")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Repeticiones por caso para medir latencia")
+    parser.add_argument('--frecuencia-minima', type=float, default=35.0, help="Frecuencia mínima de búsqueda")
+    parser.add_argument('--frecuencia-maxima', type=float, default=2000.0, help="Frecuencia máxima de búsqueda")
+    parser.add_argument('--guardar', default=None, help="Guardar resultados como JSON (línea base)")
+    parser.add_argument('--comparar', default=None, help="JSON de línea base contra el cual comparar")
+    parser.add_argument('--tolerancia-latencia', type=float, default=TOLERANCIA_LATENCIA)
+    parser.add_argument('--tolerancia-cents', type=float, default=TOLERANCIA_CENTS)
+    parser.add_argument('--tolerancia-deteccion', type=float, default=TOLERANCIA_DETECCION)
+    return parser
+
+
+def generar_casos(detector, tamanio_buffer, tasa_muestreo):
+    """Genera de forma determinista los buffers de prueba con su frecuencia verdadera."""
+    casos = []
+    semilla = 0
+    for tipo in TIPOS_SENIAL:
+        for nota in NOTAS_PRUEBA:
+            for cents in DESAFINACIONES_CENTS:
+                frecuencia = frecuencia_desafinada(detector.notas_referencia[nota], cents)
+                buffer_audio = generar_caso(tipo, frecuencia, tamanio_buffer, tasa_muestreo, semilla=semilla)
+                casos.append((tipo, nota, frecuencia, buffer_audio))
+                semilla += 1
+    return casos
+
+
+def medir_backend(nombre_backend, tamanio_buffer, argumentos, detector):
+    """Mide latencia y precisión de un backend para un tamaño de buffer."""
+    procesador = ProcesadorSenial(argumentos.tasa, tamanio_buffer, nombre_backend)
+    casos = generar_casos(detector, tamanio_buffer, argumentos.tasa)
+
+    # Precalentamiento llamando al backend directamente para que un ImportError no quede silenciado
+    procesador.backend.detectar(
+        procesador.crear_trama(casos[0][3]), argumentos.frecuencia_minima, argumentos.frecuencia_maxima
+    )
+
+    latencias = []
+    errores_cents = []
+    detectados = 0
+    errores_octava = 0
+
+    for tipo, nota, frecuencia_real, buffer_audio in casos:
+        for _ in range(argumentos.repeticiones):
+            inicio = time.perf_counter()
+            frecuencia = procesador.detectar_frecuencia_fundamental(
+                buffer_audio, argumentos.frecuencia_minima, argumentos.frecuencia_maxima
+            )
+            detector.analizar_frecuencia(frecuencia)
+            latencias.append(time.perf_counter() - inicio)
+
+        if frecuencia is None or frecuencia <= 0:
+            continue
+        detectados += 1
+        error = 1200.0 * np.log2(frecuencia / frecuencia_real)
+        # Un error cercano a un múltiplo de 1200 cents es un error de octava
+        if abs(error) > 600.0:
+            errores_octava += 1
+        else:
+            errores_cents.append(abs(error))
+
+    latencias_ms = np.array(latencias) * 1000.0
+    errores = np.array(errores_cents) if errores_cents else np.array([np.nan])
+    return {
+        'backend': nombre_backend,
+        'tamanio_buffer': tamanio_buffer,
+        'casos': len(casos),
+        'latencia_ms': {
+            'p50': float(np.percentile(latencias_ms, 50)),
+            'p90': float(np.percentile(latencias_ms, 90)),
+            'p99': float(np.percentile(latencias_ms, 99)),
+            'max': float(latencias_ms.max()),
+        },
+        'buffers_por_segundo': float(len(latencias_ms) / (latencias_ms.sum() / 1000.0)),
+        'tiempo_real': float((tamanio_buffer / argumentos.tasa) / (np.median(latencias_ms) / 1000.0)),
+        'tasa_deteccion': detectados / len(casos),
+        'errores_octava': errores_octava,
+        'error_cents': {
+            'media': float(np.nanmean(errores)),
+            'p95': float(np.nanpercentile(errores, 95)),
+            'max': float(np.nanmax(errores)),
+        },
+    }
+
+
+def imprimir_resultados(resultados):
+    """Imprime una tabla resumen de los resultados."""
+    print(f"{'backend':<10} {'buffer':>6} {'p50 ms':>8} {'p99 ms':>8} {'buf/s':>8} "
+          f"{'detec':>6} {'octava':>6} {'|c| med':>8} {'|c| p95':>8}")
+    for r in resultados:
+        print(f"{r['backend']:<10} {r['tamanio_buffer']:>6} {r['latencia_ms']['p50']:>8.3f} "
+              f"{r['latencia_ms']['p99']:>8.3f} {r['buffers_por_segundo']:>8.0f} "
+              f"{r['tasa_deteccion']:>6.1%} {r['errores_octava']:>6} "
+              f"{r['error_cents']['media']:>8.2f} {r['error_cents']['p95']:>8.2f}")
+
+
+def comparar_con_base(resultados, ruta_base, argumentos):
+    """Compara con una línea base y retorna la lista de regresiones detectadas."""
+    with open(ruta_base, 'r', encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    base_por_clave = {(r['backend'], r['tamanio_buffer']): r for r in base['resultados']}
+
+    regresiones = []
+    for r in resultados:
+        anterior = base_por_clave.get((r['backend'], r['tamanio_buffer']))
+        if anterior is None:
+            continue
+        clave = f"{r['backend']}/{r['tamanio_buffer']}"
+
+        latencia, latencia_base = r['latencia_ms']['p50'], anterior['latencia_ms']['p50']
+        if latencia > latencia_base * (1.0 + argumentos.tolerancia_latencia):
+            regresiones.append(f"{clave}: latencia p50 {latencia_base:.3f} -> {latencia:.3f} ms")
+
+        error, error_base = r['error_cents']['p95'], anterior['error_cents']['p95']
+        if np.isfinite(error) and np.isfinite(error_base) and error > error_base + argumentos.tolerancia_cents:
+            regresiones.append(f"{clave}: error p95 {error_base:.2f} -> {error:.2f} cents")
+
+        deteccion, deteccion_base = r['tasa_deteccion'], anterior['tasa_deteccion']
+        if deteccion < deteccion_base - argumentos.tolerancia_deteccion:
+            regresiones.append(f"{clave}: detección {deteccion_base:.1%} -> {deteccion:.1%}")
+
+        if r['errores_octava'] > anterior['errores_octava']:
+            regresiones.append(f"{clave}: errores de octava {anterior['errores_octava']} -> {r['errores_octava']}")
+
+    return regresiones
+
+
+def main():
+    """Ejecuta el benchmark y opcionalmente guarda o compara con una línea base."""
+    argumentos = crear_parser().parse_args()
+    ruta_notas = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'notas_referencia.json')
+    detector = DetectorNotas(ruta_notas)
+
+    resultados = []
+    for nombre_backend in argumentos.backends:
+        for tamanio_buffer in argumentos.tamanios:
+            try:
+                resultados.append(medir_backend(nombre_backend, tamanio_buffer, argumentos, detector))
+            except ImportError as e:
+                print(f"Se omite {nombre_backend}: {e}")
+                break
+
+    imprimir_resultados(resultados)
+
+    if argumentos.guardar:
+        datos = {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'plataforma': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'tasa_muestreo': argumentos.tasa,
+            'resultados': resultados,
+        }
+        with open(argumentos.guardar, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, indent=2)
+        print(f"Resultados guardados en {argumentos.guardar}")
+
+    if argumentos.comparar:
+        regresiones = comparar_con_base(resultados, argumentos.comparar, argumentos)
+        if regresiones:
+            print("REGRESIONES DETECTADAS:")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            return 1
+        print("Sin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
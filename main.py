@@ -1,40 +1,183 @@
 import sys
 import os
 import time
+import argparse
+import asyncio
+import threading
+
+_INICIO_PROGRAMA = time.perf_counter()
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from tiempos_arranque import TiemposArranque
+
+TIEMPOS_ARRANQUE = TiemposArranque(_INICIO_PROGRAMA)
+
+# librosa y matplotlib no se importan aqui: se cargan de forma diferida
 from captura_audio import CapturaAudio
+from reproduccion_captura import ReproduccionCaptura, tasa_grabacion
+from compuerta_energia import CompuertaEnergia
 from procesador_senial import ProcesadorSenial
 from detector_notas import DetectorNotas
 from interfaz_grafica import InterfazGrafica
+from motor_analisis import MotorAnalisis
+from control_ritmo import ControlRitmo
+from servidor_afinacion import ServidorAfinacion
+from seguidor_pitch import SeguidorPitch
+from estroboscopio import Estroboscopio
+from pool_analisis import PoolAnalisis
+from metricas_rendimiento import MetricasRendimiento
+
+TIEMPOS_ARRANQUE.marcar('importaciones')
 
 
 class AfinadorInstrumentos:
     """Afinador de instrumentos musicales en tiempo real usando análisis de frecuencias."""
     
-    def __init__(self):
-        """Inicializa el afinador configurando todos los componentes necesarios."""
+    def __init__(self, con_interfaz=True, reproduccion=None, tiempo_real=True, metodo_deteccion='yin', procesos=0):
+        """
+        Inicializa el afinador configurando todos los componentes necesarios.
+        
+        Args:
+            con_interfaz: False para el modo sin interfaz (servidor de tramas)
+            reproduccion: Grabación a usar como fuente de audio en lugar del micrófono
+            tiempo_real: Con reproducción, entregar el audio a su ritmo real
+                (False: avanzar bloque a bloque con ejecutar_reproduccion)
+            metodo_deteccion: Backend de pitch ('yin', 'mpm', 'espectral' o 'piptrack')
+            procesos: Procesos de detección con memoria compartida (0 = en el hilo de análisis)
+        """
+        self.tiempos = TIEMPOS_ARRANQUE
         ruta_base = os.path.dirname(os.path.abspath(__file__))
         ruta_notas = os.path.join(ruta_base, 'data', 'notas_referencia.json')
         
         # Configuración de audio
         self.tasa_muestreo = 44100
-        self.tamanio_buffer = 4096
-        self.umbral_audio = 0.01
-        self.intervalo_actualizacion = 100  # ms
+        self.tamanio_buffer = 2048  # ventana corta: el seguidor de pitch aporta la estabilidad
+        self.periodos_ventana = 2  # en modo instrumento, la ventana crece hasta abarcar su cuerda más grave
+        self.salto_analisis = 512  # ventana deslizante: un analisis cada ~12 ms
+        self.umbral_rms = 0.005  # RMS minimo para abrir la compuerta de energia
+        self.frecuencia_minima = 50
+        self.frecuencia_maxima = 2000
+        self.fps_interfaz = 30  # refresco maximo de la interfaz, independiente del analisis
+        self.metodo_deteccion = metodo_deteccion
+        self.instrumento = None  # None = cromatico; 'guitarra', 'bajo', ... = solo sus cuerdas
+        self.modo_rasgueo = False  # con instrumento: todas las cuerdas de un acorde a la vez
+        self.tamanio_rasgueo = 16384  # ventana larga del modo rasgueo (a tasa completa)
+        self.modo_estroboscopio = False  # con la nota fijada: seguimiento de fase en lugar de detección
+        self.saltos_verificacion = 8  # en modo estroboscopio, una detección completa cada tantos saltos
+        if reproduccion is not None:
+            self.tasa_muestreo = tasa_grabacion(reproduccion, self.tasa_muestreo)
         
         # Inicializar componentes
-        self.captura = CapturaAudio(self.tasa_muestreo, self.tamanio_buffer)
-        self.procesador = ProcesadorSenial(self.tasa_muestreo, self.tamanio_buffer)
-        self.detector = DetectorNotas(ruta_notas)
-        self.interfaz = InterfazGrafica()
+        with self.tiempos.fase('procesador'):
+            self.procesador = ProcesadorSenial(
+                self.tasa_muestreo, self.tamanio_buffer, self.metodo_deteccion, self.salto_analisis,
+                decimar=True, frecuencia_maxima=self.frecuencia_maxima
+            )
+        
+        # Con procesos, la detección de pitch corre fuera del GIL de la interfaz y la captura.
+        # Se crean antes que cualquier hilo, y el backend se precalienta en cada proceso
+        self.pool = None
+        if procesos > 0:
+            with self.tiempos.fase('procesos'):
+                self.pool = PoolAnalisis(
+                    self.tasa_muestreo, self.tamanio_buffer, self.metodo_deteccion, procesos,
+                    frecuencia_minima=self.frecuencia_minima, frecuencia_maxima=self.frecuencia_maxima,
+                    salto=self.salto_analisis, decimar=True
+                )
+        # En vivo, con los procesos ocupados se descarta la ventana nueva; una
+        # reproducción sin tiempo real espera y analiza todos los saltos
+        self.descartar_en_pool = reproduccion is None or tiempo_real
+        
+        # Sin procesos, precalentar el backend en segundo plano mientras se construye la ventana
+        self.hilo_precalentamiento = None
+        if self.pool is None:
+            self.hilo_precalentamiento = threading.Thread(
+                target=self._precalentar_backend, name="Precalentamiento", daemon=True
+            )
+            self.hilo_precalentamiento.start()
+        
+        with self.tiempos.fase('captura'):
+            # La compuerta se actualiza en el callback de captura; con ella cerrada no se analiza
+            compuerta = CompuertaEnergia(self.tasa_muestreo, nivel_minimo=self.umbral_rms)
+            if reproduccion is not None:
+                # Bloques de un salto: en modo no tiempo real cada avance es exactamente un analisis
+                self.captura = ReproduccionCaptura(
+                    reproduccion, self.tasa_muestreo, self.tamanio_buffer, self.salto_analisis,
+                    tiempo_real=tiempo_real, compuerta=compuerta
+                )
+            else:
+                self.captura = CapturaAudio(self.tasa_muestreo, self.tamanio_buffer, compuerta=compuerta)
+        with self.tiempos.fase('detector'):
+            self.detector = DetectorNotas(ruta_notas)
+        self.interfaz = None
+        if con_interfaz:
+            with self.tiempos.fase('ventana'):
+                self.interfaz = InterfazGrafica()
+        
+        # Tiempos por etapa del camino caliente; cada ciclo tiene su presupuesto
+        self.metricas = MetricasRendimiento()
+        self.metricas.definir_presupuesto('ciclo_analisis', self.salto_analisis / self.tasa_muestreo)
+        self.metricas.definir_presupuesto('cuadro_interfaz', 1.0 / self.fps_interfaz)
+        
+        # El analisis corre en su propio hilo; la interfaz solo consulta el ultimo resultado
+        self.motor = MotorAnalisis(self.procesar_audio, self.captura, self.salto_analisis,
+                                   metricas=self.metricas)
+        self.metricas.agregar_contador_externo('tramas_descartadas', lambda: self.motor.tramas_descartadas)
+        self.metricas.agregar_contador_externo('tramas_silencio', lambda: self.motor.tramas_silencio)
+        self.metricas.agregar_contador_externo('desbordes_stream', lambda: self.captura.desbordes_stream)
+        self.ultima_secuencia = 0
+        # Estado entre análisis: suavizado, corrección de octava y reinicio en cada ataque
+        self.seguidor = SeguidorPitch(self.tasa_muestreo / self.salto_analisis)
+        self.aperturas_compuerta = 0
+        self.frecuencia_seguida = None  # última salida del seguidor, mientras el pool no entrega otra
+        self.nota_pendiente = False  # con pool: nota nueva cuyo primer resultado aún no llegó
+        self.estroboscopio = Estroboscopio()
+        self.saltos_estroboscopio = 0
+        self.info_estroboscopio = None
+        self.ritmo = ControlRitmo(self.fps_interfaz)
+        self.tramas_medicion_anterior = 0
+        # Cambios de modo pedidos desde la interfaz: el hilo de análisis los aplica al
+        # inicio de su siguiente ciclo. El diccionario se reemplaza completo, nunca se modifica
+        self._configuracion_pedida = {'instrumento': self.instrumento, 'rasgueo': self.modo_rasgueo,
+                                      'estroboscopio': self.modo_estroboscopio, 'reinicios_stream': 0}
+        self._configuracion_aplicada = self._configuracion_pedida
         
         # Configurar dispositivo de audio
-        self.captura.configurar_dispositivo()
-        self._configurar_dispositivos_interfaz()
+        with self.tiempos.fase('dispositivos'):
+            self.captura.configurar_dispositivo()
+            if self.interfaz is not None:
+                self._configurar_dispositivos_interfaz()
+        if self.interfaz is not None:
+            self.interfaz.configurar_instrumentos(list(self.detector.instrumentos), self.instrumento)
+            self.interfaz.establecer_callback_cambio_instrumento(self.cambiar_instrumento)
+            self.interfaz.establecer_callback_rasgueo(self.cambiar_modo_rasgueo)
+            self.interfaz.establecer_callback_estroboscopio(self.cambiar_modo_estroboscopio)
+            self.interfaz.metricas = self.metricas
         self.ejecutando = False
     
+    def _precalentar_backend(self):
+        """Ejecuta el backend de pitch sobre un buffer sintético (hilo de fondo)."""
+        try:
+            with self.tiempos.fase('precalentamiento'):
+                self.procesador.precalentar()
+        except Exception as e:
+            print(f"Error al precalentar el backend: {e}")
+    
+    def _crear_espectro_diferido(self):
+        """Carga matplotlib y crea el espectro una vez que la ventana ya es visible."""
+        self.tiempos.marcar('ventana_visible')
+        with self.tiempos.fase('espectro'):
+            self.interfaz.crear_espectro()
+        self._reportar_arranque()
+    
+    def _reportar_arranque(self):
+        """Imprime el desglose de arranque cuando termina el precalentamiento."""
+        if self.hilo_precalentamiento is not None and self.hilo_precalentamiento.is_alive():
+            self.interfaz.ventana.after(50, self._reportar_arranque)
+            return
+        self.tiempos.imprimir()
+    
     def _configurar_dispositivos_interfaz(self):
         """Configura la lista de dispositivos de audio en la interfaz gráfica."""
         dispositivos_entrada = self.captura.obtener_dispositivos_entrada()
@@ -47,74 +190,471 @@ class AfinadorInstrumentos:
         """Cambia el dispositivo de entrada de audio."""
         print(f"Cambiando a dispositivo: {indice_dispositivo}")
         self.captura.configurar_dispositivo(indice_dispositivo)
+        if self.ejecutando:
+            self.captura.iniciar_stream()
+            # El procesador, el seguidor y el estroboscopio se reinician en el hilo de análisis
+            self._pedir_configuracion(reinicios_stream=self._configuracion_pedida['reinicios_stream'] + 1)
+            self.motor.reiniciar_posicion()
         
-    def procesar_audio(self):
-        """Procesa un ciclo completo de captura y analisis de audio."""
-        buffer = self.captura.capturar_buffer()
-        
-        if buffer is None:
-            return None, None, None
-        
-        if not self.captura.audio_supera_umbral(self.umbral_audio):
-            return None, None, None
-        
-        # Detectar frecuencia usando Librosa
-        frecuencia = self.procesador.detectar_frecuencia_fundamental(buffer)
-        info_afinacion = self.detector.analizar_frecuencia(frecuencia)
-        frecuencias, magnitudes = self.procesador.obtener_espectro_completo(buffer)
-        
-        return info_afinacion, frecuencias, magnitudes
+    def cambiar_instrumento(self, nombre_instrumento):
+        """Pide el modo instrumento (banco de filtros sobre sus cuerdas) o el cromatico si es None."""
+        print(f"Modo de afinación: {nombre_instrumento or 'cromático'}")
+        self._pedir_configuracion(instrumento=nombre_instrumento)
     
-    def bucle_principal(self):
-        """Bucle principal que actualiza continuamente la interfaz con datos de audio."""
-        if not self.ejecutando:
+    def _pedir_configuracion(self, **cambios):
+        """Publica una configuración nueva para el hilo de análisis (llamado desde la interfaz)."""
+        configuracion = dict(self._configuracion_pedida)
+        configuracion.update(cambios)
+        self._configuracion_pedida = configuracion
+    
+    def _aplicar_configuracion(self):
+        """Aplica la última configuración pedida; solo el hilo de análisis modifica su estado."""
+        pedida = self._configuracion_pedida
+        anterior = self._configuracion_aplicada
+        if pedida is anterior:
             return
+        self._configuracion_aplicada = pedida
+        if pedida['reinicios_stream'] != anterior['reinicios_stream']:
+            self.procesador.reiniciar_stream()
+            self.seguidor.reiniciar()
+            self.frecuencia_seguida = None
+            self.estroboscopio.liberar()
+        if pedida['estroboscopio'] != anterior['estroboscopio']:
+            self.estroboscopio.liberar()
+            self.modo_estroboscopio = pedida['estroboscopio']
+        cambio_instrumento = pedida['instrumento'] != anterior['instrumento']
+        self.instrumento = pedida['instrumento']
+        cuerdas = self.detector.frecuencias_instrumento(self.instrumento) if self.instrumento else None
+        if cambio_instrumento:
+            self.procesador.configurar_instrumento(cuerdas)
+            self.procesador.configurar_ventana(self._tamanio_ventana(cuerdas))
+            self.captura.tamanio_buffer = self.procesador.tamanio_buffer
+            if self.pool is not None:
+                self.pool.configurar(cuerdas=cuerdas, tamanio_ventana=self.procesador.tamanio_buffer)
+            self.seguidor.reiniciar()
+            self.frecuencia_seguida = None
+            self.estroboscopio.liberar()
+        if cambio_instrumento or pedida['rasgueo'] != anterior['rasgueo']:
+            # El banco y la ventana del rasgueo se reemplazan juntos, entre dos ciclos
+            self.modo_rasgueo = pedida['rasgueo']
+            self.procesador.configurar_rasgueo(cuerdas if self.modo_rasgueo else None, self.tamanio_rasgueo)
+    
+    def _tamanio_ventana(self, cuerdas=None):
+        """
+        Ventana de detección para las cuerdas indicadas (None = modo cromático).
         
-        info_afinacion, frecuencias, magnitudes = self.procesar_audio()
+        Returns:
+            La ventana corta por defecto, duplicada hasta contener
+            periodos_ventana periodos de la cuerda más grave
+        """
+        tamanio = self.tamanio_buffer
+        if cuerdas:
+            muestras_minimas = self.periodos_ventana * self.tasa_muestreo / min(cuerdas.values())
+            while tamanio < muestras_minimas:
+                tamanio *= 2
+        return tamanio
+    
+    def cambiar_modo_rasgueo(self, activo):
+        """Pide activar o desactivar el modo rasgueo; solo tiene efecto con un instrumento elegido."""
+        if activo and not self._configuracion_pedida['instrumento']:
+            print("El modo rasgueo requiere elegir un instrumento")
+        self._pedir_configuracion(rasgueo=activo)
+    
+    def cambiar_modo_estroboscopio(self, activo):
+        """Pide activar o desactivar el modo estroboscopio; la nota se fija tras varias detecciones iguales."""
+        self._pedir_configuracion(estroboscopio=activo)
+    
+    def _leer_estroboscopio(self):
+        """
+        Lectura barata de un salto con la nota fijada: solo el avance de fase en la ventana de detección.
+        
+        Returns:
+            Información de afinación de la nota fijada, o None si toca una
+            detección completa (nota sin fijar, fase perdida o salto de verificación)
+        """
+        if not self.estroboscopio.fijado:
+            return None
+        muestras, tasa, posicion = self.procesador.ventana_deteccion()
+        cents = self.estroboscopio.actualizar(muestras, tasa, posicion)
+        self.saltos_estroboscopio += 1
+        if cents is None or self.saltos_estroboscopio % self.saltos_verificacion == 0:
+            return None
+        return self._aplicar_estroboscopio(dict(self.info_estroboscopio))
+    
+    def _aplicar_estroboscopio(self, info_afinacion):
+        """Reemplaza la desviación de la información por la lectura del estroboscopio."""
+        cents = self.estroboscopio.cents
+        if cents is not None:
+            info_afinacion['cents'] = cents
+            info_afinacion['frecuencia_detectada'] = self.estroboscopio.frecuencia_referencia * 2.0 ** (cents / 1200.0)
+            info_afinacion['estado'] = self.detector.obtener_estado_afinacion(cents)
+            info_afinacion['estroboscopio'] = self.estroboscopio.fase
+        return info_afinacion
+    
+    def _analizar_rasgueo(self):
+        """
+        Afinación de todas las cuerdas del acorde en la ventana larga.
         
-        if info_afinacion is not None:
-            self.interfaz.actualizar_interfaz(info_afinacion, frecuencias, magnitudes)
+        Returns:
+            Información de la cuerda más desafinada entre las que suenan, con la
+            lista de todas las cuerdas en 'cuerdas'; None si la ventana no está lista
+        """
+        cuerdas = self.procesador.detectar_cuerdas()
+        if cuerdas is None:
+            return None
+        resultados = self.detector.analizar_cuerdas(cuerdas)
+        presentes = [resultado for resultado in resultados if resultado['estado'] != 'sin_audio']
+        if presentes:
+            info_afinacion = dict(max(presentes, key=lambda resultado: abs(resultado['cents'])))
         else:
-            # Mostrar estado sin audio
-            info_vacia = {
+            info_afinacion = {
                 'nota': None,
                 'nota_espaniol': None,
-                'frecuencia_detectada': 0.0,
+                'frecuencia_detectada': None,
                 'frecuencia_referencia': None,
                 'cents': 0.0,
                 'estado': 'sin_audio'
             }
-            self.interfaz.actualizar_interfaz(info_vacia)
+        info_afinacion['cuerdas'] = resultados
+        return info_afinacion
+    
+    def _detectar_en_pool(self, saltos):
+        """
+        Envía las ventanas de los saltos completados a los procesos de análisis
+        sin esperar sus resultados: hasta en_vuelo tareas corren a la vez.
+        
+        Args:
+            saltos: Saltos completados en este ciclo
         
-        self.interfaz.ventana.after(self.intervalo_actualizacion, self.bucle_principal)
+        Returns:
+            Frecuencias de los saltos ya terminados, en orden (vacía si aún no
+            terminó ninguno)
+        """
+        # Misma alineación que la ventana deslizante del procesador
+        posicion = self.pool.total_escrito - self.procesador.ventana_deslizante.muestras_parcial
+        if self.descartar_en_pool:
+            # Con el pool lleno se envía igual la última, que se descarta y queda contada
+            saltos = min(saltos, max(self.pool.en_vuelo - self.pool.tareas_en_vuelo, 1))
+        for saltos_atras in reversed(range(saltos)):
+            self.pool.enviar(posicion - saltos_atras * self.salto_analisis, bloquear=not self.descartar_en_pool)
+        return [resultado[0] if resultado is not None else None
+                for _, resultado in self.pool.recoger()]
     
-    def iniciar(self):
-        """Inicia la ejecución del afinador."""
+    def procesar_audio(self):
+        """Procesa un ciclo completo de captura y analisis de audio."""
+        if self.hilo_precalentamiento is not None and self.hilo_precalentamiento.is_alive():
+            # El precalentamiento usa los mismos espacios de trabajo del procesador
+            self.hilo_precalentamiento.join()
+        self._aplicar_configuracion()
+        metricas = self.metricas
+        inicio = time.perf_counter()
+        if self.captura.stream_activo():
+            # Ventana deslizante: se agregan las muestras nuevas y se analiza la ventana larga.
+            # Tras un silencio solo interesa la ultima ventana, no todo lo acumulado
+            en_rasgueo = self.procesador.ventana_rasgueo is not None
+            nuevas = self.captura.leer_nuevas_muestras(self.tamanio_rasgueo if en_rasgueo else self.procesador.tamanio_buffer)
+            inicio = metricas.registrar('captura', inicio)
+            saltos = self.procesador.agregar_muestras(nuevas)
+            if self.pool is not None:
+                # Todo bloque llega al buffer compartido, aunque este salto no use los procesos
+                self.pool.escribir(nuevas)
+            inicio = metricas.registrar('ventana', inicio)
+            if saltos == 0:
+                return None, None, None
+            aperturas = self.captura.compuerta.aperturas
+            if self.modo_estroboscopio and not en_rasgueo:
+                # Una nota nueva suelta la fijada; entre verificaciones basta el avance de fase
+                if aperturas != self.aperturas_compuerta:
+                    self.estroboscopio.liberar()
+                info_afinacion = self._leer_estroboscopio()
+                inicio = metricas.registrar('estroboscopio', inicio)
+                if info_afinacion is not None:
+                    # Sin espectro: la interfaz conserva el último
+                    return info_afinacion, None, None
+            trama = self.procesador.crear_trama(self.procesador.ventana_actual())
+            if en_rasgueo:
+                info_afinacion = self._analizar_rasgueo()
+                inicio = metricas.registrar('rasgueo', inicio)
+                if info_afinacion is None:
+                    return None, None, None
+                frecuencias, magnitudes = self.procesador.obtener_espectro_completo(trama)
+                metricas.registrar('espectro', inicio)
+                return info_afinacion, frecuencias, magnitudes
+            # Cada apertura de la compuerta es una nota nueva: el seguidor parte de cero
+            nota_nueva = aperturas != self.aperturas_compuerta
+            self.aperturas_compuerta = aperturas
+            if self.pool is not None:
+                if nota_nueva:
+                    # Los resultados terminados durante el silencio son de la nota anterior
+                    self.pool.recoger()
+                    self.frecuencia_seguida = None
+                # La nota nueva espera al primer resultado que llegue
+                nota_nueva = self.nota_pendiente = self.nota_pendiente or nota_nueva
+                frecuencias = self._detectar_en_pool(saltos)
+            else:
+                # La detección usa la ventana decimada; el espectro, la de tasa completa
+                trama_pitch = self.procesador.trama_pitch_actual(trama)
+                frecuencias = [self.procesador.detectar_frecuencia_fundamental(
+                    trama_pitch, self.frecuencia_minima, self.frecuencia_maxima
+                )]
+            inicio = metricas.registrar('pitch', inicio)
+            if frecuencias:
+                for frecuencia in frecuencias:
+                    frecuencia = self.seguidor.actualizar(frecuencia, self.procesador.nivel_salto_db(), nota_nueva)
+                    nota_nueva = False
+                self.nota_pendiente = False
+                self.frecuencia_seguida = frecuencia
+            else:
+                # Ningún proceso terminó en este ciclo: se mantiene la última frecuencia
+                frecuencia = self.frecuencia_seguida
+            inicio = metricas.registrar('seguidor', inicio)
+        else:
+            buffer = self.captura.capturar_buffer()
+            inicio = metricas.registrar('captura', inicio)
+            
+            if buffer is None:
+                return None, None, None
+            
+            if not self.captura.senial_presente():
+                return None, None, None
+            
+            # Una sola trama por buffer: la detección y el espectro comparten la FFT
+            trama = self.procesador.crear_trama(buffer)
+            # Buffers sueltos, sin continuidad entre ellos: no se usa el seguidor
+            frecuencia = self.procesador.detectar_frecuencia_fundamental(
+                trama, self.frecuencia_minima, self.frecuencia_maxima
+            )
+            inicio = metricas.registrar('pitch', inicio)
+        
+        info_afinacion = self.detector.analizar_frecuencia(frecuencia, self.instrumento)
+        if self.modo_estroboscopio and self.captura.stream_activo():
+            # La detección completa fija la nota del estroboscopio o confirma la fijada
+            fijado = self.estroboscopio.proponer(
+                info_afinacion['nota'], info_afinacion['frecuencia_referencia'], info_afinacion['cents']
+            )
+            if fijado:
+                self.info_estroboscopio = info_afinacion
+                info_afinacion = self._aplicar_estroboscopio(dict(info_afinacion))
+        inicio = metricas.registrar('nota', inicio)
+        frecuencias, magnitudes = self.procesador.obtener_espectro_completo(trama)
+        metricas.registrar('espectro', inicio)
+        
+        return info_afinacion, frecuencias, magnitudes
+    
+    def bucle_principal(self):
+        """Bucle de la interfaz: muestra el ultimo resultado publicado por el motor de analisis."""
+        if not self.ejecutando:
+            return
+        
+        inicio = time.perf_counter()
+        secuencia, resultado = self.motor.obtener_ultimo_resultado()
+        cuadro_dibujado = secuencia != self.ultima_secuencia
+        
+        # Solo se redibuja cuando el motor publico un resultado nuevo
+        if cuadro_dibujado:
+            self.ultima_secuencia = secuencia
+            info_afinacion, frecuencias, magnitudes = resultado
+            
+            if info_afinacion is not None:
+                self.interfaz.actualizar_interfaz(info_afinacion, frecuencias, magnitudes)
+            else:
+                # Mostrar estado sin audio
+                info_vacia = {
+                    'nota': None,
+                    'nota_espaniol': None,
+                    'frecuencia_detectada': 0.0,
+                    'frecuencia_referencia': None,
+                    'cents': 0.0,
+                    'estado': 'sin_audio'
+                }
+                self.interfaz.actualizar_interfaz(info_vacia)
+            self.metricas.registrar('cuadro_interfaz', inicio)
+        
+        if self.ritmo.registrar_ciclo(cuadro_dibujado):
+            tramas = self.motor.tramas_procesadas
+            tasa_analisis = (tramas - self.tramas_medicion_anterior) / self.ritmo.duracion_medicion
+            self.tramas_medicion_anterior = tramas
+            self.interfaz.actualizar_rendimiento(
+                self.ritmo.fps, tasa_analisis, self.motor.tramas_descartadas,
+                self.captura.compuerta.piso_ruido_db
+            )
+            if self.interfaz.metricas_visibles:
+                self.interfaz.mostrar_metricas(self.metricas.texto())
+        
+        self.interfaz.ventana.after(self.ritmo.retraso_siguiente_ms(), self.bucle_principal)
+    
+    def _imprimir_configuracion(self):
+        """Muestra la configuración activa al iniciar."""
         print("="*50)
         print("AFINADOR DE INSTRUMENTOS MUSICALES")
         print("="*50)
         print(f"Tasa de muestreo: {self.tasa_muestreo} Hz")
-        print(f"Tamaño de buffer: {self.tamanio_buffer} muestras")
-        print(f"Método de detección: Librosa (piptrack)")
-        print(f"Intervalo de actualización: {self.intervalo_actualizacion} ms")
+        print(f"Tamaño de buffer: {self.tamanio_buffer} muestras (salto de {self.salto_analisis})")
+        print(f"Método de detección: {self.metodo_deteccion}")
+        print(f"Refresco máximo de la interfaz: {self.fps_interfaz} fps")
         print("="*50)
         print("Toca una nota de tu instrumento para comenzar...\n")
+    
+    def iniciar(self):
+        """Inicia la ejecución del afinador."""
+        self._imprimir_configuracion()
+        
+        # Stream persistente: evita reabrir el dispositivo en cada ciclo
+        if not self.captura.iniciar_stream():
+            print("Usando captura por bloques (sd.rec) como alternativa")
         
         self.ejecutando = True
-        self.interfaz.ventana.after(self.intervalo_actualizacion, self.bucle_principal)
+        self.motor.iniciar()
+        self.interfaz.ventana.after_idle(self._crear_espectro_diferido)
+        self.interfaz.ventana.after(self.ritmo.retraso_siguiente_ms(), self.bucle_principal)
         self.interfaz.iniciar()
+        
+        self.motor.detener()
+        self.captura.detener_stream()
+        print(f"Tramas analizadas: {self.motor.tramas_procesadas}, "
+              f"descartadas: {self.motor.tramas_descartadas}, "
+              f"en silencio: {self.motor.tramas_silencio}")
+    
+    def iniciar_servidor(self, servidor):
+        """
+        Modo sin interfaz: analiza y difunde las tramas de afinación por socket hasta Ctrl+C.
+        
+        Args:
+            servidor: ServidorAfinacion que recibe cada resultado publicado por el motor
+        """
+        self._imprimir_configuracion()
+        if not self.captura.iniciar_stream():
+            print("Usando captura por bloques (sd.rec) como alternativa")
+        
+        self.ejecutando = True
+        self.motor.agregar_suscriptor(servidor.publicar)
+        self.motor.iniciar()
+        try:
+            asyncio.run(servidor.ejecutar())
+        finally:
+            self.ejecutando = False
+            self.motor.detener()
+            self.captura.detener_stream()
+            print(f"Tramas analizadas: {self.motor.tramas_procesadas}, "
+                  f"difundidas: {servidor.tramas_difundidas}")
+    
+    def ejecutar_reproduccion(self):
+        """
+        Pasa una grabación por el pipeline tan rápido como sea posible, sin hilos.
+        
+        Cada bloque de la reproducción es un salto de análisis, de modo que la
+        secuencia de análisis es la misma en cada ejecución: sirve para perfilar
+        y para comparar resultados entre versiones sin micrófono.
+        """
+        self._imprimir_configuracion()
+        if not self.captura.iniciar_stream():
+            return
+        
+        notas = {}
+        analisis = 0
+        inicio_reproduccion = time.perf_counter()
+        while self.captura.avanzar():
+            # Igual que MotorAnalisis: con la compuerta cerrada no se analiza
+            if not self.captura.senial_presente():
+                continue
+            inicio = time.perf_counter()
+            info_afinacion, _, _ = self.procesar_audio()
+            self.metricas.registrar('ciclo_analisis', inicio)
+            analisis += 1
+            if info_afinacion is not None and info_afinacion['nota'] is not None:
+                notas[info_afinacion['nota']] = notas.get(info_afinacion['nota'], 0) + 1
+        duracion = time.perf_counter() - inicio_reproduccion
+        
+        segundos_audio = self.captura.total_muestras() / self.tasa_muestreo
+        print(f"Reproducidos {segundos_audio:.1f} s de audio en {duracion:.2f} s "
+              f"({segundos_audio / max(duracion, 1e-9):.1f}x tiempo real), {analisis} análisis")
+        for nota, cantidad in sorted(notas.items(), key=lambda item: -item[1]):
+            print(f"  {nota:<4} {cantidad}")
     
     def detener(self):
         """Detiene la ejecución del afinador."""
         self.ejecutando = False
-        self.interfaz.cerrar()
+        self.motor.detener()
+        self.captura.detener_stream()
+        if self.pool is not None:
+            self.pool.cerrar()
+        if self.interfaz is not None:
+            self.interfaz.cerrar()
+
+
+def crear_parser():
+    """Define los argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(description="Afinador de instrumentos musicales en tiempo real.")
+    parser.add_argument('--metodo', default='yin', help="Backend de pitch: yin, mpm, espectral o piptrack")
+    parser.add_argument('--servidor', action='store_true',
+                        help="Sin interfaz: difunde las tramas de afinacion por TCP y/o socket Unix")
+    parser.add_argument('--host', default='127.0.0.1', help="Interfaz TCP de escucha del servidor")
+    parser.add_argument('--puerto', type=int, default=None, help="Puerto TCP del servidor (por defecto 8765)")
+    parser.add_argument('--unix', default=None, help="Ruta de socket Unix del servidor")
+    parser.add_argument('--formato', choices=['json', 'binario'], default='json',
+                        help="Tramas JSON por linea o binarias con prefijo de longitud")
+    parser.add_argument('--bins-espectro', type=int, default=0,
+                        help="Valores de espectro reducido por trama (0 = sin espectro)")
+    parser.add_argument('--metricas', default=None,
+                        help="Archivo JSON donde volcar periodicamente los tiempos por etapa")
+    parser.add_argument('--periodo-metricas', type=float, default=5.0,
+                        help="Segundos entre volcados de metricas")
+    parser.add_argument('--overlay', action='store_true',
+                        help="Muestra los tiempos por etapa sobre la interfaz (alternar con F3)")
+    parser.add_argument('--grabar', default=None,
+                        help="Graba el audio crudo capturado (float32, p. ej. captura.f32)")
+    parser.add_argument('--reproducir', default=None,
+                        help="Usa una grabacion (.f32, WAV, ...) como fuente en lugar del microfono")
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Procesos para la deteccion de pitch con memoria compartida (0 = en el hilo de "
+                             "analisis); util con backends pesados como piptrack")
+    parser.add_argument('--rapido', action='store_true',
+                        help="Con --reproducir: sin interfaz, tan rapido como sea posible y determinista")
+    return parser
+
+
+def ejecutar_afinador(afinador, argumentos, ejecucion):
+    """Ejecuta el afinador grabando y volcando las métricas si se pidió."""
+    if argumentos.grabar:
+        afinador.captura.iniciar_grabacion(argumentos.grabar)
+    if argumentos.metricas:
+        afinador.metricas.iniciar_volcado(argumentos.metricas, argumentos.periodo_metricas)
+    try:
+        ejecucion()
+    finally:
+        afinador.captura.detener_grabacion()
+        if afinador.pool is not None:
+            afinador.pool.cerrar()
+        if argumentos.metricas:
+            afinador.metricas.detener_volcado()
+            afinador.metricas.volcar_json(argumentos.metricas)
 
 
 def main():
     """Función principal que crea e inicia el afinador."""
+    argumentos = crear_parser().parse_args()
     try:
-        afinador = AfinadorInstrumentos()
-        afinador.iniciar()
+        if argumentos.reproducir and argumentos.rapido:
+            afinador = AfinadorInstrumentos(con_interfaz=False, reproduccion=argumentos.reproducir,
+                                            tiempo_real=False, metodo_deteccion=argumentos.metodo,
+                                            procesos=argumentos.procesos)
+            ejecutar_afinador(afinador, argumentos, afinador.ejecutar_reproduccion)
+        elif argumentos.servidor:
+            puerto = argumentos.puerto
+            if puerto is None and argumentos.unix is None:
+                puerto = 8765
+            servidor = ServidorAfinacion(argumentos.formato, argumentos.bins_espectro,
+                                         argumentos.host, puerto, argumentos.unix)
+            afinador = AfinadorInstrumentos(con_interfaz=False, reproduccion=argumentos.reproducir,
+                                            metodo_deteccion=argumentos.metodo,
+                                            procesos=argumentos.procesos)
+            ejecutar_afinador(afinador, argumentos, lambda: afinador.iniciar_servidor(servidor))
+        else:
+            afinador = AfinadorInstrumentos(reproduccion=argumentos.reproducir, metodo_deteccion=argumentos.metodo,
+                                            procesos=argumentos.procesos)
+            if argumentos.overlay:
+                afinador.interfaz.alternar_metricas()
+            ejecutar_afinador(afinador, argumentos, afinador.iniciar)
     except KeyboardInterrupt:
         print("\n\nAfinador detenido por el usuario.")
     except Exception as e:
@@ -0,0 +1,359 @@
+import csv
+import os
+import struct
+
+import numpy as np
+
+from procesador_senial import ProcesadorSenial
+from detector_notas import DetectorNotas
+from grabador_captura import leer_metadatos
+from pool_analisis import PoolAnalisis
+
+
+# Tipos de muestra PCM que pueden mapearse directamente en memoria
+TIPOS_PCM = {
+    'int8': np.int8,
+    'uint8': np.uint8,
+    'int16': np.int16,
+    'int32': np.int32,
+    'float32': np.float32,
+    'float64': np.float64,
+}
+
+COLUMNAS_SALIDA = ['tiempo', 'frecuencia', 'nota', 'cents', 'estado', 'rms']
+
+
+def _escala_pcm(dtype):
+    """Factor y desplazamiento para llevar muestras enteras al rango [-1, 1]."""
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return 1.0, 0.0
+    if dtype.kind == 'u':
+        mitad = 2 ** (8 * dtype.itemsize - 1)
+        return 1.0 / mitad, -1.0
+    return 1.0 / 2 ** (8 * dtype.itemsize - 1), 0.0
+
+
+def leer_cabecera_wav(ruta):
+    """
+    Recorre los chunks RIFF de un WAV para localizar el formato y los datos.
+
+    Returns:
+        Diccionario con 'tasa_muestreo', 'canales', 'bits', 'formato',
+        'inicio_datos' y 'bytes_datos'
+    """
+    with open(ruta, 'rb') as archivo:
+        riff, _, wave_id = struct.unpack('<4sI4s', archivo.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"{ruta} no es un archivo WAV valido")
+
+        info = {}
+        while True:
+            cabecera = archivo.read(8)
+            if len(cabecera) < 8:
+                break
+            identificador, tamanio = struct.unpack('<4sI', cabecera)
+            if identificador == b'fmt ':
+                datos_formato = archivo.read(tamanio)
+                formato, canales, tasa, _, _, bits = struct.unpack('<HHIIHH', datos_formato[:16])
+                if formato == 0xFFFE and len(datos_formato) >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE: el subformato esta al inicio del GUID
+                    formato = struct.unpack('<H', datos_formato[24:26])[0]
+                info.update(formato=formato, canales=canales, tasa_muestreo=tasa, bits=bits)
+            elif identificador == b'data':
+                info.update(inicio_datos=archivo.tell(), bytes_datos=tamanio)
+                break
+            else:
+                archivo.seek(tamanio + (tamanio & 1), os.SEEK_CUR)
+
+    if 'formato' not in info or 'inicio_datos' not in info:
+        raise ValueError(f"{ruta}: WAV sin chunks 'fmt ' o 'data'")
+    return info
+
+
+def _bloques_memmap(ruta, dtype, canales, inicio, total_frames, tamanio_bloque):
+    """Genera bloques mono float32 leyendo un archivo PCM mapeado en memoria."""
+    datos = np.memmap(ruta, dtype=dtype, mode='r', offset=inicio, shape=(total_frames, canales))
+    escala, desplazamiento = _escala_pcm(dtype)
+    for inicio_bloque in range(0, total_frames, tamanio_bloque):
+        bloque = datos[inicio_bloque:inicio_bloque + tamanio_bloque]
+        # Mezcla a mono; solo el bloque actual se carga en RAM
+        mono = bloque.mean(axis=1, dtype=np.float64) if canales > 1 else bloque[:, 0]
+        yield (mono * escala + desplazamiento).astype(np.float32)
+
+
+def _bloques_wav_24(ruta, canales, inicio, total_frames, tamanio_bloque):
+    """Genera bloques mono float32 de un WAV PCM de 24 bits (no mapeable como dtype nativo)."""
+    bytes_frame = 3 * canales
+    with open(ruta, 'rb') as archivo:
+        archivo.seek(inicio)
+        for _ in range(0, total_frames, tamanio_bloque):
+            crudo = np.frombuffer(archivo.read(tamanio_bloque * bytes_frame), dtype=np.uint8)
+            crudo = crudo[:len(crudo) - len(crudo) % bytes_frame].reshape(-1, 3)
+            enteros = (crudo[:, 0].astype(np.int32)
+                       | (crudo[:, 1].astype(np.int32) << 8)
+                       | (crudo[:, 2].astype(np.int8).astype(np.int32) << 16))
+            muestras = enteros.reshape(-1, canales) / float(2 ** 23)
+            yield muestras.mean(axis=1).astype(np.float32)
+
+
+def _bloques_con_huecos(bloques, huecos, tamanio_bloque):
+    """
+    Reinserta como silencio los huecos de una grabación de GrabadorCaptura.
+
+    Args:
+        bloques: Bloques de las muestras que llegaron al archivo
+        huecos: Lista [muestra del stream, muestras perdidas] de los metadatos
+        tamanio_bloque: Muestras por bloque de salida (se conserva aunque un hueco caiga dentro de uno)
+
+    Returns:
+        Generador de bloques float32 con la línea de tiempo del stream original
+    """
+    def piezas():
+        pendientes = sorted((int(inicio), int(longitud)) for inicio, longitud in huecos)
+        indice = 0
+        posicion = 0  # en muestras del stream original, contando los huecos
+        for bloque in bloques:
+            inicio = 0
+            while inicio < len(bloque):
+                if indice < len(pendientes) and pendientes[indice][0] <= posicion:
+                    longitud = pendientes[indice][1]
+                    yield np.zeros(longitud, dtype=np.float32)
+                    posicion += longitud
+                    indice += 1
+                    continue
+                fin = len(bloque)
+                if indice < len(pendientes):
+                    fin = min(fin, inicio + pendientes[indice][0] - posicion)
+                yield bloque[inicio:fin]
+                posicion += fin - inicio
+                inicio = fin
+        for _, longitud in pendientes[indice:]:
+            yield np.zeros(longitud, dtype=np.float32)
+
+    salida = np.empty(tamanio_bloque, dtype=np.float32)
+    llenas = 0
+    for pieza in piezas():
+        while len(pieza):
+            tomar = min(tamanio_bloque - llenas, len(pieza))
+            salida[llenas:llenas + tomar] = pieza[:tomar]
+            llenas += tomar
+            pieza = pieza[tomar:]
+            if llenas == tamanio_bloque:
+                yield salida.copy()
+                llenas = 0
+    if llenas:
+        yield salida[:llenas].copy()
+
+
+def abrir_audio(ruta, tamanio_bloque, tasa_raw=None, dtype_raw='int16', canales_raw=1):
+    """
+    Abre un archivo de audio para lectura por bloques sin cargarlo completo.
+
+    WAV y PCM crudo se mapean en memoria; FLAC y otros formatos se leen por
+    bloques con soundfile si esta instalado. Los .f32 son grabaciones de
+    GrabadorCaptura: float32, con la tasa y los canales en su JSON (si lo
+    tienen, prevalece sobre tasa_raw y canales_raw); los bloques que la
+    grabación descartó se devuelven como silencio de la misma duración.
+
+    Returns:
+        Tupla (tasa_muestreo, generador de bloques mono float32)
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in ('.raw', '.pcm', '.f32'):
+        metadatos = None
+        if extension == '.f32':
+            dtype_raw = 'float32'
+            metadatos = leer_metadatos(ruta)
+            if metadatos is not None:
+                tasa_raw = metadatos['tasa_muestreo']
+                canales_raw = metadatos.get('canales', canales_raw)
+        if tasa_raw is None:
+            raise ValueError("Los archivos PCM crudos requieren indicar la tasa de muestreo")
+        dtype = np.dtype(TIPOS_PCM[dtype_raw])
+        total_frames = os.path.getsize(ruta) // (dtype.itemsize * canales_raw)
+        bloques = _bloques_memmap(ruta, dtype, canales_raw, 0, total_frames, tamanio_bloque)
+        if metadatos is not None and metadatos.get('huecos'):
+            bloques = _bloques_con_huecos(bloques, metadatos['huecos'], tamanio_bloque)
+        return tasa_raw, bloques
+
+    if extension == '.wav':
+        info = leer_cabecera_wav(ruta)
+        canales = info['canales']
+        bytes_muestra = info['bits'] // 8
+        total_frames = info['bytes_datos'] // (bytes_muestra * canales)
+        if info['formato'] == 1 and info['bits'] == 24:
+            bloques = _bloques_wav_24(ruta, canales, info['inicio_datos'], total_frames, tamanio_bloque)
+            return info['tasa_muestreo'], bloques
+
+        tipos_wav = {(1, 8): np.uint8, (1, 16): np.int16, (1, 32): np.int32,
+                     (3, 32): np.float32, (3, 64): np.float64}
+        dtype = tipos_wav.get((info['formato'], info['bits']))
+        if dtype is not None:
+            bloques = _bloques_memmap(ruta, dtype, canales, info['inicio_datos'], total_frames, tamanio_bloque)
+            return info['tasa_muestreo'], bloques
+
+    # FLAC, OGG, WAV comprimidos, etc.
+    try:
+        import soundfile as sf
+    except ImportError:
+        raise ValueError(f"Formato no soportado sin soundfile: {ruta}")
+
+    tasa = sf.info(ruta).samplerate
+    bloques = (
+        bloque.mean(axis=1) if bloque.ndim > 1 else bloque
+        for bloque in sf.blocks(ruta, blocksize=tamanio_bloque, dtype='float32', always_2d=True)
+    )
+    return tasa, bloques
+
+
+def escribir_csv(ruta_salida, columnas):
+    """Escribe el seguimiento de pitch como CSV (una fila por trama)."""
+    with open(ruta_salida, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS_SALIDA)
+        for tiempo, frecuencia, nota, cents, estado, rms in zip(*(columnas[c] for c in COLUMNAS_SALIDA)):
+            escritor.writerow([
+                f"{tiempo:.4f}",
+                f"{frecuencia:.3f}" if np.isfinite(frecuencia) else '',
+                nota or '',
+                f"{cents:.2f}",
+                estado,
+                f"{rms:.5f}"
+            ])
+
+
+def escribir_columnar(ruta_salida, columnas):
+    """Escribe el seguimiento de pitch en formato columnar (.npz, un array por columna)."""
+    arrays = {}
+    for nombre in COLUMNAS_SALIDA:
+        columna = columnas[nombre]
+        if columna.dtype == object:
+            # Las notas vacias (None) se guardan como cadena vacia
+            columna = np.array(['' if valor is None else valor for valor in columna], dtype=str)
+        arrays[nombre] = columna
+    np.savez_compressed(ruta_salida, **arrays)
+
+
+def _seguir_pitch_en_pool(bloques, pool, tamanio_ventana, salto):
+    """
+    Seguimiento de pitch con la detección repartida entre los procesos de un PoolAnalisis.
+
+    Las muestras se escriben una sola vez en el buffer compartido del pool y
+    cada ventana se envía como índice, con la misma cadencia que la ventana
+    deslizante: un análisis por salto completo una vez llena la ventana.
+
+    Returns:
+        Tupla (final de cada ventana en muestras, frecuencias, rms), en orden
+    """
+    finales = []
+    resultados = []
+    muestras_leidas = 0
+    # Muestras del salto en curso, como en VentanaDeslizante: los bloques no tienen por qué alinearse al salto
+    muestras_parcial = 0
+    for bloque in bloques:
+        inicio = 0
+        while inicio < len(bloque):
+            tomar = min(salto - muestras_parcial, len(bloque) - inicio)
+            pool.escribir(bloque[inicio:inicio + tomar])
+            inicio += tomar
+            muestras_leidas += tomar
+            muestras_parcial += tomar
+            if muestras_parcial < salto:
+                continue
+            muestras_parcial = 0
+            if muestras_leidas >= tamanio_ventana:
+                pool.enviar()
+                finales.append(muestras_leidas)
+            resultados.extend(resultado for _, resultado in pool.recoger())
+    resultados.extend(resultado for _, resultado in pool.terminar())
+
+    frecuencias = [np.nan if resultado is None or resultado[0] is None else resultado[0]
+                   for resultado in resultados]
+    valores_rms = [0.0 if resultado is None else resultado[1] for resultado in resultados]
+    return finales, frecuencias, valores_rms
+
+
+def analizar_archivo(ruta, ruta_notas, ruta_salida=None, formato_salida='csv', tamanio_ventana=4096,
+                     salto=1024, metodo_deteccion='yin', umbral_rms=0.005, frecuencia_minima=50,
+                     frecuencia_maxima=2000, tasa_raw=None, dtype_raw='int16', canales_raw=1, decimar=False,
+                     procesos=1):
+    """
+    Analiza un archivo de audio trama por trama leyendo por bloques.
+
+    Args:
+        ruta: Archivo de audio (WAV, FLAC, PCM crudo...)
+        ruta_notas: JSON con las notas de referencia
+        ruta_salida: Archivo de salida; por defecto junto al audio
+        formato_salida: 'csv' o 'npz' (columnar)
+        tamanio_ventana: Muestras por ventana de análisis
+        salto: Muestras entre ventanas consecutivas
+        metodo_deteccion: Backend de pitch de ProcesadorSenial
+        umbral_rms: RMS minimo para analizar una trama
+        decimar: Detectar el pitch sobre la señal decimada (refinada a tasa completa)
+        procesos: Procesos de detección para este archivo; con más de uno la detección
+            corre en un PoolAnalisis
+
+    Returns:
+        Tupla (ruta_salida, numero de tramas)
+    """
+    if ruta_salida is None:
+        ruta_salida = os.path.splitext(ruta)[0] + ('.pitch.csv' if formato_salida == 'csv' else '.pitch.npz')
+
+    tasa_muestreo, bloques = abrir_audio(ruta, max(salto, tamanio_ventana), tasa_raw, dtype_raw, canales_raw)
+    detector = DetectorNotas(ruta_notas)
+
+    tiempos = []
+    frecuencias = []
+    valores_rms = []
+
+    if procesos > 1:
+        pool = PoolAnalisis(tasa_muestreo, tamanio_ventana, metodo_deteccion, procesos,
+                            frecuencia_minima=frecuencia_minima, frecuencia_maxima=frecuencia_maxima,
+                            umbral_rms=umbral_rms, salto=salto, decimar=decimar)
+        try:
+            finales, frecuencias, valores_rms = _seguir_pitch_en_pool(bloques, pool, tamanio_ventana, salto)
+        finally:
+            pool.cerrar()
+        tiempos = [(fin_ventana - tamanio_ventana / 2) / tasa_muestreo for fin_ventana in finales]
+    else:
+        procesador = ProcesadorSenial(tasa_muestreo, tamanio_ventana, metodo_deteccion, salto,
+                                      decimar=decimar, frecuencia_maxima=frecuencia_maxima)
+        # Ventana deslizante del procesador: se alimenta salto a salto y se analiza la ventana completa
+        muestras_leidas = 0
+        for bloque in bloques:
+            for inicio in range(0, len(bloque), salto):
+                fragmento = bloque[inicio:inicio + salto]
+                muestras_leidas += len(fragmento)
+                if procesador.agregar_muestras(fragmento) == 0:
+                    continue
+
+                rms = procesador.rms_ventana()
+                frecuencia = None
+                if rms >= umbral_rms:
+                    frecuencia = procesador.detectar_frecuencia_fundamental(
+                        procesador.trama_pitch_actual(), frecuencia_minima, frecuencia_maxima
+                    )
+                fin_ventana = muestras_leidas - muestras_leidas % salto
+                tiempos.append((fin_ventana - tamanio_ventana / 2) / tasa_muestreo)
+                frecuencias.append(np.nan if frecuencia is None else frecuencia)
+                valores_rms.append(rms)
+
+    # Busqueda de notas vectorizada sobre todo el seguimiento
+    analisis = detector.analizar_frecuencias(np.array(frecuencias, dtype=np.float64))
+    columnas = {
+        'tiempo': np.array(tiempos, dtype=np.float64),
+        'frecuencia': analisis['frecuencia_detectada'],
+        'nota': analisis['nota'],
+        'cents': analisis['cents'],
+        'estado': analisis['estado'],
+        'rms': np.array(valores_rms, dtype=np.float64),
+    }
+
+    if formato_salida == 'csv':
+        escribir_csv(ruta_salida, columnas)
+    else:
+        escribir_columnar(ruta_salida, columnas)
+
+    return ruta_salida, len(tiempos)
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class AnalizadorMulticanal:
+    """Analiza todos los canales de una CapturaMulticanal en una sola pasada por lote.
+
+    Solo los canales con la compuerta de energía abierta entran al lote, de
+    modo que los canales en silencio no cuestan nada. Cada canal tiene su
+    propio flujo de resultados: una ranura (secuencia, resultado) que se
+    reemplaza completa y que avanza solo cuando ese canal produce algo nuevo.
+
+    Con un PoolAnalisis, los canales activos se reparten entre sus procesos:
+    las muestras nuevas de la captura se copian una vez a la memoria
+    compartida del pool y cada proceso analiza su grupo de canales.
+    """
+
+    def __init__(self, captura, procesador, detector, frecuencia_minima=50, frecuencia_maxima=2000, pool=None):
+        """
+        Args:
+            captura: CapturaMulticanal que provee las ventanas (canales, n)
+            procesador: ProcesadorSenial usado para las tramas y la detección por lote
+            detector: DetectorNotas para la nota y los cents de cada canal
+            frecuencia_minima: Frecuencia mínima a detectar en Hz
+            frecuencia_maxima: Frecuencia máxima a detectar en Hz
+            pool: PoolAnalisis opcional con los canales de la captura
+        """
+        self.captura = captura
+        self.procesador = procesador
+        self.detector = detector
+        self.frecuencia_minima = frecuencia_minima
+        self.frecuencia_maxima = frecuencia_maxima
+        self.pool = pool
+        self._total_pool = 0
+
+        canales = captura.canales_totales
+        self._resultados = [(0, None)] * canales
+        self._en_silencio = [False] * canales
+
+    def _publicar(self, canal, resultado):
+        secuencia = self._resultados[canal][0] + 1
+        self._resultados[canal] = (secuencia, resultado)
+
+    def obtener_resultado_canal(self, canal):
+        """Retorna la tupla (secuencia, resultado) mas reciente de un canal."""
+        return self._resultados[canal]
+
+    def analizar(self):
+        """
+        Analiza la ventana actual de todos los canales con señal.
+
+        Returns:
+            Diccionario de arrays por canal (como DetectorNotas.analizar_frecuencias)
+            o None si ningún canal tiene señal
+        """
+        activos = self.captura.canales_con_senial()
+        for canal in np.flatnonzero(~activos):
+            if not self._en_silencio[canal]:
+                self._en_silencio[canal] = True
+                self._publicar(canal, None)
+        if not activos.any():
+            return None
+
+        frecuencias = np.full(len(activos), np.nan)
+        if self.pool is not None:
+            frecuencias[activos] = self._detectar_en_pool(np.flatnonzero(activos))
+        else:
+            ventana = self.captura.leer_ultimas_muestras(self.procesador.tamanio_buffer)
+            lote = ventana if activos.all() else ventana[activos]
+            frecuencias[activos] = self.procesador.detectar_frecuencias_lote(
+                lote, self.frecuencia_minima, self.frecuencia_maxima
+            )
+        info = self.detector.analizar_frecuencias(frecuencias)
+
+        for canal in np.flatnonzero(activos):
+            self._en_silencio[canal] = False
+            self._publicar(canal, self._resultado_canal(info, canal))
+        return info
+
+    def _detectar_en_pool(self, canales):
+        """Pasa al pool las muestras nuevas y reparte los canales indicados entre sus procesos."""
+        total = self.captura.total_muestras()
+        # Tras un hueco solo hace falta la última ventana
+        nuevas = min(total - self._total_pool, self.pool.tamanio_ventana)
+        if nuevas > 0:
+            self.pool.escribir(self.captura.leer_ultimas_muestras(nuevas).T)
+        self._total_pool = total
+
+        grupos = [grupo for grupo in np.array_split(canales, self.pool.procesos) if len(grupo) > 0]
+        secuencias = [self.pool.enviar(canales=grupo) for grupo in grupos]
+        resultados = dict(self.pool.recoger(minimo=len(grupos)))
+        return np.concatenate([
+            resultados[secuencia][0] if resultados.get(secuencia) is not None else np.full(len(grupo), np.nan)
+            for secuencia, grupo in zip(secuencias, grupos)
+        ])
+
+    @staticmethod
+    def _resultado_canal(info, canal):
+        """Extrae el resultado de un canal con el formato de DetectorNotas.analizar_frecuencia."""
+        detectada = float(info['frecuencia_detectada'][canal])
+        referencia = float(info['frecuencia_referencia'][canal])
+        return {
+            'nota': info['nota'][canal],
+            'nota_espaniol': info['nota_espaniol'][canal],
+            'frecuencia_detectada': detectada if np.isfinite(detectada) else None,
+            'frecuencia_referencia': referencia if np.isfinite(referencia) else None,
+            'cents': float(info['cents'][canal]),
+            'estado': info['estado'][canal],
+        }
@@ -0,0 +1,530 @@
+import numpy as np
+
+from banco_goertzel import BancoGoertzel
+from espacio_dsp import EspacioDiferencia, modulo_fft_lote
+
+
+def refinar_periodo(x, tasa_muestreo, frecuencia, radio, energia_acumulada=None):
+    """
+    Refina una frecuencia aproximada evaluando la función de diferencia de YIN
+    solo en los retardos cercanos a su periodo.
+
+    Args:
+        x: Muestras de la trama
+        tasa_muestreo: Frecuencia de muestreo en Hz
+        frecuencia: Estimación aproximada en Hz
+        radio: Retardos a evaluar a cada lado del periodo aproximado
+        energia_acumulada: Suma acumulada de x² con un cero inicial, si ya se calculó
+
+    Returns:
+        Frecuencia refinada en Hz (la aproximada si el mínimo queda en el borde)
+    """
+    periodo = tasa_muestreo / frecuencia
+    centro = int(round(periodo))
+    retardos = np.arange(max(2, centro - radio), centro + radio + 1)
+    longitud = len(x) - retardos[-1]
+    if longitud <= 0:
+        return frecuencia
+
+    # d(tau) = E(0) + E(tau) - 2 r(tau) solo para los retardos candidatos
+    referencia = x[:longitud]
+    correlacion = np.array([float(x[tau:tau + longitud] @ referencia) for tau in retardos])
+    if energia_acumulada is None:
+        energia_acumulada = np.concatenate(([0.0], np.cumsum(np.square(x, dtype=np.float64))))
+    energias = energia_acumulada[retardos + longitud] - energia_acumulada[retardos]
+    diferencia = energia_acumulada[longitud] + energias - 2.0 * correlacion
+
+    indice = int(np.argmin(diferencia))
+    if indice == 0 or indice == len(retardos) - 1:
+        return frecuencia
+    izquierda, centro_d, derecha = diferencia[indice - 1:indice + 2]
+    denominador = izquierda - 2.0 * centro_d + derecha
+    desplazamiento = 0.5 * (izquierda - derecha) / denominador if denominador > 0 else 0.0
+    return float(tasa_muestreo / (retardos[indice] + desplazamiento))
+
+
+class BackendPitch:
+    """Interfaz comun para los algoritmos de detección de frecuencia fundamental."""
+
+    nombre = None
+    # Si es True, las estimaciones sobre tramas decimadas se refinan a tasa completa
+    refinar_tasa_completa = True
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        """
+        Estima la frecuencia fundamental de una trama de análisis.
+
+        Args:
+            trama: TramaAnalisis con las muestras y su espectro en cache
+            frecuencia_minima: Frecuencia mínima a detectar en Hz
+            frecuencia_maxima: Frecuencia máxima a detectar en Hz
+
+        Returns:
+            Frecuencia detectada en Hz o None si no se detecta señal
+        """
+        raise NotImplementedError
+
+    def detectar_lote(self, trama, frecuencia_minima, frecuencia_maxima):
+        """
+        Estima la frecuencia fundamental de cada canal de una trama de lote.
+
+        La implementación base recorre los canales; los backends que pueden
+        vectorizar el cálculo sobre el lote la reemplazan.
+
+        Returns:
+            Array con una frecuencia por canal (NaN donde no se detecta señal)
+        """
+        frecuencias = np.full(trama.canales, np.nan)
+        for indice in range(trama.canales):
+            frecuencia = self.detectar(trama.canal(indice), frecuencia_minima, frecuencia_maxima)
+            if frecuencia is not None:
+                frecuencias[indice] = frecuencia
+        return frecuencias
+
+
+class BackendPiptrack(BackendPitch):
+    """Detección de pitch con librosa.piptrack sobre el espectro ya calculado de la trama."""
+
+    nombre = 'piptrack'
+
+    def __init__(self, umbral=0.1, magnitud_minima=0.01):
+        self.umbral = umbral
+        self.magnitud_minima = magnitud_minima
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        # Importación diferida: librosa solo se carga si se usa este backend
+        import librosa
+        
+        # Se pasa la magnitud de la trama como espectrograma de un solo frame
+        pitches, magnitudes = librosa.piptrack(
+            S=trama.magnitudes[:, np.newaxis],
+            sr=trama.tasa_muestreo,
+            n_fft=trama.tamanio,
+            fmin=frecuencia_minima,
+            fmax=frecuencia_maxima,
+            threshold=self.umbral
+        )
+
+        # Pitch con mayor magnitud en cada frame (vectorizado)
+        indices = magnitudes.argmax(axis=0)
+        columnas = np.arange(pitches.shape[1])
+        pitch_frames = pitches[indices, columnas]
+        magnitud_frames = magnitudes[indices, columnas]
+
+        # Solo considerar pitches con magnitud significativa
+        validos = (pitch_frames > 0) & (magnitud_frames > self.magnitud_minima)
+        if np.any(validos):
+            # Usar la mediana para reducir ruido
+            return float(np.median(pitch_frames[validos]))
+        return None
+
+
+class BackendYin(BackendPitch):
+    """Algoritmo YIN con la función de diferencia calculada por FFT."""
+
+    nombre = 'yin'
+
+    def __init__(self, umbral=0.15):
+        self.umbral = umbral
+        # Espacios de trabajo de la función de diferencia por (tamaño, retardo máximo)
+        self._espacios = {}
+
+    def _espacio(self, tamanio, retardo_maximo):
+        espacio = self._espacios.get((tamanio, retardo_maximo))
+        if espacio is None:
+            espacio = self._espacios[(tamanio, retardo_maximo)] = EspacioDiferencia(tamanio, retardo_maximo)
+        return espacio
+
+    def _funcion_diferencia(self, buffer_audio, retardo_maximo):
+        """
+        Función de diferencia d(tau) de YIN en O(N log N) mediante autocorrelación por FFT.
+
+        Acepta un buffer (n,) o un lote (canales, n); opera sobre el último eje.
+        Un buffer se procesa en su EspacioDiferencia sin reservar memoria: el
+        resultado es válido hasta la siguiente llamada con el mismo tamaño.
+        """
+        if np.ndim(buffer_audio) == 1:
+            return self._espacio(len(buffer_audio), retardo_maximo).calcular(buffer_audio)
+
+        x = np.asarray(buffer_audio, dtype=np.float64)
+        tamanio = x.shape[-1]
+        longitud = tamanio - retardo_maximo
+
+        # r(tau) = sum_j x[j] * x[j + tau] para j en [0, longitud)
+        tamanio_fft = 1 << int(np.ceil(np.log2(tamanio + longitud)))
+        espectro = np.fft.rfft(x, tamanio_fft)
+        espectro_ventana = np.fft.rfft(x[..., :longitud], tamanio_fft)
+        correlacion = np.fft.irfft(espectro * np.conj(espectro_ventana), tamanio_fft)[..., :retardo_maximo + 1]
+
+        # Energías de las ventanas desplazadas con sumas acumuladas
+        energia_acumulada = np.zeros(x.shape[:-1] + (tamanio + 1,))
+        np.cumsum(x * x, axis=-1, out=energia_acumulada[..., 1:])
+        energia_inicial = energia_acumulada[..., longitud:longitud + 1]
+        energia_desplazada = (energia_acumulada[..., longitud:longitud + retardo_maximo + 1]
+                              - energia_acumulada[..., :retardo_maximo + 1])
+
+        return energia_inicial + energia_desplazada - 2.0 * correlacion
+
+    def _funcion_diferencia_lote(self, lote, retardo_maximo):
+        """
+        d(tau) para un lote (canales, n) con las FFT de scipy en precisión simple y varios hilos.
+
+        Las energías se acumulan en doble precisión; solo la correlación usa
+        float32. Sin scipy se usa la versión de numpy.
+        """
+        fft = modulo_fft_lote()
+        if fft is None:
+            return self._funcion_diferencia(lote, retardo_maximo)
+
+        x = np.asarray(lote, dtype=np.float32)
+        tamanio = x.shape[-1]
+        longitud = tamanio - retardo_maximo
+        tamanio_fft = 1 << int(np.ceil(np.log2(tamanio + longitud)))
+        espectro = fft.rfft(x, tamanio_fft, axis=-1, workers=-1)
+        espectro_ventana = fft.rfft(x[:, :longitud], tamanio_fft, axis=-1, workers=-1)
+        espectro *= np.conj(espectro_ventana)
+        correlacion = fft.irfft(espectro, tamanio_fft, axis=-1, workers=-1)[:, :retardo_maximo + 1]
+
+        energia_acumulada = np.zeros((x.shape[0], tamanio + 1))
+        np.cumsum(np.square(x, dtype=np.float64), axis=-1, out=energia_acumulada[:, 1:])
+        energia_inicial = energia_acumulada[:, longitud:longitud + 1]
+        energia_desplazada = (energia_acumulada[:, longitud:longitud + retardo_maximo + 1]
+                              - energia_acumulada[:, :retardo_maximo + 1])
+        return energia_inicial + energia_desplazada - 2.0 * correlacion
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        buffer_audio = trama.muestras
+        tasa_muestreo = trama.tasa_muestreo
+        retardo_minimo = max(2, int(tasa_muestreo / frecuencia_maxima))
+        retardo_maximo = min(int(np.ceil(tasa_muestreo / frecuencia_minima)), len(buffer_audio) // 2)
+        if retardo_maximo <= retardo_minimo + 1:
+            return None
+
+        espacio = self._espacio(len(buffer_audio), retardo_maximo)
+        espacio.calcular(buffer_audio)
+
+        # Diferencia normalizada por la media acumulada (CMNDF)
+        cmndf = espacio.normalizar()
+
+        # Primer mínimo local por debajo del umbral absoluto
+        region = cmndf[retardo_minimo:retardo_maximo]
+        debajo = np.flatnonzero(region < self.umbral)
+        if len(debajo) == 0:
+            return None
+        tau = retardo_minimo + debajo[0]
+        while tau + 1 < retardo_maximo and cmndf[tau + 1] < cmndf[tau]:
+            tau += 1
+
+        # Interpolación parabólica para precisión por debajo de una muestra
+        if 0 < tau < len(cmndf) - 1:
+            izquierda, centro, derecha = cmndf[tau - 1], cmndf[tau], cmndf[tau + 1]
+            denominador = izquierda - 2.0 * centro + derecha
+            desplazamiento = 0.5 * (izquierda - derecha) / denominador if denominador != 0 else 0.0
+        else:
+            desplazamiento = 0.0
+
+        periodo = tau + desplazamiento
+        if periodo <= 0:
+            return None
+        return float(tasa_muestreo / periodo)
+
+    def detectar_lote(self, trama, frecuencia_minima, frecuencia_maxima):
+        """YIN vectorizado: todos los canales comparten las FFT, sumas acumuladas y búsquedas."""
+        lote = np.atleast_2d(trama.muestras)
+        tasa_muestreo = trama.tasa_muestreo
+        canales, tamanio = lote.shape
+        retardo_minimo = max(2, int(tasa_muestreo / frecuencia_maxima))
+        retardo_maximo = min(int(np.ceil(tasa_muestreo / frecuencia_minima)), tamanio // 2)
+        if retardo_maximo <= retardo_minimo + 1:
+            return np.full(canales, np.nan)
+
+        diferencia = self._funcion_diferencia_lote(lote, retardo_maximo)
+
+        acumulada = np.cumsum(diferencia[:, 1:], axis=1)
+        cmndf = np.ones_like(diferencia)
+        divisor = np.where(acumulada > 0, acumulada, 1.0)
+        cmndf[:, 1:] = np.where(acumulada > 0, diferencia[:, 1:] * np.arange(1, diferencia.shape[1]) / divisor, 1.0)
+
+        # Primer cruce del umbral y, desde ahí, primer punto donde la curva deja de bajar
+        region = cmndf[:, retardo_minimo:retardo_maximo]
+        debajo = region < self.umbral
+        detectado = debajo.any(axis=1)
+        primero = debajo.argmax(axis=1)
+        deja_de_bajar = np.ones_like(debajo)
+        deja_de_bajar[:, :-1] = region[:, 1:] >= region[:, :-1]
+        columnas = np.arange(region.shape[1])
+        tau = retardo_minimo + (deja_de_bajar & (columnas >= primero[:, np.newaxis])).argmax(axis=1)
+
+        filas = np.arange(canales)
+        izquierda, centro, derecha = cmndf[filas, tau - 1], cmndf[filas, tau], cmndf[filas, tau + 1]
+        denominador = izquierda - 2.0 * centro + derecha
+        desplazamiento = np.where(
+            denominador != 0, 0.5 * (izquierda - derecha) / np.where(denominador != 0, denominador, 1.0), 0.0
+        )
+
+        periodo = tau + desplazamiento
+        validos = detectado & (periodo > 0)
+        return np.where(validos, tasa_muestreo / np.where(validos, periodo, 1.0), np.nan)
+
+
+class BackendMcLeod(BackendYin):
+    """McLeod Pitch Method (NSDF) reutilizando la autocorrelación por FFT de YIN."""
+
+    nombre = 'mpm'
+    # La selección de picos de MPM no se vectoriza: se usa el recorrido por canal
+    detectar_lote = BackendPitch.detectar_lote
+
+    def __init__(self, umbral_clave=0.9, claridad_minima=0.5):
+        self.umbral_clave = umbral_clave
+        self.claridad_minima = claridad_minima
+        self._espacios = {}
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        buffer_audio = trama.muestras
+        tasa_muestreo = trama.tasa_muestreo
+        retardo_minimo = max(2, int(tasa_muestreo / frecuencia_maxima))
+        retardo_maximo = min(int(np.ceil(tasa_muestreo / frecuencia_minima)), len(buffer_audio) // 2)
+        if retardo_maximo <= retardo_minimo + 1:
+            return None
+
+        # NSDF: n(tau) = 2 r(tau) / m(tau) con m(tau) = energía de ambas ventanas
+        espacio = self._espacio(len(buffer_audio), retardo_maximo)
+        diferencia = espacio.calcular(buffer_audio)
+        energia_acumulada = espacio.energia_acumulada
+        longitud = espacio.longitud
+        retardos = np.arange(retardo_maximo + 1)
+        m = energia_acumulada[longitud] + energia_acumulada[retardos + longitud] - energia_acumulada[retardos]
+        nsdf = np.where(m > 0, (m - diferencia) / np.where(m > 0, m, 1.0), 0.0)
+
+        # Máximos locales positivos dentro del rango de búsqueda
+        region = nsdf[retardo_minimo - 1:retardo_maximo + 1]
+        es_maximo = (region[1:-1] > region[:-2]) & (region[1:-1] >= region[2:]) & (region[1:-1] > 0)
+        candidatos = np.flatnonzero(es_maximo) + retardo_minimo
+        if len(candidatos) == 0:
+            return None
+
+        # Primer pico que supera una fracción del máximo global (evita errores de octava)
+        valor_maximo = nsdf[candidatos].max()
+        if valor_maximo < self.claridad_minima:
+            return None
+        tau = candidatos[np.argmax(nsdf[candidatos] >= self.umbral_clave * valor_maximo)]
+
+        izquierda, centro, derecha = nsdf[tau - 1], nsdf[tau], nsdf[tau + 1]
+        denominador = izquierda - 2.0 * centro + derecha
+        desplazamiento = 0.5 * (izquierda - derecha) / denominador if denominador != 0 else 0.0
+
+        periodo = tau + desplazamiento
+        if periodo <= 0:
+            return None
+        return float(tasa_muestreo / periodo)
+
+
+class BackendInstrumento(BackendPitch):
+    """Modo instrumento: solo evalúa las cuerdas del instrumento con un banco de Goertzel."""
+
+    nombre = 'instrumento'
+    # Los armónicos ya dan resolución sub-cent; el refinamiento temporal solo agrega ruido
+    refinar_tasa_completa = False
+
+    def __init__(self, cuerdas, armonicos=4):
+        """
+        Args:
+            cuerdas: Diccionario nombre de nota -> frecuencia objetivo en Hz
+            armonicos: Armónicos evaluados por cuerda
+        """
+        self.banco = BancoGoertzel(cuerdas, armonicos)
+        self.ultima_cuerda = None
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        # El rango de búsqueda lo fijan las cuerdas, no frecuencia_minima/maxima
+        self.ultima_cuerda, frecuencia = self.banco.detectar_cuerda(trama.muestras, trama.tasa_muestreo)
+        return frecuencia
+
+
+class BackendEspectral(BackendPitch):
+    """Picos del espectro ventaneado refinados por debajo de la resolución de un bin.
+
+    Cada pico se interpola con una parábola sobre el logaritmo de la magnitud
+    (exacta para un lóbulo gaussiano) y el sesgo que deja la ventana de Hann se
+    corrige con una tabla calculada una sola vez a partir de la propia
+    ventana. La fundamental se elige por suma armónica (descontando la energía
+    entre armónicos, que delata una octava demasiado alta) y se estima por
+    mínimos cuadrados sobre todos los armónicos encontrados, ponderados por su
+    energía: el error de cada armónico se divide por su número. Con tres o más
+    armónicos el ajuste incluye la inarmonicidad de las cuerdas
+    (f_k = k f0 (1 + B k² / 2)), que de otro modo desplaza la lectura hacia
+    arriba.
+
+    Si la fundamental queda a menos de bins_minimos bins, los lóbulos de los
+    armónicos se solapan y la interpolación pierde validez: en ese caso la
+    estimación espectral solo acota el periodo, que se refina con la función
+    de diferencia evaluada en los retardos a un cuarto de bin de distancia.
+    """
+
+    nombre = 'espectral'
+    # La estimación ya es sub-bin; el refinamiento temporal no agrega precisión
+    refinar_tasa_completa = False
+
+    def __init__(self, armonicos=6, picos_maximos=12, nivel_relativo_db=-40.0, amplitud_minima=1e-3,
+                 tolerancia_cents=50.0, margen_puntaje=0.9, corregir_inarmonicidad=True, bins_minimos=3.5):
+        """
+        Args:
+            armonicos: Armónicos evaluados por candidato a fundamental
+            picos_maximos: Picos más fuertes del espectro que se consideran
+            nivel_relativo_db: Nivel mínimo de un pico respecto al más fuerte
+            amplitud_minima: Amplitud mínima (escala completa = 1) del pico más fuerte
+            tolerancia_cents: Distancia máxima entre un pico y el armónico esperado
+                (nunca menos de medio bin)
+            margen_puntaje: Fracción del mejor puntaje desde la cual se prefiere el
+                candidato más agudo (una fundamental y su sub-octava empatan)
+            corregir_inarmonicidad: Ajustar también el coeficiente de inarmonicidad
+            bins_minimos: Separación entre armónicos (en bins) por debajo de la
+                cual se refina el periodo en el dominio del tiempo
+        """
+        self.armonicos = armonicos
+        self.picos_maximos = picos_maximos
+        self.nivel_relativo = 10.0 ** (nivel_relativo_db / 20.0)
+        self.amplitud_minima = amplitud_minima
+        self.tolerancia_relativa = 2.0 ** (tolerancia_cents / 1200.0) - 1.0
+        self.margen_puntaje = margen_puntaje
+        self.corregir_inarmonicidad = corregir_inarmonicidad
+        self.bins_minimos = bins_minimos
+        self._numeros_armonico = np.arange(1, armonicos + 1)
+        # Tablas de corrección del sesgo de interpolación por tamaño de ventana
+        self._correcciones = {}
+
+    def _correccion(self, ventana):
+        """
+        Tabla (desplazamiento estimado, desplazamiento real) de la interpolación
+        log-parabólica para esta ventana, evaluando su transformada en los tres
+        bins alrededor de un tono en cada desplazamiento de una rejilla.
+        """
+        tabla = self._correcciones.get(len(ventana))
+        if tabla is None:
+            reales = np.linspace(-0.5, 0.5, 201)
+            indices = np.arange(len(ventana))
+            bins = reales[:, None] + np.arange(-1, 2)
+            # |W(d)| para el tono (complejo, sin imagen negativa) visto desde cada bin vecino
+            nucleo = np.exp(-2j * np.pi * bins[..., None] * indices / len(ventana))
+            vecinos = np.log(np.abs(nucleo @ ventana) + 1e-300)
+            izquierda, centro, derecha = vecinos[:, 2], vecinos[:, 1], vecinos[:, 0]
+            estimados = 0.5 * (izquierda - derecha) / (izquierda - 2.0 * centro + derecha)
+            tabla = self._correcciones[len(ventana)] = (estimados, reales)
+        return tabla
+
+    def _picos(self, trama, frecuencia_minima, frecuencia_maxima):
+        """
+        Picos locales del espectro en la banda de búsqueda, refinados por debajo del bin.
+
+        Returns:
+            Tupla (frecuencias en Hz, amplitudes) de los picos más fuertes, o None
+        """
+        resolucion = trama.tasa_muestreo / trama.tamanio
+        magnitudes = trama.magnitudes
+        primero = max(1, int(frecuencia_minima / resolucion))
+        ultimo = min(len(magnitudes) - 2, int(np.ceil(frecuencia_maxima * self.armonicos / resolucion)))
+        if ultimo <= primero:
+            return None
+        region = magnitudes[primero - 1:ultimo + 2]
+        centro = region[1:-1]
+        # Amplitud de escala completa de un tono en el centro de un bin
+        escala = 0.5 * float(np.sum(trama.ventana))
+        maximo = float(centro.max()) if len(centro) else 0.0
+        if maximo < self.amplitud_minima * escala:
+            return None
+
+        es_pico = (centro > region[:-2]) & (centro >= region[2:]) & (centro >= maximo * self.nivel_relativo)
+        indices = np.flatnonzero(es_pico)
+        if len(indices) > self.picos_maximos:
+            indices = indices[np.argpartition(centro[indices], -self.picos_maximos)[-self.picos_maximos:]]
+
+        vecinos = np.log(np.stack((region[indices], centro[indices], region[indices + 2])) + 1e-300)
+        izquierda, medio, derecha = vecinos
+        denominador = izquierda - 2.0 * medio + derecha
+        estimados = np.where(denominador < 0, 0.5 * (izquierda - derecha) / np.where(denominador < 0, denominador, -1.0),
+                             0.0)
+        desplazamientos = np.interp(estimados, *self._correccion(trama.ventana))
+        frecuencias = (indices + primero + desplazamientos) * resolucion
+        return frecuencias, centro[indices] / escala
+
+    def detectar(self, trama, frecuencia_minima, frecuencia_maxima):
+        picos = self._picos(trama, frecuencia_minima, frecuencia_maxima)
+        if picos is None:
+            return None
+        frecuencias, amplitudes = picos
+        resolucion = trama.tasa_muestreo / trama.tamanio
+
+        # Candidatos: cada pico tomado como armónico 1..armonicos de la fundamental
+        candidatos = (frecuencias[:, None] / self._numeros_armonico).ravel()
+        candidatos = candidatos[(candidatos >= frecuencia_minima) & (candidatos <= frecuencia_maxima)]
+        if len(candidatos) == 0:
+            return None
+
+        def energia_en(objetivos):
+            """Amplitud del pico más cercano a cada objetivo (0 si ninguno está dentro de la tolerancia)."""
+            distancias = np.abs(frecuencias - objetivos[..., None])
+            cercano = np.argmin(distancias, axis=-1)
+            tolerancia = np.maximum(0.5 * resolucion, self.tolerancia_relativa * objetivos)
+            dentro = np.take_along_axis(distancias, cercano[..., None], axis=-1)[..., 0] <= tolerancia
+            return np.where(dentro, amplitudes[cercano], 0.0), cercano, dentro
+
+        armonicos = candidatos[:, None] * self._numeros_armonico
+        energia_armonica, _, _ = energia_en(armonicos)
+        energia_intermedia, _, _ = energia_en(armonicos - 0.5 * candidatos[:, None])
+        puntajes = energia_armonica.sum(axis=1) - energia_intermedia.sum(axis=1)
+        mejor = puntajes.max()
+        if mejor <= 0:
+            return None
+        # Entre los candidatos cerca del mejor puntaje, el más agudo (evita la sub-octava)
+        fundamental = candidatos[puntajes >= self.margen_puntaje * mejor].max()
+
+        _, cercano, dentro = energia_en(fundamental * self._numeros_armonico)
+        fundamental = self._ajustar_fundamental(self._numeros_armonico[dentro], frecuencias[cercano[dentro]],
+                                                amplitudes[cercano[dentro]])
+        if fundamental < self.bins_minimos * resolucion:
+            # La incertidumbre de la estimación espectral es de una fracción de bin
+            radio = int(np.ceil(0.25 * resolucion / fundamental * trama.tasa_muestreo / fundamental)) + 2
+            fundamental = refinar_periodo(trama.muestras, trama.tasa_muestreo, fundamental, radio)
+        return fundamental
+
+    def _ajustar_fundamental(self, numeros, frecuencias, amplitudes):
+        """
+        Fundamental por mínimos cuadrados ponderados de f_k / k = f0 + c k² (c = f0 B / 2).
+
+        El peso amplitud² k² es el inverso de la varianza de cada f_k / k. Sin
+        corrección, con menos de tres armónicos o si el ajuste da una
+        inarmonicidad negativa (imposible en una cuerda) se fija c = 0.
+        """
+        y = frecuencias / numeros
+        pesos = amplitudes ** 2 * numeros ** 2
+        promedio = float(np.sum(pesos * y) / np.sum(pesos))
+        if not self.corregir_inarmonicidad or len(numeros) < 3:
+            return promedio
+        cuadrados = numeros ** 2.0
+        s0, s1, s2 = np.sum(pesos), np.sum(pesos * cuadrados), np.sum(pesos * cuadrados ** 2)
+        t0, t1 = np.sum(pesos * y), np.sum(pesos * y * cuadrados)
+        determinante = s0 * s2 - s1 * s1
+        if determinante <= 1e-12 * s0 * s2:
+            return promedio
+        pendiente = (s0 * t1 - s1 * t0) / determinante
+        if pendiente < 0:
+            return promedio
+        return float((t0 * s2 - t1 * s1) / determinante)
+
+# Registro de backends disponibles por nombre
+BACKENDS_PITCH = {
+    BackendPiptrack.nombre: BackendPiptrack,
+    BackendYin.nombre: BackendYin,
+    BackendMcLeod.nombre: BackendMcLeod,
+    BackendEspectral.nombre: BackendEspectral,
+}
+
+
+def crear_backend(nombre, **opciones):
+    """Crea un backend de detección de pitch a partir de su nombre registrado."""
+    try:
+        clase = BACKENDS_PITCH[nombre]
+    except KeyError:
+        disponibles = ', '.join(sorted(BACKENDS_PITCH))
+        raise ValueError(f"Backend de pitch desconocido: '{nombre}' (disponibles: {disponibles})")
+    return clase(**opciones)
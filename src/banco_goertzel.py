@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class BancoGoertzel:
+    """Banco de detectores de banda estrecha (DFT en frecuencias arbitrarias) para afinar cuerdas.
+
+    Para cada cuerda del instrumento se evalúan solo sus primeros armónicos en
+    una rejilla de desviaciones en cents alrededor de la afinación objetivo,
+    en lugar de buscar en todo el espectro. Cada detector equivale a un filtro
+    de Goertzel con ventana; todos se evalúan juntos como un único producto
+    matriz-vector con las bases precalculadas para cada tamaño de trama.
+
+    Tambien se evalúan los sub-armónicos (0.5, 1.5, ... veces la fundamental):
+    si tienen energía, la nota real está una octava abajo, lo que permite
+    penalizar los errores de octava.
+    """
+
+    def __init__(self, cuerdas, armonicos=4, rango_cents=100, paso_cents=10):
+        """
+        Args:
+            cuerdas: Diccionario nombre de nota -> frecuencia objetivo en Hz
+            armonicos: Número de armónicos evaluados por cuerda
+            rango_cents: Desviación máxima evaluada a cada lado del objetivo
+            paso_cents: Separación de la rejilla de desviaciones
+        """
+        self.nombres = list(cuerdas)
+        self.frecuencias = np.array([cuerdas[nombre] for nombre in self.nombres], dtype=np.float64)
+        self.armonicos = np.arange(1, armonicos + 1, dtype=np.float64)
+        self.subarmonicos = self.armonicos - 0.5
+        self.cents = np.arange(-rango_cents, rango_cents + paso_cents / 2, paso_cents, dtype=np.float64)
+        self.paso_cents = paso_cents
+        self.rango_cents = rango_cents
+        # Los armónicos altos pesan menos: un tono aislado se atribuye a la cuerda cuya fundamental coincide
+        self.pesos = 1.0 / self.armonicos
+        self.mascara_colisiones = self._mascara_colisiones()
+        self._bases = {}
+
+    def _mascara_colisiones(self):
+        """
+        Armónicos propios de cada cuerda, con forma (cuerdas, armónicos).
+
+        Un armónico se descarta si cae dentro del rango de búsqueda de un
+        armónico de otra cuerda (p. ej. en guitarra el 4º de E2 es la
+        fundamental de E4): en un acorde su energía no se puede atribuir. Cada
+        cuerda conserva al menos su fundamental.
+        """
+        nominales = np.log2(self.frecuencias[:, None] * self.armonicos[None, :])
+        distancias = 1200 * np.abs(nominales[:, :, None, None] - nominales[None, None, :, :])
+        otra_cuerda = ~np.eye(len(self.frecuencias), dtype=bool)[:, None, :, None]
+        colisiona = ((distancias < self.rango_cents) & otra_cuerda).any(axis=(2, 3))
+        mascara = ~colisiona
+        mascara[~mascara.any(axis=1), 0] = True
+        return mascara
+
+    def _frecuencias_detectores(self, multiplicadores):
+        """Frecuencias de los detectores con forma (cuerdas, multiplicadores, cents)."""
+        desviaciones = 2.0 ** (self.cents / 1200.0)
+        return (self.frecuencias[:, None, None] * multiplicadores[None, :, None] * desviaciones[None, None, :])
+
+    def _base(self, tamanio, tasa_muestreo):
+        """Matriz real [cos; sin] ventaneada de todos los detectores para un tamaño y tasa."""
+        clave = (tamanio, tasa_muestreo)
+        base = self._bases.get(clave)
+        if base is not None:
+            return base
+
+        multiplicadores = np.concatenate((self.armonicos, self.subarmonicos))
+        frecuencias = self._frecuencias_detectores(multiplicadores).reshape(-1)
+        # Detectores por encima de 0.9 * Nyquist no se evalúan (peso cero)
+        validos = frecuencias < 0.45 * tasa_muestreo
+
+        ventana = np.hanning(tamanio + 1)[:-1]
+        fase = 2 * np.pi * np.outer(frecuencias, np.arange(tamanio)) / tasa_muestreo
+        coseno = np.cos(fase) * ventana * validos[:, None]
+        seno = np.sin(fase) * ventana * validos[:, None]
+        base = np.vstack((coseno, seno)).astype(np.float32)
+        self._bases[clave] = base
+        return base
+
+    def potencias(self, muestras, tasa_muestreo):
+        """
+        Potencia en cada detector.
+
+        Returns:
+            Tupla (armonicos, subarmonicos), cada una con forma (cuerdas, armónicos, cents)
+        """
+        base = self._base(len(muestras), tasa_muestreo)
+        proyeccion = base @ np.asarray(muestras, dtype=np.float32)
+        mitad = len(proyeccion) // 2
+        potencia = proyeccion[:mitad] ** 2 + proyeccion[mitad:] ** 2
+
+        forma = (len(self.nombres), 2 * len(self.armonicos), len(self.cents))
+        potencia = potencia.reshape(forma)
+        return potencia[:, :len(self.armonicos)], potencia[:, len(self.armonicos):]
+
+    def _picos(self, curvas):
+        """
+        Posición en cents del máximo de cada curva (último eje), con interpolación parabólica.
+
+        Returns:
+            Tupla (cents, interior); interior es False si el máximo quedó en un
+            borde de la rejilla (el pico real está fuera del rango de búsqueda)
+        """
+        indices = np.argmax(curvas, axis=-1)
+        interior = (indices > 0) & (indices < len(self.cents) - 1)
+        centro_indices = np.clip(indices, 1, len(self.cents) - 2)[..., None]
+        vecinos = np.log(np.take_along_axis(curvas, centro_indices + np.arange(-1, 2), axis=-1) + 1e-20)
+        izquierda, centro, derecha = vecinos[..., 0], vecinos[..., 1], vecinos[..., 2]
+        denominador = izquierda - 2.0 * centro + derecha
+        seguro = np.where(denominador < 0, denominador, -1.0)
+        desplazamiento = np.where(interior & (denominador < 0), 0.5 * (izquierda - derecha) / seguro, 0.0)
+        return self.cents[indices] + desplazamiento * self.paso_cents, interior
+
+    def _refinar_cents(self, curva):
+        """Posición del máximo de una curva en la rejilla de cents con interpolación parabólica."""
+        cents, _ = self._picos(curva)
+        return float(cents)
+
+    def detectar_cuerda(self, muestras, tasa_muestreo):
+        """
+        Identifica la cuerda que suena y estima su desviación.
+
+        Returns:
+            Tupla (nombre de la cuerda, frecuencia estimada en Hz) o (None, None)
+        """
+        armonicos, subarmonicos = self.potencias(muestras, tasa_muestreo)
+        curvas = np.einsum('sac,a->sc', armonicos, self.pesos)
+        curvas_sub = np.einsum('sac,a->sc', subarmonicos, self.pesos)
+        # Puntaje: energía armónica menos energía en sub-armónicos (octava inferior)
+        puntajes = curvas.max(axis=1) - curvas_sub.max(axis=1)
+        indice = int(np.argmax(puntajes))
+        if puntajes[indice] <= 0:
+            return None, None
+
+        cents = self._refinar_cents(curvas[indice])
+        return self.nombres[indice], float(self.frecuencias[indice] * 2.0 ** (cents / 1200.0))
+
+    def detectar_cuerdas(self, muestras, tasa_muestreo, tolerancia_cents=5.0, nivel_relativo_db=-30.0,
+                         nivel_relativo_unico_db=-20.0):
+        """
+        Estima a la vez la afinación de todas las cuerdas que suenan (modo rasgueo).
+
+        Cada cuerda se mide solo con sus armónicos propios (ver
+        mascara_colisiones). Se considera presente si todos ellos muestran un
+        pico dentro de la rejilla, los picos coinciden en cents y su energía no
+        está muy por debajo de la cuerda más fuerte; con un único armónico
+        propio se exige más nivel, ya que no hay coincidencia que verificar.
+
+        Args:
+            muestras: Trama de audio (idealmente larga: la resolución en
+                frecuencia limita la separación de parciales cercanos)
+            tasa_muestreo: Frecuencia de muestreo en Hz
+            tolerancia_cents: Diferencia máxima entre los picos de los armónicos
+            nivel_relativo_db: Nivel mínimo respecto a la cuerda más fuerte
+            nivel_relativo_unico_db: Nivel mínimo para cuerdas con un solo armónico propio
+
+        Returns:
+            Diccionario nombre de la cuerda -> frecuencia estimada en Hz o None
+        """
+        armonicos, _ = self.potencias(muestras, tasa_muestreo)
+        mascara = self.mascara_colisiones
+        curvas = np.einsum('sac,sa->sc', armonicos, mascara * self.pesos)
+        cents, interior = self._picos(curvas)
+
+        # Coincidencia de los picos de cada armónico propio
+        cents_armonicos, interior_armonicos = self._picos(armonicos)
+        extension = (np.where(mascara, cents_armonicos, -np.inf).max(axis=1)
+                     - np.where(mascara, cents_armonicos, np.inf).min(axis=1))
+        todos_interiores = (interior_armonicos | ~mascara).all(axis=1)
+
+        picos = curvas.max(axis=1)
+        nivel_db = 10 * np.log10(picos / max(picos.max(), 1e-20) + 1e-20)
+        umbral_db = np.where(mascara.sum(axis=1) > 1, nivel_relativo_db, nivel_relativo_unico_db)
+        presentes = interior & todos_interiores & (extension < tolerancia_cents) & (nivel_db > umbral_db)
+
+        frecuencias = self.frecuencias * 2.0 ** (cents / 1200.0)
+        return {
+            nombre: float(frecuencias[indice]) if presentes[indice] else None
+            for indice, nombre in enumerate(self.nombres)
+        }
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class BufferCircular:
+    """Buffer circular de muestras float32 preasignado con escritura espejo.
+
+    Cada bloque se escribe dos veces (en la posicion real y en su espejo una
+    capacidad mas adelante), de modo que las ultimas N muestras siempre forman
+    un segmento contiguo y pueden leerse como vista sin copiar. Esta pensado
+    para un solo escritor (el callback de audio) y lectores que solo consultan
+    el contador de muestras escritas, por lo que no necesita bloqueos.
+
+    Con varios canales los datos se guardan como (canales, 2 * capacidad), asi
+    que cada canal es contiguo y las lecturas son vistas (canales, n).
+    """
+
+    def __init__(self, capacidad, canales=None, memoria=None):
+        """
+        Reserva la memoria del buffer para la capacidad indicada en muestras.
+        
+        Args:
+            capacidad: Muestras por canal que conserva el buffer
+            canales: Numero de canales; None para un buffer mono de una dimension
+            memoria: Buffer externo ya reservado (p. ej. SharedMemory.buf) donde guardar
+                las muestras; por defecto se reserva un array propio
+        """
+        self.capacidad = int(capacidad)
+        self.canales = canales
+        forma = 2 * self.capacidad if canales is None else (canales, 2 * self.capacidad)
+        if memoria is None:
+            self.datos = np.zeros(forma, dtype=np.float32)
+        else:
+            # Memoria compartida entre procesos: se usa en el lugar, sin copiar
+            self.datos = np.ndarray(forma, dtype=np.float32, buffer=memoria)
+        # Total de muestras escritas desde el inicio; se publica despues de copiar
+        self.total_escrito = 0
+
+    def escribir(self, muestras):
+        """
+        Copia un bloque de muestras al buffer (solo desde el hilo escritor).
+        
+        Args:
+            muestras: Array (muestras,) o, con varios canales, (muestras, canales) como lo entrega sounddevice
+        """
+        total_bloque = len(muestras)
+        if total_bloque == 0:
+            return
+        # Si el bloque excede la capacidad solo se conservan sus ultimas muestras
+        if total_bloque > self.capacidad:
+            muestras = muestras[-self.capacidad:]
+        
+        n = len(muestras)
+        if self.canales is not None:
+            muestras = muestras.T
+        capacidad = self.capacidad
+        inicio = (self.total_escrito + total_bloque - n) % capacidad
+        fin = inicio + n
+        
+        if fin <= capacidad:
+            self.datos[..., inicio:fin] = muestras
+            self.datos[..., inicio + capacidad:fin + capacidad] = muestras
+        else:
+            primera_parte = capacidad - inicio
+            self.datos[..., inicio:capacidad] = muestras[..., :primera_parte]
+            self.datos[..., inicio + capacidad:] = muestras[..., :primera_parte]
+            self.datos[..., :n - primera_parte] = muestras[..., primera_parte:]
+            self.datos[..., capacidad:capacidad + n - primera_parte] = muestras[..., primera_parte:]
+        
+        self.total_escrito += total_bloque
+
+    def leer_ultimas(self, n, hasta=None):
+        """
+        Retorna una vista de las ultimas n muestras sin copiar ni bloquear.
+        
+        Args:
+            n: Numero de muestras a leer (maximo la capacidad del buffer)
+            hasta: Total de muestras escritas a tomar como final; por defecto el actual
+            
+        Returns:
+            Vista de numpy de longitud n, o (canales, n) con varios canales
+            (puede contener ceros al inicio del stream)
+        """
+        n = min(int(n), self.capacidad)
+        total = self.total_escrito if hasta is None else hasta
+        fin = total % self.capacidad + self.capacidad
+        return self.datos[..., fin - n:fin]
+
+    def reiniciar(self):
+        """Limpia el contenido y el contador del buffer."""
+        self.datos.fill(0.0)
+        self.total_escrito = 0
@@ -1,16 +1,37 @@
 import sounddevice as sd
 import numpy as np
 
+from buffer_circular import BufferCircular
+from compuerta_energia import CompuertaEnergia
+from grabador_captura import GrabadorCaptura
+
 
 class CapturaAudio:
     """Clase para capturar audio desde dispositivos de entrada (micrófonos)."""
     
-    def __init__(self, tasa_muestreo=44100, tamanio_buffer=4096):
+    def __init__(self, tasa_muestreo=44100, tamanio_buffer=4096, capacidad_stream=None, compuerta=None):
         """Inicializa el capturador de audio con parámetros de configuración."""
         self.tasa_muestreo = tasa_muestreo
         self.tamanio_buffer = tamanio_buffer
         self.buffer_actual = None
         self.dispositivo_entrada = None
+        # Bloque reutilizado por la captura bloqueante (sd.rec escribe en el directamente)
+        self._bloque_rec = np.zeros((tamanio_buffer, 1), dtype=np.float32)
+        
+        # Modo streaming: stream persistente que escribe en un buffer circular
+        if capacidad_stream is None:
+            capacidad_stream = max(4 * tamanio_buffer, tasa_muestreo)
+        self.buffer_stream = BufferCircular(capacidad_stream)
+        self.stream = None
+        self.desbordes_stream = 0
+        # Posicion (en muestras absolutas) hasta donde leyo el consumidor del stream
+        self.indice_lectura = 0
+        
+        # Compuerta de energia actualizada con cada bloque capturado
+        self.compuerta = compuerta if compuerta is not None else CompuertaEnergia(tasa_muestreo)
+        
+        # Grabacion opcional del stream crudo (ver iniciar_grabacion)
+        self.grabador = None
         
     def obtener_dispositivos_disponibles(self):
         return sd.query_devices()
@@ -105,18 +126,107 @@ class CapturaAudio:
                 else:
                     self.dispositivo_entrada = None
     
-    def capturar_buffer(self):
-        """Captura un buffer de audio del micrófono y lo retorna."""
+    def iniciar_stream(self):
+        """Abre un InputStream persistente que alimenta el buffer circular."""
+        self.detener_stream()
+        self.buffer_stream.reiniciar()
+        self.indice_lectura = 0
+        self.compuerta.reiniciar()
         try:
-            audio = sd.rec(
-                self.tamanio_buffer,
+            self.stream = sd.InputStream(
                 samplerate=self.tasa_muestreo,
                 channels=1,
                 dtype='float32',
+                device=self.dispositivo_entrada,
+                callback=self._callback_stream
+            )
+            self.stream.start()
+            return True
+        except Exception as e:
+            print(f"Error al iniciar el stream de audio: {e}")
+            self.stream = None
+            return False
+    
+    def detener_stream(self):
+        """Detiene y cierra el stream de captura si esta activo."""
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error al detener el stream de audio: {e}")
+            self.stream = None
+    
+    def stream_activo(self):
+        return self.stream is not None and self.stream.active
+    
+    def _callback_stream(self, indata, frames, tiempo, estado):
+        """Callback de sounddevice: copia el bloque entrante al buffer circular."""
+        if estado.input_overflow:
+            self.desbordes_stream += 1
+        self.buffer_stream.escribir(indata[:, 0])
+        self.compuerta.procesar(indata[:, 0])
+        if self.grabador is not None:
+            self.grabador.agregar(indata[:, 0])
+    
+    def iniciar_grabacion(self, ruta):
+        """Empieza a grabar el stream crudo en `ruta` (float32 sin cabecera, p. ej. captura.f32)."""
+        self.detener_grabacion()
+        self.grabador = GrabadorCaptura(ruta, self.tasa_muestreo)
+    
+    def detener_grabacion(self):
+        """Termina la grabación en curso, si la hay."""
+        grabador, self.grabador = self.grabador, None
+        if grabador is not None:
+            grabador.cerrar()
+    
+    def total_muestras(self):
+        """Numero total de muestras recibidas por el stream desde que se inicio."""
+        return self.buffer_stream.total_escrito
+    
+    def leer_ultimas_muestras(self, n=None):
+        """Retorna una vista (sin copia) de las ultimas n muestras del stream."""
+        if n is None:
+            n = self.tamanio_buffer
+        return self.buffer_stream.leer_ultimas(n)
+    
+    def leer_nuevas_muestras(self, maximo=None):
+        """
+        Retorna una vista de las muestras llegadas desde la lectura anterior.
+        
+        Pensado para un unico consumidor que procesa el stream de forma continua.
+        Si el consumidor se atraso mas que la capacidad del buffer (o que
+        maximo), solo se retornan las muestras mas recientes.
+        """
+        total = self.buffer_stream.total_escrito
+        limite = self.buffer_stream.capacidad if maximo is None else min(maximo, self.buffer_stream.capacidad)
+        pendientes = max(0, min(total - self.indice_lectura, limite))
+        self.indice_lectura = total
+        return self.buffer_stream.leer_ultimas(pendientes, hasta=total)
+    
+    def capturar_buffer(self):
+        """Captura un buffer de audio del micrófono y lo retorna."""
+        if self.stream is not None:
+            # En modo streaming no se bloquea: se toma la ventana mas reciente
+            if self.buffer_stream.total_escrito == 0:
+                return None
+            self.buffer_actual = self.leer_ultimas_muestras(self.tamanio_buffer)
+            return self.buffer_actual
+        
+        try:
+            if len(self._bloque_rec) != self.tamanio_buffer:
+                self._bloque_rec = np.zeros((self.tamanio_buffer, 1), dtype=np.float32)
+            sd.rec(
+                out=self._bloque_rec,
+                samplerate=self.tasa_muestreo,
                 device=self.dispositivo_entrada
             )
             sd.wait()
-            self.buffer_actual = audio.flatten()
+            # Vista del unico canal, sin copia: valida hasta la siguiente captura
+            self.buffer_actual = self._bloque_rec[:, 0]
+            self.compuerta.procesar(self.buffer_actual)
+            if self.grabador is not None:
+                self.grabador.agregar(self.buffer_actual)
             return self.buffer_actual
         except Exception as e:
             print(f"Error al capturar audio: {e}")
@@ -127,6 +237,10 @@ class CapturaAudio:
             return np.max(np.abs(self.buffer_actual))
         return 0.0
     
+    def senial_presente(self):
+        """Estado de la compuerta de energia: True si hay senial por encima del ruido."""
+        return self.compuerta.abierta
+    
     def audio_supera_umbral(self, umbral=0.01):
         """Verifica si el nivel de audio supera el umbral mínimo especificado."""
         amplitud = self.obtener_amplitud_maxima()
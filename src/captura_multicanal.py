@@ -0,0 +1,134 @@
+import functools
+
+import sounddevice as sd
+import numpy as np
+
+from buffer_circular import BufferCircular
+from compuerta_energia import CompuertaEnergia
+
+
+class CapturaMulticanal:
+    """Captura simultánea de varios canales, opcionalmente de varios dispositivos.
+
+    Cada dispositivo tiene su propio InputStream y un buffer circular de
+    (canales, capacidad); la lectura devuelve una sola matriz
+    (canales_totales, n) con las últimas muestras de todos los canales, lista
+    para el análisis por lote. Con un solo dispositivo la lectura es una vista
+    sin copia; con varios se copia a una matriz preasignada. Los relojes de
+    dispositivos distintos no están sincronizados, así que cada uno se alinea
+    a sus muestras más recientes.
+
+    Expone la misma interfaz de stream que CapturaAudio (stream_activo,
+    total_muestras, senial_presente), por lo que puede usarse con MotorAnalisis.
+    """
+
+    def __init__(self, fuentes, tasa_muestreo=44100, tamanio_buffer=4096, capacidad_stream=None,
+                 opciones_compuerta=None):
+        """
+        Args:
+            fuentes: Lista de (indice_dispositivo, lista de canales del dispositivo, desde 0)
+            tasa_muestreo: Frecuencia de muestreo en Hz (común a todos los dispositivos)
+            tamanio_buffer: Muestras por ventana de lectura
+            capacidad_stream: Muestras por canal que conserva cada buffer
+            opciones_compuerta: Parámetros de la CompuertaEnergia de cada canal
+        """
+        self.tasa_muestreo = tasa_muestreo
+        self.tamanio_buffer = tamanio_buffer
+        if capacidad_stream is None:
+            capacidad_stream = max(4 * tamanio_buffer, tasa_muestreo)
+        opciones_compuerta = opciones_compuerta or {}
+
+        self.fuentes = []
+        self.etiquetas = []
+        for dispositivo, canales in fuentes:
+            canales = list(canales)
+            self.fuentes.append({
+                'dispositivo': dispositivo,
+                'canales': canales,
+                'buffer': BufferCircular(capacidad_stream, len(canales)),
+                'compuertas': [CompuertaEnergia(tasa_muestreo, **opciones_compuerta) for _ in canales],
+                'stream': None,
+            })
+            self.etiquetas.extend(f"{dispositivo}:{canal}" for canal in canales)
+
+        self.canales_totales = len(self.etiquetas)
+        self.compuertas = [compuerta for fuente in self.fuentes for compuerta in fuente['compuertas']]
+        self.desbordes_stream = 0
+        self._ventana = None
+
+    def iniciar_stream(self):
+        """Abre un InputStream por dispositivo; retorna True si todos iniciaron."""
+        self.detener_stream()
+        for indice, fuente in enumerate(self.fuentes):
+            fuente['buffer'].reiniciar()
+            for compuerta in fuente['compuertas']:
+                compuerta.reiniciar()
+            try:
+                fuente['stream'] = sd.InputStream(
+                    samplerate=self.tasa_muestreo,
+                    channels=max(fuente['canales']) + 1,
+                    dtype='float32',
+                    device=fuente['dispositivo'],
+                    callback=functools.partial(self._callback_stream, indice)
+                )
+                fuente['stream'].start()
+            except Exception as e:
+                print(f"Error al iniciar el stream del dispositivo {fuente['dispositivo']}: {e}")
+                fuente['stream'] = None
+                self.detener_stream()
+                return False
+        return True
+
+    def detener_stream(self):
+        """Detiene y cierra los streams activos."""
+        for fuente in self.fuentes:
+            if fuente['stream'] is not None:
+                try:
+                    fuente['stream'].stop()
+                    fuente['stream'].close()
+                except Exception as e:
+                    print(f"Error al detener el stream de audio: {e}")
+                fuente['stream'] = None
+
+    def stream_activo(self):
+        return bool(self.fuentes) and all(
+            fuente['stream'] is not None and fuente['stream'].active for fuente in self.fuentes
+        )
+
+    def _callback_stream(self, indice_fuente, indata, frames, tiempo, estado):
+        """Callback de sounddevice: copia los canales elegidos y actualiza sus compuertas."""
+        if estado.input_overflow:
+            self.desbordes_stream += 1
+        fuente = self.fuentes[indice_fuente]
+        bloque = indata[:, fuente['canales']]
+        fuente['buffer'].escribir(bloque)
+        for columna, compuerta in enumerate(fuente['compuertas']):
+            compuerta.procesar(bloque[:, columna])
+
+    def total_muestras(self):
+        """Muestras por canal recibidas por el dispositivo mas atrasado."""
+        return min(fuente['buffer'].total_escrito for fuente in self.fuentes)
+
+    def leer_ultimas_muestras(self, n=None):
+        """Retorna una matriz (canales_totales, n) con las ultimas muestras de cada canal."""
+        if n is None:
+            n = self.tamanio_buffer
+        if len(self.fuentes) == 1:
+            return self.fuentes[0]['buffer'].leer_ultimas(n)
+
+        if self._ventana is None or self._ventana.shape[1] != n:
+            self._ventana = np.zeros((self.canales_totales, n), dtype=np.float32)
+        fila = 0
+        for fuente in self.fuentes:
+            canales = len(fuente['canales'])
+            self._ventana[fila:fila + canales] = fuente['buffer'].leer_ultimas(n)
+            fila += canales
+        return self._ventana
+
+    def canales_con_senial(self):
+        """Array booleano con el estado de la compuerta de energia de cada canal."""
+        return np.array([compuerta.abierta for compuerta in self.compuertas])
+
+    def senial_presente(self):
+        """True si al menos un canal tiene la compuerta abierta."""
+        return any(compuerta.abierta for compuerta in self.compuertas)
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+def _a_db(energia):
+    """Energía media (amplitud al cuadrado) a dBFS."""
+    return 10.0 * np.log10(energia + 1e-12)
+
+
+class CompuertaEnergia:
+    """Detector de actividad por energía que se actualiza a medida que llegan las muestras.
+
+    La energía RMS se mide en sub-bloques cortos de tamaño fijo, sin importar
+    cómo llegan cortados los bloques de captura. La compuerta se abre cuando
+    el nivel supera el piso de ruido más un margen durante al menos el tiempo
+    de ataque, y se cierra cuando queda por debajo de un umbral más bajo
+    (histéresis) durante el tiempo de liberación. Así un chasquido aislado no
+    la abre, una nota suave pero sostenida sí, y una nota que decae no la abre
+    y cierra repetidamente.
+
+    El piso de ruido baja rápido y sube lento, como un seguidor de mínimos;
+    con la compuerta abierta sube aún más lento para que una nota larga no se
+    confunda con ruido de fondo.
+    """
+
+    def __init__(self, tasa_muestreo=44100, margen_apertura_db=12.0, histeresis_db=6.0,
+                 tiempo_ataque=0.03, tiempo_liberacion=0.15, nivel_minimo=0.005,
+                 tiempo_subida_piso=4.0, tiempo_bajada_piso=0.5, tamanio_bloque=256):
+        """
+        Args:
+            tasa_muestreo: Frecuencia de muestreo en Hz
+            margen_apertura_db: dB sobre el piso de ruido necesarios para abrir
+            histeresis_db: dB por debajo del umbral de apertura para cerrar
+            tiempo_ataque: Segundos sobre el umbral de apertura antes de abrir
+            tiempo_liberacion: Segundos bajo el umbral de cierre antes de cerrar
+            nivel_minimo: RMS absoluto mínimo para abrir, aunque el piso sea muy bajo
+            tiempo_subida_piso: Constante de tiempo del piso de ruido al subir (s)
+            tiempo_bajada_piso: Constante de tiempo del piso de ruido al bajar (s)
+            tamanio_bloque: Muestras por medición de energía
+        """
+        self.tasa_muestreo = tasa_muestreo
+        self.margen_apertura_db = margen_apertura_db
+        self.histeresis_db = histeresis_db
+        self.nivel_minimo_db = _a_db(nivel_minimo ** 2)
+        self.tamanio_bloque = tamanio_bloque
+        self.bloques_ataque = max(1, int(round(tiempo_ataque * tasa_muestreo / tamanio_bloque)))
+        self.bloques_liberacion = max(1, int(round(tiempo_liberacion * tasa_muestreo / tamanio_bloque)))
+        # Coeficientes del piso de ruido por sub-bloque (filtro de un polo en dB)
+        self._coef_subida = np.exp(-tamanio_bloque / (tiempo_subida_piso * tasa_muestreo))
+        self._coef_subida_abierta = np.exp(-tamanio_bloque / (10.0 * tiempo_subida_piso * tasa_muestreo))
+        self._coef_bajada = np.exp(-tamanio_bloque / (tiempo_bajada_piso * tasa_muestreo))
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve al estado inicial (compuerta cerrada)."""
+        self.abierta = False
+        self.nivel_db = _a_db(0.0)
+        # El piso parte de modo que el umbral de apertura sea el nivel mínimo; luego se adapta
+        self.piso_ruido_db = self.nivel_minimo_db - self.margen_apertura_db
+        # Cuenta las aperturas: un cambio indica el inicio de una nota nueva
+        self.aperturas = 0
+        self._bloques_en_transicion = 0
+        self._energia_parcial = 0.0
+        self._muestras_parciales = 0
+
+    @property
+    def umbral_apertura_db(self):
+        return max(self.piso_ruido_db + self.margen_apertura_db, self.nivel_minimo_db)
+
+    @property
+    def umbral_cierre_db(self):
+        return self.umbral_apertura_db - self.histeresis_db
+
+    def procesar(self, muestras):
+        """
+        Actualiza la compuerta con un bloque de muestras nuevas.
+
+        Args:
+            muestras: Bloque de audio mono recién capturado (cualquier tamaño)
+
+        Returns:
+            True si la compuerta quedó abierta
+        """
+        muestras = np.asarray(muestras)
+        # Completar el sub-bloque que quedó a medias en la llamada anterior
+        faltan = self.tamanio_bloque - self._muestras_parciales
+        inicio = muestras[:faltan]
+        self._energia_parcial += float(np.dot(inicio, inicio))
+        self._muestras_parciales += len(inicio)
+        if self._muestras_parciales < self.tamanio_bloque:
+            return self.abierta
+        energias = [self._energia_parcial]
+
+        resto = muestras[faltan:]
+        completos = len(resto) // self.tamanio_bloque * self.tamanio_bloque
+        if completos:
+            bloques = resto[:completos].reshape(-1, self.tamanio_bloque)
+            energias.extend(np.einsum('ij,ij->i', bloques, bloques).tolist())
+        cola = resto[completos:]
+        self._energia_parcial = float(np.dot(cola, cola))
+        self._muestras_parciales = len(cola)
+
+        for energia in energias:
+            self._actualizar(_a_db(energia / self.tamanio_bloque))
+        return self.abierta
+
+    def _actualizar(self, nivel_db):
+        """Avanza la máquina de estados con el nivel de un sub-bloque."""
+        self.nivel_db = nivel_db
+        if nivel_db < self.piso_ruido_db:
+            coeficiente = self._coef_bajada
+        elif self.abierta:
+            coeficiente = self._coef_subida_abierta
+        else:
+            coeficiente = self._coef_subida
+        self.piso_ruido_db = coeficiente * self.piso_ruido_db + (1.0 - coeficiente) * nivel_db
+
+        if self.abierta:
+            if nivel_db < self.umbral_cierre_db:
+                self._bloques_en_transicion += 1
+                if self._bloques_en_transicion >= self.bloques_liberacion:
+                    self.abierta = False
+                    self._bloques_en_transicion = 0
+            else:
+                self._bloques_en_transicion = 0
+        elif nivel_db >= self.umbral_apertura_db:
+            self._bloques_en_transicion += 1
+            if self._bloques_en_transicion >= self.bloques_ataque:
+                self.abierta = True
+                self.aperturas += 1
+                self._bloques_en_transicion = 0
+        else:
+            self._bloques_en_transicion = 0
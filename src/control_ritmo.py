@@ -0,0 +1,65 @@
+import time
+
+
+class ControlRitmo:
+    """Limita la frecuencia de refresco de la interfaz y mide la tasa real de cuadros.
+
+    El ritmo se calcula contra plazos absolutos, de modo que el tiempo que tarda
+    cada cuadro no se acumula como retraso. Si un cuadro se pasa de su plazo, el
+    siguiente se programa de inmediato en lugar de intentar recuperar los perdidos.
+    """
+
+    def __init__(self, fps_maximo=30, ventana_medicion=1.0):
+        """
+        Args:
+            fps_maximo: Cuadros por segundo maximos de la interfaz
+            ventana_medicion: Segundos sobre los que se promedia la tasa medida
+        """
+        self.periodo = 1.0 / fps_maximo
+        self.ventana_medicion = ventana_medicion
+        self.fps = 0.0
+        self.duracion_medicion = ventana_medicion
+        self.cuadros_totales = 0
+        self.cuadros_atrasados = 0
+        self._proximo_plazo = None
+        self._inicio_medicion = time.perf_counter()
+        self._cuadros_medicion = 0
+
+    @property
+    def fps_maximo(self):
+        return 1.0 / self.periodo
+
+    def registrar_ciclo(self, cuadro_dibujado):
+        """
+        Registra un ciclo del bucle de la interfaz y actualiza la tasa medida.
+
+        Args:
+            cuadro_dibujado: True si en este ciclo se redibujo la interfaz
+
+        Returns:
+            True si se completo una ventana de medicion (hay una nueva tasa disponible)
+        """
+        if cuadro_dibujado:
+            self.cuadros_totales += 1
+            self._cuadros_medicion += 1
+        ahora = time.perf_counter()
+        transcurrido = ahora - self._inicio_medicion
+        if transcurrido >= self.ventana_medicion:
+            self.fps = self._cuadros_medicion / transcurrido
+            self.duracion_medicion = transcurrido
+            self._cuadros_medicion = 0
+            self._inicio_medicion = ahora
+            return True
+        return False
+
+    def retraso_siguiente_ms(self):
+        """Milisegundos a esperar hasta el plazo del siguiente cuadro."""
+        ahora = time.perf_counter()
+        if self._proximo_plazo is None:
+            self._proximo_plazo = ahora
+        self._proximo_plazo += self.periodo
+        if self._proximo_plazo < ahora:
+            # Cuadro atrasado: no se intentan recuperar los plazos perdidos
+            self.cuadros_atrasados += 1
+            self._proximo_plazo = ahora
+        return max(1, int(round((self._proximo_plazo - ahora) * 1000.0)))
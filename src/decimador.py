@@ -0,0 +1,108 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class DecimadorPolifasico:
+    """Decimador FIR anti-aliasing con estado para procesar un stream por bloques.
+
+    Solo se calculan las muestras de salida que se conservan (una de cada
+    `factor`), que es el ahorro de la forma polifasica: el costo por muestra de
+    entrada es longitud_filtro / factor multiplicaciones. El historial del filtro
+    y la fase de decimación se conservan entre bloques, asi que la salida es
+    continua sin importar como se corte la entrada.
+
+    La señal extendida (historial + bloque) y la salida viven en buffers que
+    solo crecen cuando llega un bloque más largo que los anteriores; en
+    régimen el filtrado no reserva memoria.
+    """
+
+    def __init__(self, factor, tasa_muestreo, frecuencia_paso=None):
+        """
+        Args:
+            factor: Factor de decimación entero
+            tasa_muestreo: Frecuencia de muestreo de entrada en Hz
+            frecuencia_paso: Límite de la banda de paso en Hz (por defecto 0.8 del nuevo Nyquist)
+        """
+        self.factor = int(factor)
+        self.tasa_muestreo = tasa_muestreo
+        self.tasa_salida = tasa_muestreo / self.factor
+        nyquist_salida = self.tasa_salida / 2
+        if frecuencia_paso is None:
+            frecuencia_paso = 0.8 * nyquist_salida
+        self.frecuencia_paso = frecuencia_paso
+
+        # La banda de transición termina donde empezaría a haber alias dentro de la banda de paso
+        frecuencia_rechazo = self.tasa_salida - frecuencia_paso
+        self.coeficientes = self._disenar_filtro(frecuencia_paso, frecuencia_rechazo)
+        self._coeficientes_invertidos = self.coeficientes[::-1].copy()
+
+        longitud = len(self.coeficientes)
+        self.historia = np.zeros(longitud - 1, dtype=np.float32)
+        self.fase = 0
+        self._extendida = np.zeros(0, dtype=np.float32)
+        self._salida = np.zeros(0, dtype=np.float32)
+
+    def _disenar_filtro(self, frecuencia_paso, frecuencia_rechazo):
+        """Filtro pasa-bajas de seno cardinal con ventana de Blackman."""
+        transicion = max(frecuencia_rechazo - frecuencia_paso, 1.0)
+        # Ancho de transición de Blackman ~ 5.5 * fs / N
+        longitud = int(np.ceil(5.5 * self.tasa_muestreo / transicion))
+        longitud += (-longitud) % self.factor
+        longitud = max(longitud, self.factor)
+
+        corte = (frecuencia_paso + frecuencia_rechazo) / 2 / self.tasa_muestreo
+        indices = np.arange(longitud) - (longitud - 1) / 2
+        coeficientes = 2 * corte * np.sinc(2 * corte * indices) * np.blackman(longitud)
+        return (coeficientes / coeficientes.sum()).astype(np.float32)
+
+    @staticmethod
+    def factor_para(tasa_muestreo, frecuencia_maxima, factor_maximo=8, margen=1.25):
+        """
+        Mayor factor potencia de dos que conserva frecuencia_maxima con margen
+        respecto al nuevo Nyquist.
+        """
+        factor = 1
+        while factor * 2 <= factor_maximo and tasa_muestreo / (factor * 2) >= 2 * frecuencia_maxima * margen:
+            factor *= 2
+        return factor
+
+    @property
+    def retardo(self):
+        """Retardo de grupo del filtro en muestras de entrada."""
+        return (len(self.coeficientes) - 1) / 2
+
+    def procesar(self, muestras):
+        """
+        Filtra y decima un bloque.
+
+        Returns:
+            Muestras de salida disponibles: una vista de un buffer interno,
+            válida hasta la siguiente llamada
+        """
+        longitud = len(self.coeficientes)
+        total = longitud - 1 + len(muestras)
+        if len(self._extendida) < total:
+            self._extendida = np.zeros(total, dtype=np.float32)
+            self._salida = np.zeros(total // self.factor + 1, dtype=np.float32)
+        extendida = self._extendida[:total]
+        extendida[:longitud - 1] = self.historia
+        extendida[longitud - 1:] = muestras
+        primera = longitud - 1 + self.fase
+
+        if primera >= total:
+            salida = self._salida[:0]
+            self.fase = primera - total
+        else:
+            # Cada ventana termina en una muestra de entrada que produce salida
+            ventanas = sliding_window_view(extendida, longitud)[primera - (longitud - 1)::self.factor]
+            salida = np.matmul(ventanas, self._coeficientes_invertidos, out=self._salida[:len(ventanas)])
+            ultima = primera + (len(salida) - 1) * self.factor
+            self.fase = ultima + self.factor - total
+
+        self.historia[:] = extendida[total - (longitud - 1):]
+        return salida
+
+    def reiniciar(self):
+        """Limpia el estado del filtro."""
+        self.historia.fill(0.0)
+        self.fase = 0
@@ -10,6 +10,7 @@ class DetectorNotas:
         self.instrumentos = {}
         self.notacion_espaniol = {}
         self.cargar_notas_referencia(ruta_archivo_notas)
+        self.construir_indice()
     
     def convertir_nota_espaniol(self, nota_ingles):
         """Convierte una nota en notación inglesa a española"""
@@ -35,22 +36,71 @@ class DetectorNotas:
         except json.JSONDecodeError:
             print(f"Error: El archivo {ruta_archivo} no es un JSON valido")
     
-    def encontrar_nota_mas_cercana(self, frecuencia_detectada):
+    def construir_indice(self):
+        """Precalcula arrays ordenados de notas y sus frecuencias en escala logaritmica."""
+        notas_ordenadas = sorted(self.notas_referencia.items(), key=lambda item: item[1])
+        self.nombres_indice = np.array([nombre for nombre, _ in notas_ordenadas], dtype=object)
+        self.frecuencias_indice = np.array([frecuencia for _, frecuencia in notas_ordenadas], dtype=np.float64)
+        self.log_frecuencias_indice = np.log2(self.frecuencias_indice)
+        # Nombres con una entrada extra (None) para las frecuencias sin nota
+        self.nombres_indice_vacio = np.append(self.nombres_indice, None)
+        self.indices_instrumento = {}
+        self.frecuencias_indice_vacio = np.append(self.frecuencias_indice, np.nan)
+        
+        # Estados de afinacion indexados por codigo (0: afinado, 1: cerca, 2: desafinado, 3: sin_audio)
+        self.nombres_estado = np.array(['afinado', 'cerca', 'desafinado', 'sin_audio'], dtype=object)
+        self.nombres_espaniol_indice = np.array(
+            [self.convertir_nota_espaniol(nombre) for nombre in self.nombres_indice] + [None],
+            dtype=object
+        )
+    
+    def _indices_mas_cercanos(self, log_frecuencias, log_indice=None):
+        """Indice de la nota mas cercana en cents para cada log2(frecuencia) dada."""
+        if log_indice is None:
+            log_indice = self.log_frecuencias_indice
+        total = len(log_indice)
+        if total == 1:
+            return np.zeros(np.shape(log_frecuencias), dtype=np.intp)
+        derecha = np.searchsorted(log_indice, log_frecuencias)
+        derecha = np.clip(derecha, 1, total - 1)
+        izquierda = derecha - 1
+        distancia_izquierda = log_frecuencias - log_indice[izquierda]
+        distancia_derecha = log_indice[derecha] - log_frecuencias
+        return np.where(distancia_izquierda <= distancia_derecha, izquierda, derecha)
+    
+    def _indice_instrumento(self, nombre_instrumento):
+        """Indice ordenado (nombres, frecuencias, log2) restringido a las cuerdas de un instrumento."""
+        indice = self.indices_instrumento.get(nombre_instrumento)
+        if indice is None:
+            cuerdas = self.frecuencias_instrumento(nombre_instrumento)
+            ordenadas = sorted(cuerdas.items(), key=lambda item: item[1])
+            nombres = np.array([nombre for nombre, _ in ordenadas], dtype=object)
+            frecuencias = np.array([frecuencia for _, frecuencia in ordenadas], dtype=np.float64)
+            indice = (nombres, frecuencias, np.log2(frecuencias))
+            self.indices_instrumento[nombre_instrumento] = indice
+        return indice
+    
+    def encontrar_nota_mas_cercana(self, frecuencia_detectada, instrumento=None):
         if frecuencia_detectada is None or frecuencia_detectada <= 0:
             return None, None, None
         
-        nota_mas_cercana = None
-        diferencia_minima = float('inf')
-        frecuencia_nota_cercana = None
+        if instrumento is None:
+            nombres, frecuencias, log_frecuencias = (
+                self.nombres_indice, self.frecuencias_indice, self.log_frecuencias_indice
+            )
+        else:
+            # Modo instrumento: solo se consideran sus cuerdas
+            nombres, frecuencias, log_frecuencias = self._indice_instrumento(instrumento)
+        if len(frecuencias) == 0:
+            return None, None, None
         
-        for nombre_nota, frecuencia_nota in self.notas_referencia.items():
-            diferencia = abs(frecuencia_detectada - frecuencia_nota)
-            if diferencia < diferencia_minima:
-                diferencia_minima = diferencia
-                nota_mas_cercana = nombre_nota
-                frecuencia_nota_cercana = frecuencia_nota
+        # Busqueda binaria en escala logaritmica (distancia en cents, no en Hz)
+        indice = int(self._indices_mas_cercanos(np.log2(frecuencia_detectada), log_frecuencias))
         
-        return nota_mas_cercana, frecuencia_nota_cercana, diferencia_minima
+        nota_mas_cercana = nombres[indice]
+        frecuencia_nota_cercana = float(frecuencias[indice])
+        diferencia = abs(frecuencia_detectada - frecuencia_nota_cercana)
+        return nota_mas_cercana, frecuencia_nota_cercana, diferencia
     
     def calcular_cents(self, frecuencia_detectada, frecuencia_referencia):
         """Calcula la desviación en cents entre la frecuencia detectada y la nota de referencia."""
@@ -72,9 +122,9 @@ class DetectorNotas:
         else:
             return "desafinado"
     
-    def analizar_frecuencia(self, frecuencia_detectada):
+    def analizar_frecuencia(self, frecuencia_detectada, instrumento=None):
         """Procesa la frecuencia detectada y retorna información completa de afinación."""
-        nota, frecuencia_ref, diferencia = self.encontrar_nota_mas_cercana(frecuencia_detectada)
+        nota, frecuencia_ref, diferencia = self.encontrar_nota_mas_cercana(frecuencia_detectada, instrumento)
         
         if nota is None:
             return {
@@ -99,6 +149,81 @@ class DetectorNotas:
             'estado': estado
         }
     
+    def analizar_frecuencias(self, frecuencias_detectadas):
+        """
+        Analiza un vector de frecuencias en una sola llamada vectorizada.
+        
+        Args:
+            frecuencias_detectadas: Array de frecuencias en Hz (NaN o <= 0 indica sin señal)
+            
+        Returns:
+            Diccionario de arrays paralelos: 'nota', 'nota_espaniol',
+            'frecuencia_detectada', 'frecuencia_referencia', 'cents', 'estado'
+        """
+        frecuencias = np.asarray(frecuencias_detectadas, dtype=np.float64)
+        validas = np.isfinite(frecuencias) & (frecuencias > 0) & (len(self.frecuencias_indice) > 0)
+        
+        log_frecuencias = np.log2(np.where(validas, frecuencias, 1.0))
+        if len(self.frecuencias_indice) > 0:
+            indices = self._indices_mas_cercanos(log_frecuencias)
+        else:
+            indices = np.zeros(frecuencias.shape, dtype=np.intp)
+        
+        log_referencia = self.log_frecuencias_indice[indices] if len(self.frecuencias_indice) > 0 else log_frecuencias
+        cents = np.where(validas, 1200 * (log_frecuencias - log_referencia), 0.0)
+        cents_abs = np.abs(cents)
+        codigos_estado = np.select([cents_abs <= 5, cents_abs <= 15], [0, 1], default=2)
+        codigos_estado = np.where(validas, codigos_estado, 3)
+        
+        indices_nombre = np.where(validas, indices, len(self.nombres_indice))
+        
+        return {
+            'nota': self.nombres_indice_vacio[indices_nombre],
+            'nota_espaniol': self.nombres_espaniol_indice[indices_nombre],
+            'frecuencia_detectada': frecuencias,
+            'frecuencia_referencia': self.frecuencias_indice_vacio[indices_nombre],
+            'cents': cents,
+            'estado': self.nombres_estado[codigos_estado]
+        }
+    
+    def analizar_cuerdas(self, frecuencias_cuerdas):
+        """
+        Afinación de cada cuerda respecto a su propia nota (modo rasgueo).
+        
+        Args:
+            frecuencias_cuerdas: Diccionario nota de la cuerda -> frecuencia
+                detectada en Hz (None si la cuerda no suena)
+            
+        Returns:
+            Lista de diccionarios, uno por cuerda en el orden recibido, con el
+            formato de analizar_frecuencia
+        """
+        resultados = []
+        for nota, frecuencia in frecuencias_cuerdas.items():
+            referencia = self.notas_referencia.get(nota)
+            if frecuencia is None or referencia is None:
+                cents, estado = 0.0, 'sin_audio'
+            else:
+                cents = self.calcular_cents(frecuencia, referencia)
+                estado = self.obtener_estado_afinacion(cents)
+            resultados.append({
+                'nota': nota,
+                'nota_espaniol': self.convertir_nota_espaniol(nota),
+                'frecuencia_detectada': frecuencia,
+                'frecuencia_referencia': referencia,
+                'cents': cents,
+                'estado': estado
+            })
+        return resultados
+    
     # Obtiene las notas correspondientes a un instrumento especifico
     def obtener_notas_instrumento(self, nombre_instrumento):
         return self.instrumentos.get(nombre_instrumento.lower(), [])
+    
+    # Obtiene las cuerdas de un instrumento como diccionario nota -> frecuencia
+    def frecuencias_instrumento(self, nombre_instrumento):
+        return {
+            nota: self.notas_referencia[nota]
+            for nota in self.obtener_notas_instrumento(nombre_instrumento)
+            if nota in self.notas_referencia
+        }
@@ -0,0 +1,197 @@
+import numpy as np
+
+_fft_lote = None
+
+
+def modulo_fft_lote():
+    """Importa scipy.fft la primera vez que se analiza un lote (None si no está instalado)."""
+    global _fft_lote
+    if _fft_lote is None:
+        try:
+            import scipy.fft as modulo
+        except ImportError:
+            modulo = False
+        _fft_lote = modulo
+    return _fft_lote or None
+
+
+def _fft_admite_salida():
+    """numpy >= 2.0 acepta out= en rfft/irfft; con versiones anteriores se copia el resultado."""
+    try:
+        np.fft.rfft(np.zeros(4, dtype=np.float32), out=np.empty(3, dtype=np.complex64))
+        return True
+    except TypeError:
+        return False
+
+
+FFT_CON_SALIDA = _fft_admite_salida()
+
+
+class PlanFFT:
+    """Transformadas rfft/irfft de forma fija sobre buffers preasignados.
+
+    La entrada se copia a un buffer con relleno de ceros que se conserva entre
+    llamadas y la salida se escribe en arrays propios del plan, así que un
+    ciclo en régimen no reserva memoria (con numpy >= 2.0). Los buffers son
+    float64: numpy convierte internamente la entrada float32 a doble precisión
+    en un array temporal, mientras que la copia inicial a la entrada del plan
+    no reserva nada. Los lotes (canales, n) usan scipy.fft con varios hilos si
+    está instalado; en ese caso se prioriza el paralelismo y el resultado se
+    copia al buffer del plan.
+
+    Los resultados son vistas de los buffers del plan: válidos hasta la
+    siguiente llamada.
+    """
+
+    def __init__(self, forma, tamanio_fft=None, dtype=np.float64):
+        """
+        Args:
+            forma: Forma de la señal de entrada, (n,) o (canales, n)
+            tamanio_fft: Longitud de la transformada (relleno de ceros); por defecto n
+            dtype: float32 o float64 (el espectro es complex64 o complex128)
+        """
+        self.forma = tuple(forma)
+        self.tamanio_fft = tamanio_fft or self.forma[-1]
+        dtype = np.dtype(dtype)
+        complejo = np.complex64 if dtype == np.float32 else np.complex128
+        forma_lote = self.forma[:-1]
+        self.entrada = np.zeros(forma_lote + (self.tamanio_fft,), dtype=dtype)
+        self.espectro = np.empty(forma_lote + (self.tamanio_fft // 2 + 1,), dtype=complejo)
+        self.salida = np.empty(forma_lote + (self.tamanio_fft,), dtype=dtype)
+        self._varios_hilos = len(forma_lote) > 0 and modulo_fft_lote() is not None
+
+    def cargar(self, muestras):
+        """Copia las muestras al inicio del buffer de entrada (el relleno sigue en cero)."""
+        np.copyto(self.entrada[..., :muestras.shape[-1]], muestras)
+        return self.entrada
+
+    def rfft(self):
+        """rfft del buffer de entrada hacia self.espectro."""
+        if self._varios_hilos:
+            np.copyto(self.espectro, modulo_fft_lote().rfft(self.entrada, axis=-1, workers=-1), casting='unsafe')
+        elif FFT_CON_SALIDA:
+            np.fft.rfft(self.entrada, out=self.espectro)
+        else:
+            np.copyto(self.espectro, np.fft.rfft(self.entrada), casting='unsafe')
+        return self.espectro
+
+    def irfft(self, espectro=None):
+        """irfft de `espectro` (por defecto self.espectro) hacia self.salida."""
+        espectro = self.espectro if espectro is None else espectro
+        if self._varios_hilos:
+            np.copyto(self.salida, modulo_fft_lote().irfft(espectro, self.tamanio_fft, axis=-1, workers=-1),
+                      casting='unsafe')
+        elif FFT_CON_SALIDA:
+            np.fft.irfft(espectro, self.tamanio_fft, out=self.salida)
+        else:
+            np.copyto(self.salida, np.fft.irfft(espectro, self.tamanio_fft), casting='unsafe')
+        return self.salida
+
+
+class EspacioEspectro:
+    """Memoria de trabajo del espectro ventaneado para una forma y tasa de muestreo.
+
+    Reúne lo que antes se recalculaba o se reservaba en cada trama: la ventana
+    de Hann, el eje de frecuencias, los límites de banda, el plan de FFT y los
+    buffers de la señal ventaneada, el espectro y las magnitudes.
+    """
+
+    def __init__(self, forma, tasa_muestreo, ventana, frecuencias):
+        """
+        Args:
+            forma: Forma de las tramas, (n,) o (canales, n)
+            tasa_muestreo: Frecuencia de muestreo en Hz
+            ventana: Ventana de análisis float64 de longitud n (compartida)
+            frecuencias: Eje de frecuencias de la rfft (compartido)
+        """
+        self.forma = tuple(forma)
+        self.tasa_muestreo = tasa_muestreo
+        self.ventana = ventana
+        self.frecuencias = frecuencias
+        self.plan = PlanFFT(forma)
+        self.magnitudes = np.empty(self.plan.espectro.shape)
+        self.limites_banda = {}
+
+    def calcular_espectro(self, muestras):
+        """Ventanea las muestras y calcula su rfft en los buffers del espacio."""
+        entrada = self.plan.cargar(muestras)
+        np.multiply(entrada, self.ventana, out=entrada)
+        return self.plan.rfft()
+
+    def calcular_magnitudes(self, espectro):
+        """Magnitud del espectro en el buffer del espacio."""
+        return np.abs(espectro, out=self.magnitudes)
+
+    def indice_limite(self, limite_frecuencia):
+        """Bins con frecuencia <= limite; el resultado queda en cache para todas las tramas."""
+        indice = self.limites_banda.get(limite_frecuencia)
+        if indice is None:
+            indice = int(np.searchsorted(self.frecuencias, limite_frecuencia, side='right'))
+            self.limites_banda[limite_frecuencia] = indice
+        return indice
+
+
+class EspacioDiferencia:
+    """Memoria de trabajo de la función de diferencia de YIN para un tamaño y retardo máximo.
+
+    d(tau) = E(0) + E(tau) - 2 r(tau), con la autocorrelación r por FFT. Todos
+    los intermedios (señal con relleno, espectros, correlación, energías
+    acumuladas, la curva normalizada y el resultado) están preasignados en
+    float64.
+    """
+
+    def __init__(self, tamanio, retardo_maximo):
+        self.tamanio = tamanio
+        self.retardo_maximo = retardo_maximo
+        self.longitud = tamanio - retardo_maximo
+        tamanio_fft = 1 << int(np.ceil(np.log2(tamanio + self.longitud)))
+        self.plan_senial = PlanFFT((tamanio,), tamanio_fft)
+        self.plan_referencia = PlanFFT((self.longitud,), tamanio_fft)
+        self.cuadrados = np.empty(tamanio, dtype=np.float64)
+        self.energia_acumulada = np.zeros(tamanio + 1, dtype=np.float64)
+        self.diferencia = np.empty(retardo_maximo + 1, dtype=np.float64)
+        self.retardos = np.arange(1, retardo_maximo + 1, dtype=np.float64)
+        self.acumulada = np.empty(retardo_maximo, dtype=np.float64)
+        self.positivos = np.empty(retardo_maximo, dtype=bool)
+        self.normalizada = np.empty(retardo_maximo + 1, dtype=np.float64)
+
+    def calcular(self, muestras):
+        """
+        Returns:
+            Vista de d(tau) para tau en [0, retardo_maximo], válida hasta la siguiente llamada
+        """
+        longitud = self.longitud
+        retardo_maximo = self.retardo_maximo
+        x = self.plan_senial.cargar(muestras)[:self.tamanio]
+        self.plan_referencia.cargar(muestras[:longitud])
+
+        espectro = self.plan_senial.rfft()
+        espectro_referencia = self.plan_referencia.rfft()
+        np.conjugate(espectro_referencia, out=espectro_referencia)
+        np.multiply(espectro, espectro_referencia, out=espectro)
+        correlacion = self.plan_senial.irfft()[:retardo_maximo + 1]
+
+        np.multiply(x, x, out=self.cuadrados)
+        np.cumsum(self.cuadrados, out=self.energia_acumulada[1:])
+        diferencia = self.diferencia
+        # E(tau) = A[tau + longitud] - A[tau]; se arma en el buffer de salida sin temporales
+        np.subtract(self.energia_acumulada[longitud:longitud + retardo_maximo + 1],
+                    self.energia_acumulada[:retardo_maximo + 1], out=diferencia)
+        diferencia += self.energia_acumulada[longitud]
+        diferencia -= 2.0 * correlacion
+        return diferencia
+
+    def normalizar(self):
+        """
+        Diferencia normalizada por la media acumulada (CMNDF) de la última d(tau).
+
+        Sin energía (silencio digital) no hay periodicidad: la curva queda en 1.
+        """
+        diferencia = self.diferencia
+        np.cumsum(diferencia[1:], out=self.acumulada)
+        np.greater(self.acumulada, 0.0, out=self.positivos)
+        normalizada = self.normalizada
+        normalizada.fill(1.0)
+        np.multiply(diferencia[1:], self.retardos, out=normalizada[1:], where=self.positivos)
+        np.divide(normalizada[1:], self.acumulada, out=normalizada[1:], where=self.positivos)
+        return normalizada
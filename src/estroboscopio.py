@@ -0,0 +1,152 @@
+import numpy as np
+
+
+class Estroboscopio:
+    """Afinador estroboscópico: sigue la fase de la nota fijada entre saltos consecutivos.
+
+    Una vez que la detección completa confirma la misma nota varias veces
+    seguidas, la señal se demodula (heterodino) a la frecuencia de referencia
+    de esa nota y a sus primeros armónicos: un producto escalar por ventana con
+    una tabla de exponenciales calculada al fijar la nota. La fase de cada
+    demodulación se mide contra un oscilador de referencia continuo en todo el
+    stream, así que entre dos ventanas avanza 2π k (f - f_ref) Δn / tasa: la
+    desviación sale de ese avance con resolución de décimas de cent y cuesta
+    una fracción de una detección completa.
+
+    El avance de fase solo se conoce módulo 2π; la estimación en cents de la
+    última detección completa predice el avance y la medición se desenvuelve
+    alrededor de esa predicción, por lo que saltos de varios análisis no
+    producen ambigüedad.
+    """
+
+    def __init__(self, armonicos=2, confirmaciones=3, suavizado=0.3, amplitud_minima=1e-4):
+        """
+        Args:
+            armonicos: Armónicos de la referencia que se demodulan (se combinan por energía)
+            confirmaciones: Detecciones completas seguidas de la misma nota para fijarla
+            suavizado: Coeficiente del promedio exponencial de la lectura en cents
+            amplitud_minima: Amplitud mínima (escala completa = 1) de la componente en la referencia
+        """
+        self.armonicos = armonicos
+        self.confirmaciones = confirmaciones
+        self.suavizado = suavizado
+        self.amplitud_minima = amplitud_minima
+        self._tabla = None
+        self._clave_tabla = None
+        self.liberar()
+
+    @property
+    def fijado(self):
+        return self.nota is not None
+
+    def liberar(self):
+        """Suelta la nota fijada; la próxima detección vuelve a contar confirmaciones."""
+        self.nota = None
+        self.frecuencia_referencia = None
+        self.candidata = None
+        self.repeticiones = 0
+        self.cents_estimados = None
+        self._olvidar_fase()
+
+    def _olvidar_fase(self):
+        self._fasores = None
+        self._posicion = None
+        self.cents = None
+        # Fase de la fundamental respecto a la referencia, en ciclos; es lo que dibuja la interfaz
+        self.fase = 0.0
+
+    def proponer(self, nota, frecuencia_referencia, cents=None):
+        """
+        Incorpora el resultado de una detección completa.
+
+        Args:
+            nota: Nota detectada (None si no se detectó ninguna)
+            frecuencia_referencia: Frecuencia de la nota en Hz
+            cents: Desviación estimada por la detección completa
+
+        Returns:
+            True si la nota queda (o sigue) fijada
+        """
+        if nota is None:
+            self.liberar()
+            return False
+        if nota == self.nota:
+            self.cents_estimados = cents
+            return True
+        if nota == self.candidata:
+            self.repeticiones += 1
+        else:
+            self.liberar()
+            self.candidata = nota
+            self.repeticiones = 1
+        if self.repeticiones >= self.confirmaciones:
+            self.nota = nota
+            self.frecuencia_referencia = frecuencia_referencia
+            self.cents_estimados = cents
+            return True
+        return False
+
+    def _tabla_para(self, longitud, tasa_muestreo):
+        """Exponenciales ventaneadas de la referencia y sus armónicos (solo los que caben bajo Nyquist)."""
+        clave = (self.frecuencia_referencia, longitud, tasa_muestreo)
+        if clave != self._clave_tabla:
+            numeros = np.arange(1, self.armonicos + 1)
+            numeros = numeros[numeros * self.frecuencia_referencia < 0.45 * tasa_muestreo]
+            ventana = np.hanning(longitud + 1)[:-1]
+            indices = np.arange(longitud)
+            self._numeros = numeros
+            self._tabla = ventana * np.exp(
+                -2j * np.pi * (numeros[:, None] * self.frecuencia_referencia / tasa_muestreo) * indices
+            )
+            self._escala = 0.5 * ventana.sum()
+            self._clave_tabla = clave
+            self._olvidar_fase()
+        return self._tabla
+
+    def actualizar(self, muestras, tasa_muestreo, posicion):
+        """
+        Mide el avance de fase desde la ventana anterior.
+
+        Args:
+            muestras: Ventana más reciente del stream
+            tasa_muestreo: Tasa de las muestras en Hz
+            posicion: Muestras del stream hasta el final de la ventana (absoluto)
+
+        Returns:
+            Desviación en cents respecto a la nota fijada, o None si aún no hay
+            dos ventanas comparables o la nota dejó de sonar
+        """
+        if not self.fijado:
+            return None
+        tabla = self._tabla_para(len(muestras), tasa_muestreo)
+        if len(self._numeros) == 0:
+            return None
+
+        # Fasores contra un oscilador de referencia que arranca en la muestra 0 del stream
+        inicio = posicion - len(muestras)
+        ciclos = (self._numeros * self.frecuencia_referencia * inicio / tasa_muestreo) % 1.0
+        fasores = (tabla @ muestras) * np.exp(-2j * np.pi * ciclos)
+        potencias = np.abs(fasores) ** 2
+        if np.sqrt(potencias[0]) < self.amplitud_minima * self._escala:
+            self._olvidar_fase()
+            return None
+
+        if self._fasores is not None and posicion > self._posicion:
+            avance = posicion - self._posicion
+            # Avance esperado según la última detección completa (o la lectura propia)
+            cents_previstos = self.cents if self.cents is not None else (self.cents_estimados or 0.0)
+            desvio_previsto = self.frecuencia_referencia * (2.0 ** (cents_previstos / 1200.0) - 1.0)
+            previsto = 2.0 * np.pi * self._numeros * desvio_previsto * avance / tasa_muestreo
+            medido = np.angle(fasores * np.conj(self._fasores))
+            # Se desenvuelve la medición alrededor del avance previsto
+            fases = previsto + np.angle(np.exp(1j * (medido - previsto)))
+            desvios = fases * tasa_muestreo / (2.0 * np.pi * self._numeros * avance)
+            desvio = float(np.sum(potencias * desvios) / np.sum(potencias))
+
+            cents = 1200.0 * np.log2(1.0 + desvio / self.frecuencia_referencia)
+            self.cents = cents if self.cents is None else self.cents + self.suavizado * (cents - self.cents)
+            self.fase = (self.fase + desvio * avance / tasa_muestreo) % 1.0
+
+        self._fasores = fasores
+        self._posicion = posicion
+        return self.cents
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def frecuencia_desafinada(frecuencia, cents):
+    """Aplica una desviación en cents a una frecuencia."""
+    return frecuencia * 2.0 ** (cents / 1200.0)
+
+
+def tono_puro(frecuencia, duracion_muestras, tasa_muestreo=44100, amplitud=0.5, fase=0.0):
+    """Genera una senoidal pura."""
+    tiempo = np.arange(duracion_muestras) / tasa_muestreo
+    return (amplitud * np.sin(2 * np.pi * frecuencia * tiempo + fase)).astype(np.float32)
+
+
+def cuerda_pulsada(frecuencia, duracion_muestras, tasa_muestreo=44100, amplitud=0.5, armonicos=10,
+                   decaimiento=3.0, inarmonicidad=0.0, fundamental_relativa=1.0, semilla=None):
+    """
+    Genera una cuerda pulsada: serie armónica con envolvente exponencial.
+
+    Args:
+        frecuencia: Frecuencia fundamental en Hz
+        duracion_muestras: Número de muestras a generar
+        armonicos: Número de parciales
+        decaimiento: Constante de decaimiento de la envolvente (1/s)
+        inarmonicidad: Coeficiente B de inarmonicidad de cuerda rigida
+        fundamental_relativa: Amplitud relativa de la fundamental (bajos: < 1)
+        semilla: Semilla para las fases aleatorias de los parciales
+    """
+    rng = np.random.default_rng(semilla)
+    tiempo = np.arange(duracion_muestras) / tasa_muestreo
+    senial = np.zeros(duracion_muestras)
+    for n in range(1, armonicos + 1):
+        frecuencia_parcial = n * frecuencia * np.sqrt(1.0 + inarmonicidad * n * n)
+        if frecuencia_parcial >= tasa_muestreo / 2:
+            break
+        amplitud_parcial = (fundamental_relativa if n == 1 else 1.0) / n
+        # Los parciales altos decaen mas rapido
+        envolvente = np.exp(-decaimiento * np.sqrt(n) * tiempo)
+        senial += amplitud_parcial * envolvente * np.sin(2 * np.pi * frecuencia_parcial * tiempo + rng.uniform(0, 2 * np.pi))
+    senial *= amplitud / np.max(np.abs(senial))
+    return senial.astype(np.float32)
+
+
+def agregar_ruido(senial, snr_db, semilla=None):
+    """Agrega ruido blanco gaussiano con la relación señal/ruido indicada en dB."""
+    rng = np.random.default_rng(semilla)
+    potencia_senial = np.mean(np.square(senial, dtype=np.float64))
+    potencia_ruido = potencia_senial / (10.0 ** (snr_db / 10.0))
+    ruido = rng.standard_normal(len(senial)) * np.sqrt(potencia_ruido)
+    return (senial + ruido).astype(np.float32)
+
+
+def generar_caso(tipo, frecuencia, duracion_muestras, tasa_muestreo=44100, semilla=None, snr_db=10.0):
+    """
+    Genera una señal de prueba por nombre de tipo.
+
+    Tipos: 'puro', 'pulsado', 'ruidoso' (pulsado + ruido) y 'bajo'
+    (pulsado con fundamental débil, como en cuerdas graves).
+    """
+    if tipo == 'puro':
+        return tono_puro(frecuencia, duracion_muestras, tasa_muestreo)
+    if tipo == 'pulsado':
+        return cuerda_pulsada(frecuencia, duracion_muestras, tasa_muestreo, semilla=semilla)
+    if tipo == 'ruidoso':
+        senial = cuerda_pulsada(frecuencia, duracion_muestras, tasa_muestreo, semilla=semilla)
+        return agregar_ruido(senial, snr_db, semilla)
+    if tipo == 'bajo':
+        return cuerda_pulsada(frecuencia, duracion_muestras, tasa_muestreo, fundamental_relativa=0.3,
+                              inarmonicidad=1e-4, semilla=semilla)
+    raise ValueError(f"Tipo de señal desconocido: '{tipo}'")
@@ -0,0 +1,93 @@
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+def ruta_metadatos(ruta):
+    """Archivo JSON que acompaña a una grabación cruda (tasa de muestreo y descartes)."""
+    return f"{ruta}.json"
+
+
+def leer_metadatos(ruta):
+    """Retorna los metadatos de una grabación cruda, o None si no los tiene."""
+    try:
+        with open(ruta_metadatos(ruta), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return None
+
+
+class GrabadorCaptura:
+    """Graba el stream crudo de captura (float32 mono, sin cabecera) a disco.
+
+    El callback de audio solo copia el bloque a una cola acotada; un hilo
+    escritor en segundo plano lo vuelca al archivo. Si el disco no da abasto y
+    la cola se llena, el bloque se descarta y se anota su posición: la captura
+    nunca espera a la grabación. Al cerrar se escribe un JSON con la tasa de
+    muestreo y los huecos, que ReproduccionCaptura y analizar_archivos.py
+    (como .f32) usan para leer la grabación.
+    """
+
+    def __init__(self, ruta, tasa_muestreo, capacidad_cola=256):
+        """
+        Args:
+            ruta: Archivo de salida (por convención con extensión .f32)
+            tasa_muestreo: Frecuencia de muestreo del stream en Hz
+            capacidad_cola: Bloques que pueden esperar al escritor antes de descartar
+        """
+        self.ruta = ruta
+        self.tasa_muestreo = tasa_muestreo
+        self.cola = queue.Queue(maxsize=capacidad_cola)
+        self.muestras_recibidas = 0
+        self.muestras_escritas = 0
+        self.bloques_descartados = 0
+        # Huecos de la grabación: [muestra del stream, muestras perdidas]
+        self.huecos = []
+        self._archivo = open(ruta, 'wb')
+        self._hilo = threading.Thread(target=self._escribir, name="GrabadorCaptura", daemon=True)
+        self._hilo.start()
+
+    def agregar(self, muestras):
+        """Encola una copia del bloque sin bloquear (se llama desde el callback de audio)."""
+        try:
+            self.cola.put_nowait(np.array(muestras, dtype=np.float32))
+        except queue.Full:
+            self.bloques_descartados += 1
+            self.huecos.append([self.muestras_recibidas, len(muestras)])
+        self.muestras_recibidas += len(muestras)
+
+    def _escribir(self):
+        """Hilo escritor: vuelca los bloques de la cola hasta recibir None."""
+        while True:
+            bloque = self.cola.get()
+            if bloque is None:
+                break
+            try:
+                bloque.tofile(self._archivo)
+                self.muestras_escritas += len(bloque)
+            except OSError as e:
+                print(f"Error al escribir la grabación: {e}")
+
+    def cerrar(self):
+        """Espera a que se escriba lo encolado, cierra el archivo y guarda los metadatos."""
+        if self._hilo is None:
+            return
+        self.cola.put(None)
+        self._hilo.join()
+        self._hilo = None
+        self._archivo.close()
+        metadatos = {
+            'tasa_muestreo': self.tasa_muestreo,
+            'canales': 1,
+            'dtype': 'float32',
+            'muestras': self.muestras_escritas,
+            'bloques_descartados': self.bloques_descartados,
+            'huecos': self.huecos,
+        }
+        with open(ruta_metadatos(self.ruta), 'w', encoding='utf-8') as archivo:
+            json.dump(metadatos, archivo, indent=2)
+        if self.bloques_descartados:
+            print(f"Grabación con {self.bloques_descartados} bloques descartados (ver {ruta_metadatos(self.ruta)})")
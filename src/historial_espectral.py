@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class HistorialEspectral:
+    """Historial de espectros recientes para la vista en cascada (espectrograma).
+
+    Cada espectro se reduce a un número fijo de columnas espaciadas en escala
+    logarítmica de frecuencia y se guarda en dB en un buffer circular espejado
+    de filas preasignado: cada fila se escribe dos veces (en i y en i + filas),
+    de modo que las últimas `filas` filas en orden cronológico son siempre una
+    vista contigua, sin copias ni np.roll. La memoria no crece con la duración
+    de la sesión y el costo de agregar o leer no depende de cuánto historial se
+    haya acumulado.
+
+    Con una paleta, cada fila se colorea además una sola vez al agregarla
+    (RGBA uint8, relativa al nivel máximo reciente), así que dibujar la
+    imagen no vuelve a normalizar ni a aplicar el mapa de colores al
+    historial completo en cada cuadro.
+    """
+
+    def __init__(self, filas=200, columnas=256, frecuencia_minima=40.0, frecuencia_maxima=1000.0,
+                 paleta=None, rango_db=60.0):
+        """
+        Args:
+            filas: Espectros que conserva el historial
+            columnas: Bins logarítmicos de frecuencia por espectro
+            frecuencia_minima: Borde inferior de la primera columna en Hz
+            frecuencia_maxima: Borde superior de la última columna en Hz
+            paleta: Tabla (niveles, 4) de colores RGBA uint8 del nivel mínimo al máximo
+            rango_db: Rango dinámico que cubre la paleta por debajo del nivel máximo reciente
+        """
+        self.filas = filas
+        self.columnas = columnas
+        self.frecuencia_minima = frecuencia_minima
+        self.frecuencia_maxima = frecuencia_maxima
+        # Bordes y centros de las columnas: fijos, se calculan una sola vez
+        self.bordes = np.geomspace(frecuencia_minima, frecuencia_maxima, columnas + 1)
+        self.centros = np.sqrt(self.bordes[:-1] * self.bordes[1:])
+        self.piso_db = -120.0
+        self._datos = np.full((2 * filas, columnas), self.piso_db, dtype=np.float32)
+        self._reducida = np.empty(columnas + 1, dtype=np.float64)
+        self._clave_columnas = None
+
+        self.paleta = paleta
+        self.rango_db = rango_db
+        self.referencia_db = None
+        if paleta is not None:
+            self._colores = np.empty((2 * filas, columnas, 4), dtype=np.uint8)
+            self._colores[:] = paleta[0]
+            self._niveles = np.empty(columnas, dtype=np.float64)
+            self._indices_color = np.empty(columnas, dtype=np.intp)
+        self.indice = 0
+        self.total = 0
+
+    def _preparar_columnas(self, frecuencias):
+        """Bins de la FFT de cada columna; se recalculan solo si cambia el eje de frecuencias."""
+        clave = (len(frecuencias), float(frecuencias[-1]))
+        if clave != self._clave_columnas:
+            ultimo = len(frecuencias) - 1
+            # Inicio de cada columna (más uno de cierre) para reduceat: máximo de sus bins
+            inicios = np.searchsorted(frecuencias, self.bordes)
+            self._inicios = np.minimum(inicios, ultimo)
+            # Columnas más angostas que un bin, sin bins propios: toman el bin más cercano a su centro
+            vacias = np.flatnonzero(inicios[1:] <= inicios[:-1])
+            posiciones = np.interp(self.centros[vacias], frecuencias, np.arange(len(frecuencias)))
+            self._vacias = vacias
+            self._bins_cercanos = np.clip(np.rint(posiciones), 0, ultimo).astype(np.intp)
+            self._clave_columnas = clave
+
+    def agregar(self, frecuencias, magnitudes):
+        """Reduce un espectro a las columnas logarítmicas y lo agrega en dB (y en color, con paleta)."""
+        if magnitudes is None or len(magnitudes) < 2:
+            return
+        self._preparar_columnas(frecuencias)
+        fila = np.maximum.reduceat(magnitudes, self._inicios, out=self._reducida)[:-1]
+        fila[self._vacias] = magnitudes[self._bins_cercanos]
+        np.maximum(fila, 1e-12, out=fila)
+        np.log10(fila, out=fila)
+        fila *= 20.0
+        self._datos[self.indice] = fila
+        self._datos[self.indice + self.filas] = fila
+        if self.paleta is not None:
+            self._colorear(fila)
+        self.indice = (self.indice + 1) % self.filas
+        self.total += 1
+
+    def _colorear(self, fila):
+        """Convierte la fila en dB a colores de la paleta, relativa al nivel máximo reciente."""
+        # El nivel de referencia sube de inmediato y baja despacio
+        maximo = float(fila.max())
+        if self.referencia_db is None or maximo > self.referencia_db:
+            self.referencia_db = maximo
+        else:
+            self.referencia_db += 0.02 * (maximo - self.referencia_db)
+        niveles = self._niveles
+        ultimo_color = len(self.paleta) - 1
+        np.subtract(fila, self.referencia_db - self.rango_db, out=niveles)
+        niveles *= ultimo_color / self.rango_db
+        np.clip(niveles, 0, ultimo_color, out=niveles)
+        np.copyto(self._indices_color, niveles, casting='unsafe')
+        colores = self._colores[self.indice]
+        np.take(self.paleta, self._indices_color, axis=0, out=colores)
+        self._colores[self.indice + self.filas] = colores
+
+    def imagen(self):
+        """Vista (filas, columnas) en dB, de la fila más antigua a la más reciente; sin copias."""
+        return self._datos[self.indice:self.indice + self.filas]
+
+    def imagen_color(self):
+        """Vista (filas, columnas, 4) RGBA del historial coloreado (requiere paleta); sin copias."""
+        return self._colores[self.indice:self.indice + self.filas]
+
+    def ultima(self):
+        """Fila más reciente en dB."""
+        return self._datos[self.indice + self.filas - 1]
+
+    def columna(self, frecuencia):
+        """Posición (fraccionaria) de una frecuencia en el eje de columnas."""
+        return self.columnas * np.log(frecuencia / self.frecuencia_minima) / np.log(
+            self.frecuencia_maxima / self.frecuencia_minima
+        )
+
+    def reiniciar(self):
+        """Vacía el historial."""
+        self._datos.fill(self.piso_db)
+        if self.paleta is not None:
+            self._colores[:] = self.paleta[0]
+        self.referencia_db = None
+        self.indice = 0
+        self.total = 0
@@ -1,10 +1,10 @@
+import time
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import numpy as np
 
+from historial_espectral import HistorialEspectral
+
 
 class InterfazGrafica:
     # Inicializa la ventana principal y todos los componentes visuales
@@ -58,6 +58,70 @@ class InterfazGrafica:
         self.combo_dispositivos.pack(side=tk.LEFT, padx=5)
         self.callback_cambio_dispositivo = None
         
+        marco_instrumento = tk.Frame(marco_principal, bg='#2b2b2b')
+        marco_instrumento.pack(pady=2)
+        
+        etiqueta_instrumento = tk.Label(
+            marco_instrumento,
+            text="Instrumento:",
+            font=('Arial', 10),
+            bg='#2b2b2b',
+            fg='#aaaaaa'
+        )
+        etiqueta_instrumento.pack(side=tk.LEFT, padx=5)
+        
+        self.combo_instrumentos = ttk.Combobox(
+            marco_instrumento,
+            state='readonly',
+            width=20,
+            font=('Arial', 9)
+        )
+        self.combo_instrumentos.pack(side=tk.LEFT, padx=5)
+        self.callback_cambio_instrumento = None
+        self.instrumentos_info = []
+        
+        # Modo rasgueo: afinacion de todas las cuerdas de un acorde
+        self.variable_rasgueo = tk.BooleanVar(value=False)
+        self.casilla_rasgueo = tk.Checkbutton(
+            marco_instrumento,
+            text="Rasgueo",
+            variable=self.variable_rasgueo,
+            command=self._manejar_cambio_rasgueo,
+            font=('Arial', 10),
+            bg='#2b2b2b',
+            fg='#aaaaaa',
+            selectcolor='#1a1a1a',
+            activebackground='#2b2b2b'
+        )
+        self.casilla_rasgueo.pack(side=tk.LEFT, padx=5)
+        self.callback_rasgueo = None
+        
+        # Modo estroboscopio: seguimiento de fase de la nota fijada
+        self.variable_estroboscopio = tk.BooleanVar(value=False)
+        self.casilla_estroboscopio = tk.Checkbutton(
+            marco_instrumento,
+            text="Estroboscopio",
+            variable=self.variable_estroboscopio,
+            command=self._manejar_cambio_estroboscopio,
+            font=('Arial', 10),
+            bg='#2b2b2b',
+            fg='#aaaaaa',
+            selectcolor='#1a1a1a',
+            activebackground='#2b2b2b'
+        )
+        self.casilla_estroboscopio.pack(side=tk.LEFT, padx=5)
+        self.callback_estroboscopio = None
+        
+        # Tasa de refresco de la interfaz y del analisis
+        self.etiqueta_rendimiento = tk.Label(
+            marco_principal,
+            text="",
+            font=('Arial', 8),
+            bg='#2b2b2b',
+            fg='#666666'
+        )
+        self.etiqueta_rendimiento.pack()
+        
         marco_nota = tk.Frame(marco_principal, bg='#2b2b2b')
         marco_nota.pack(pady=10)
         
@@ -90,6 +154,11 @@ class InterfazGrafica:
         )
         self.etiqueta_frecuencia.pack()
         
+        # Fila de cuerdas del modo rasgueo; solo se muestra cuando llegan resultados por cuerda
+        self.marco_cuerdas = tk.Frame(marco_nota, bg='#2b2b2b')
+        self.etiquetas_cuerdas = {}
+        self.cuerdas_visibles = False
+        
         marco_medidor = tk.Frame(marco_principal, bg='#2b2b2b')
         marco_medidor.pack(pady=20)
         
@@ -102,6 +171,24 @@ class InterfazGrafica:
         )
         self.canvas_medidor.pack()
         
+        # Franjas del estroboscopio: se desplazan con la fase de la nota respecto a la referencia
+        self.canvas_estroboscopio = tk.Canvas(
+            marco_medidor,
+            width=600,
+            height=30,
+            bg='#1a1a1a',
+            highlightthickness=0
+        )
+        self.periodo_franjas = 40
+        for indice in range(-1, 600 // self.periodo_franjas + 1):
+            x = indice * self.periodo_franjas
+            self.canvas_estroboscopio.create_rectangle(
+                x, 4, x + self.periodo_franjas // 2, 26, fill='white', width=0, tags='franja'
+            )
+        self.desplazamiento_franjas = 0.0
+        self.color_franjas = 'white'
+        self.estroboscopio_visible = False
+        
         self.etiqueta_cents = tk.Label(
             marco_medidor,
             text="0 cents",
@@ -111,16 +198,12 @@ class InterfazGrafica:
         )
         self.etiqueta_cents.pack(pady=5)
         
-        self.figura_espectro = Figure(figsize=(8, 3), facecolor='#2b2b2b')
-        self.eje_espectro = self.figura_espectro.add_subplot(111)
-        self.eje_espectro.set_facecolor('#1a1a1a')
-        self.eje_espectro.set_xlabel('Frecuencia (Hz)', color='white')
-        self.eje_espectro.set_ylabel('Magnitud', color='white')
-        self.eje_espectro.tick_params(colors='white')
-        self.eje_espectro.grid(True, alpha=0.3)
-        
-        self.canvas_espectro = FigureCanvasTkAgg(self.figura_espectro, marco_principal)
-        self.canvas_espectro.get_tk_widget().pack(pady=10)
+        # El espectro se crea despues (crear_espectro) para no cargar matplotlib al abrir la ventana
+        self.marco_espectro = tk.Frame(marco_principal, bg='#2b2b2b', width=800, height=300)
+        self.marco_espectro.pack(pady=10)
+        self.figura_espectro = None
+        self.eje_espectro = None
+        self.canvas_espectro = None
         
         self.etiqueta_estado = tk.Label(
             marco_principal,
@@ -131,9 +214,115 @@ class InterfazGrafica:
         )
         self.etiqueta_estado.pack(pady=10)
         
+        # Superposicion opcional con los tiempos por etapa (F3 para mostrar u ocultar)
+        self.etiqueta_metricas = tk.Label(
+            self.ventana,
+            text="",
+            font=('Courier', 8),
+            bg='#1a1a1a',
+            fg='#00cc66',
+            justify=tk.LEFT
+        )
+        self.metricas_visibles = False
+        self.metricas = None
+        self.ventana.bind('<F3>', self.alternar_metricas)
+        # F4 alterna el espectro instantaneo y la cascada con su historial
+        self.ventana.bind('<F4>', self.alternar_cascada)
+        
+        # Ultimas opciones aplicadas a cada widget, para omitir reconfiguraciones sin cambios
+        self.opciones_widgets = {}
         self.dibujar_medidor_inicial()
     
-    # Dibuja el medidor de afinacion inicial en posicion neutral
+    # Crea la grafica del espectro importando matplotlib solo cuando se necesita.
+    # Los artistas se crean una sola vez (modo retenido) y se actualizan con blitting.
+    def crear_espectro(self, limite_frecuencia=1000):
+        if self.canvas_espectro is not None:
+            return
+        
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from matplotlib import colormaps
+        
+        self.figura_espectro = Figure(figsize=(8, 3), facecolor='#2b2b2b')
+        self.eje_espectro = self.figura_espectro.add_subplot(111)
+        self.eje_espectro.set_facecolor('#1a1a1a')
+        self.eje_espectro.set_xlabel('Frecuencia (Hz)', color='white')
+        self.eje_espectro.set_ylabel('Magnitud', color='white')
+        self.eje_espectro.tick_params(colors='white')
+        self.eje_espectro.grid(True, alpha=0.3)
+        self.eje_espectro.set_xlim(0, limite_frecuencia)
+        self.escala_espectro = 1.0
+        self.eje_espectro.set_ylim(0, self.escala_espectro)
+        
+        # Artistas animados: no forman parte del fondo cacheado
+        self.linea_espectro, = self.eje_espectro.plot(
+            [], [], color='#00aaff', linewidth=1, animated=True
+        )
+        self.marcador_espectro = self.eje_espectro.axvline(
+            x=0, color='#ff0000', linestyle='--', linewidth=2, animated=True, visible=False
+        )
+        self.texto_espectro = self.eje_espectro.text(
+            0.98, 0.92, '', transform=self.eje_espectro.transAxes, ha='right', va='top',
+            color='white', animated=True,
+            bbox=dict(facecolor='#2b2b2b', edgecolor='white', boxstyle='round')
+        )
+        self.texto_espectro.set_visible(False)
+        self.fondo_espectro = None
+        
+        # Cascada: el historial se dibuja como una sola imagen en unos ejes superpuestos
+        # Cada fila se colorea al agregarla: dibujar no normaliza el historial completo
+        paleta = (colormaps['magma'](np.linspace(0.0, 1.0, 256)) * 255).astype(np.uint8)
+        self.historial_espectral = HistorialEspectral(frecuencia_maxima=limite_frecuencia, paleta=paleta)
+        historial = self.historial_espectral
+        self.eje_cascada = self.figura_espectro.add_axes(self.eje_espectro.get_position(), visible=False)
+        self.eje_cascada.set_facecolor('#1a1a1a')
+        self.eje_cascada.set_xlabel('Frecuencia (Hz)', color='white')
+        self.eje_cascada.set_ylabel('Historial', color='white')
+        self.eje_cascada.tick_params(colors='white')
+        self.imagen_cascada = self.eje_cascada.imshow(
+            historial.imagen_color(), aspect='auto', origin='lower', interpolation='nearest',
+            extent=(0, historial.columnas, 0, historial.filas), animated=True
+        )
+        marcas = [f for f in (50, 100, 200, 500, 1000, 2000, 5000)
+                  if historial.frecuencia_minima <= f <= historial.frecuencia_maxima]
+        self.eje_cascada.set_xticks([historial.columna(f) for f in marcas])
+        self.eje_cascada.set_xticklabels([str(f) for f in marcas])
+        self.eje_cascada.set_yticks([])
+        self.cascada_visible = False
+        
+        self.canvas_espectro = FigureCanvasTkAgg(self.figura_espectro, self.marco_espectro)
+        self.canvas_espectro.get_tk_widget().pack()
+        self.canvas_espectro.mpl_connect('draw_event', self._guardar_fondo_espectro)
+        self.canvas_espectro.draw()
+    
+    # Guarda el fondo estatico (ejes, rejilla, etiquetas) tras cada redibujado completo
+    def _guardar_fondo_espectro(self, evento):
+        self.fondo_espectro = self.canvas_espectro.copy_from_bbox(self._eje_visible().bbox)
+        self._dibujar_artistas_espectro()
+    
+    def _eje_visible(self):
+        return self.eje_cascada if self.cascada_visible else self.eje_espectro
+    
+    def _dibujar_artistas_espectro(self):
+        if self.cascada_visible:
+            self.eje_cascada.draw_artist(self.imagen_cascada)
+            return
+        self.eje_espectro.draw_artist(self.linea_espectro)
+        self.eje_espectro.draw_artist(self.marcador_espectro)
+        self.eje_espectro.draw_artist(self.texto_espectro)
+    
+    # Reduce los bins al ancho en pixeles de los ejes conservando el maximo de cada grupo
+    def _reducir_espectro(self, frecuencias, magnitudes):
+        ancho_pixeles = max(1, int(self.eje_espectro.bbox.width))
+        total = len(magnitudes)
+        if total <= ancho_pixeles:
+            return frecuencias, magnitudes
+        
+        bins_por_pixel = -(-total // ancho_pixeles)
+        inicios = np.arange(0, total, bins_por_pixel)
+        return frecuencias[inicios], np.maximum.reduceat(magnitudes, inicios)
+    
+    # Dibuja una sola vez la escala estatica del medidor y crea la aguja en posicion neutral
     def dibujar_medidor_inicial(self):
         self.canvas_medidor.delete("all")
         
@@ -152,60 +341,127 @@ class InterfazGrafica:
                     font=('Arial', 9)
                 )
         
-        self.canvas_medidor.create_line(300, 20, 300, 60, fill='white', width=3)
-        self.canvas_medidor.create_polygon(300, 15, 295, 25, 305, 25, fill='white')
+        # La aguja se mueve despues con coords/itemconfig, sin redibujar la escala
+        self.aguja_linea = self.canvas_medidor.create_line(300, 20, 300, 60, fill='white', width=3)
+        self.aguja_punta = self.canvas_medidor.create_polygon(300, 15, 295, 25, 305, 25, fill='white')
+        self.estado_aguja = (300, 'white')
+    
+    # Lleva la aguja a la posicion neutral
+    def reiniciar_medidor(self):
+        self.actualizar_medidor(0, 'white')
     
-    # Actualiza el medidor con la desviacion actual en cents
+    # Actualiza el medidor con la desviacion actual en cents moviendo solo la aguja
     def actualizar_medidor(self, cents, color):
-        self.canvas_medidor.delete("all")
+        cents_limitados = max(-50, min(50, cents))
+        posicion_x = int(round(300 + (cents_limitados * 5)))
         
-        self.canvas_medidor.create_line(50, 40, 550, 40, fill='#555555', width=2)
+        if (posicion_x, color) == self.estado_aguja:
+            return
         
-        for i in range(-50, 51, 10):
-            x = 300 + (i * 5)
-            altura = 15 if i % 20 == 0 else 10
-            self.canvas_medidor.create_line(x, 40, x, 40 - altura, fill='#888888', width=1)
-            
-            if i % 20 == 0:
-                self.canvas_medidor.create_text(
-                    x, 60, 
-                    text=str(i), 
-                    fill='#aaaaaa', 
-                    font=('Arial', 9)
-                )
+        posicion_anterior, color_anterior = self.estado_aguja
+        if posicion_x != posicion_anterior:
+            self.canvas_medidor.coords(self.aguja_linea, posicion_x, 20, posicion_x, 60)
+            self.canvas_medidor.coords(
+                self.aguja_punta,
+                posicion_x, 15,
+                posicion_x - 5, 25,
+                posicion_x + 5, 25
+            )
+        if color != color_anterior:
+            self.canvas_medidor.itemconfig(self.aguja_linea, fill=color)
+            self.canvas_medidor.itemconfig(self.aguja_punta, fill=color)
+        self.estado_aguja = (posicion_x, color)
+    
+    # Aplica opciones a un widget solo si difieren de las ultimas aplicadas
+    def _configurar_widget(self, widget, **opciones):
+        anteriores = self.opciones_widgets.setdefault(widget, {})
+        cambios = {clave: valor for clave, valor in opciones.items() if anteriores.get(clave) != valor}
+        if cambios:
+            widget.config(**cambios)
+            anteriores.update(cambios)
+    
+    # Muestra la tasa de refresco de la interfaz y del analisis
+    def actualizar_rendimiento(self, fps_interfaz, tasa_analisis, tramas_descartadas, piso_ruido_db=None):
+        texto = (f"Interfaz: {fps_interfaz:.0f} fps | Análisis: {tasa_analisis:.0f}/s | "
+                 f"Descartadas: {tramas_descartadas}")
+        if piso_ruido_db is not None:
+            texto += f" | Ruido: {piso_ruido_db:.0f} dBFS"
+        self._configurar_widget(self.etiqueta_rendimiento, text=texto)
+    
+    # Muestra u oculta la superposicion de metricas de rendimiento
+    def alternar_metricas(self, evento=None):
+        self.metricas_visibles = not self.metricas_visibles
+        if self.metricas_visibles:
+            self.etiqueta_metricas.place(relx=1.0, x=-12, y=12, anchor='ne')
+            self.etiqueta_metricas.lift()
+        else:
+            self.etiqueta_metricas.place_forget()
+    
+    # Actualiza el texto de la superposicion de metricas
+    def mostrar_metricas(self, texto):
+        self._configurar_widget(self.etiqueta_metricas, text=texto)
+    
+    # Alterna entre el espectro instantaneo y la cascada (el historial se registra siempre)
+    def alternar_cascada(self, evento=None):
+        if self.canvas_espectro is None:
+            return
+        self.cascada_visible = not self.cascada_visible
+        self.eje_espectro.set_visible(not self.cascada_visible)
+        self.eje_cascada.set_visible(self.cascada_visible)
+        self.fondo_espectro = None
+        self.canvas_espectro.draw()
+    
+    # Redibuja la imagen de la cascada con el historial actual
+    def _actualizar_cascada(self):
+        self.imagen_cascada.set_data(self.historial_espectral.imagen_color())
         
-        cents_limitados = max(-50, min(50, cents))
-        posicion_x = 300 + (cents_limitados * 5)
-        
-        self.canvas_medidor.create_line(posicion_x, 20, posicion_x, 60, fill=color, width=3)
-        self.canvas_medidor.create_polygon(
-            posicion_x, 15, 
-            posicion_x - 5, 25, 
-            posicion_x + 5, 25, 
-            fill=color
-        )
+        if self.fondo_espectro is None:
+            self.canvas_espectro.draw()
+            return
+        
+        # Blitting: la imagen tiene tamaño fijo, el costo no depende de cuanto historial haya
+        self.canvas_espectro.restore_region(self.fondo_espectro)
+        self.eje_cascada.draw_artist(self.imagen_cascada)
+        self.canvas_espectro.blit(self.eje_cascada.bbox)
     
     # Actualiza el espectro de frecuencias con nuevos datos
     def actualizar_espectro(self, frecuencias, magnitudes, frecuencia_detectada=None):
-        self.eje_espectro.clear()
-        self.eje_espectro.plot(frecuencias, magnitudes, color='#00aaff', linewidth=1)
-        
-        if frecuencia_detectada is not None:
-            self.eje_espectro.axvline(
-                x=frecuencia_detectada, 
-                color='#ff0000', 
-                linestyle='--', 
-                linewidth=2,
-                label=f'Detectada: {frecuencia_detectada:.1f} Hz'
-            )
-            self.eje_espectro.legend(facecolor='#2b2b2b', edgecolor='white', labelcolor='white')
+        if self.canvas_espectro is None:
+            return
         
-        self.eje_espectro.set_facecolor('#1a1a1a')
-        self.eje_espectro.set_xlabel('Frecuencia (Hz)', color='white')
-        self.eje_espectro.set_ylabel('Magnitud', color='white')
-        self.eje_espectro.tick_params(colors='white')
-        self.eje_espectro.grid(True, alpha=0.3)
-        self.canvas_espectro.draw()
+        self.historial_espectral.agregar(frecuencias, magnitudes)
+        if self.cascada_visible:
+            self._actualizar_cascada()
+            return
+        
+        frecuencias, magnitudes = self._reducir_espectro(frecuencias, magnitudes)
+        self.linea_espectro.set_data(frecuencias, magnitudes)
+        
+        if frecuencia_detectada:
+            self.marcador_espectro.set_xdata([frecuencia_detectada, frecuencia_detectada])
+            self.marcador_espectro.set_visible(True)
+            self.texto_espectro.set_text(f'Detectada: {frecuencia_detectada:.1f} Hz')
+            self.texto_espectro.set_visible(True)
+        else:
+            self.marcador_espectro.set_visible(False)
+            self.texto_espectro.set_visible(False)
+        
+        # Solo se redibuja todo cuando cambia la escala vertical (pico fuera de rango)
+        pico = float(np.max(magnitudes)) if len(magnitudes) > 0 else 0.0
+        if pico > self.escala_espectro or (pico > 0 and pico < 0.25 * self.escala_espectro):
+            self.escala_espectro = pico * 1.2
+            self.eje_espectro.set_ylim(0, self.escala_espectro)
+            self.canvas_espectro.draw()
+            return
+        
+        if self.fondo_espectro is None:
+            self.canvas_espectro.draw()
+            return
+        
+        # Blitting: restaurar el fondo y redibujar solo los artistas dinamicos
+        self.canvas_espectro.restore_region(self.fondo_espectro)
+        self._dibujar_artistas_espectro()
+        self.canvas_espectro.blit(self.eje_espectro.bbox)
     
     # Actualiza todos los elementos de la interfaz con nueva informacion de afinacion
     def actualizar_interfaz(self, info_afinacion, frecuencias=None, magnitudes=None):
@@ -218,17 +474,19 @@ class InterfazGrafica:
         color = self.colores.get(estado, self.colores['sin_audio'])
         
         if nota is None:
-            self.etiqueta_nota_ingles.config(text="--", fg='white')
-            self.etiqueta_nota_espaniol.config(text="--", fg='#aaaaaa')
-            self.etiqueta_frecuencia.config(text="Sin senal")
-            self.etiqueta_cents.config(text="-- cents")
-            self.etiqueta_estado.config(text="Esperando audio...")
-            self.dibujar_medidor_inicial()
+            self._configurar_widget(self.etiqueta_nota_ingles, text="--", fg='white')
+            self._configurar_widget(self.etiqueta_nota_espaniol, text="--", fg='#aaaaaa')
+            self._configurar_widget(self.etiqueta_frecuencia, text="Sin senal")
+            self._configurar_widget(self.etiqueta_cents, text="-- cents")
+            self._configurar_widget(self.etiqueta_estado, text="Esperando audio...")
+            self.reiniciar_medidor()
         else:
-            self.etiqueta_nota_ingles.config(text=nota, fg=color)
-            self.etiqueta_nota_espaniol.config(text=nota_espaniol, fg=color)
-            self.etiqueta_frecuencia.config(text=f"{frecuencia:.2f} Hz")
-            self.etiqueta_cents.config(text=f"{cents:+.1f} cents", fg=color)
+            self._configurar_widget(self.etiqueta_nota_ingles, text=nota, fg=color)
+            self._configurar_widget(self.etiqueta_nota_espaniol, text=nota_espaniol, fg=color)
+            self._configurar_widget(self.etiqueta_frecuencia, text=f"{frecuencia:.2f} Hz")
+            # El estroboscopio resuelve centesimas de cent
+            decimales = 2 if info_afinacion.get('estroboscopio') is not None else 1
+            self._configurar_widget(self.etiqueta_cents, text=f"{cents:+.{decimales}f} cents", fg=color)
             
             if estado == 'afinado':
                 texto_estado = "AFINADO"
@@ -237,11 +495,70 @@ class InterfazGrafica:
             else:
                 texto_estado = "DESAFINADO"
             
-            self.etiqueta_estado.config(text=texto_estado, fg=color)
+            self._configurar_widget(self.etiqueta_estado, text=texto_estado, fg=color)
             self.actualizar_medidor(cents, color)
         
+        self.mostrar_cuerdas(info_afinacion.get('cuerdas'))
+        self.mostrar_estroboscopio(info_afinacion.get('estroboscopio'), color)
+        
         if frecuencias is not None and magnitudes is not None:
+            inicio = time.perf_counter()
             self.actualizar_espectro(frecuencias, magnitudes, frecuencia)
+            if self.metricas is not None:
+                self.metricas.registrar('dibujo_espectro', inicio)
+    
+    # Muestra la afinacion de cada cuerda del modo rasgueo (None oculta la fila)
+    def mostrar_cuerdas(self, resultados):
+        if not resultados:
+            if self.cuerdas_visibles:
+                self.marco_cuerdas.pack_forget()
+                self.cuerdas_visibles = False
+            return
+        
+        notas = [resultado['nota'] for resultado in resultados]
+        if list(self.etiquetas_cuerdas) != notas:
+            for etiqueta in self.etiquetas_cuerdas.values():
+                self.opciones_widgets.pop(etiqueta, None)
+                etiqueta.destroy()
+            self.etiquetas_cuerdas = {
+                nota: tk.Label(self.marco_cuerdas, font=('Arial', 12, 'bold'), bg='#1a1a1a', width=10)
+                for nota in notas
+            }
+            for etiqueta in self.etiquetas_cuerdas.values():
+                etiqueta.pack(side=tk.LEFT, padx=3)
+        
+        for resultado in resultados:
+            color = self.colores.get(resultado['estado'], self.colores['sin_audio'])
+            if resultado['estado'] == 'sin_audio':
+                texto = f"{resultado['nota']}\n--"
+            else:
+                texto = f"{resultado['nota']}\n{resultado['cents']:+.1f}"
+            self._configurar_widget(self.etiquetas_cuerdas[resultado['nota']], text=texto, fg=color)
+        
+        if not self.cuerdas_visibles:
+            self.marco_cuerdas.pack(pady=5)
+            self.cuerdas_visibles = True
+    
+    # Desplaza las franjas del estroboscopio a la fase indicada en ciclos (None oculta el panel)
+    def mostrar_estroboscopio(self, fase, color='white'):
+        if fase is None:
+            if self.estroboscopio_visible:
+                self.canvas_estroboscopio.pack_forget()
+                self.estroboscopio_visible = False
+            return
+        
+        # Las franjas son periodicas: basta mover el patron dentro de un periodo
+        desplazamiento = fase * self.periodo_franjas
+        if desplazamiento != self.desplazamiento_franjas:
+            self.canvas_estroboscopio.move('franja', desplazamiento - self.desplazamiento_franjas, 0)
+            self.desplazamiento_franjas = desplazamiento
+        if color != self.color_franjas:
+            self.canvas_estroboscopio.itemconfig('franja', fill=color)
+            self.color_franjas = color
+        
+        if not self.estroboscopio_visible:
+            self.canvas_estroboscopio.pack(after=self.canvas_medidor, pady=4)
+            self.estroboscopio_visible = True
     
     # Inicia el bucle principal de la interfaz grafica
     def iniciar(self):
@@ -278,3 +595,42 @@ class InterfazGrafica:
             if 0 <= indice_seleccionado < len(self.dispositivos_info):
                 dispositivo_info = self.dispositivos_info[indice_seleccionado]
                 self.callback_cambio_dispositivo(dispositivo_info['indice'])
+    
+    # Configura la lista de instrumentos; la primera opcion es el modo cromatico
+    def configurar_instrumentos(self, instrumentos, instrumento_actual=None):
+        self.instrumentos_info = [None] + list(instrumentos)
+        self.combo_instrumentos['values'] = ["Cromático"] + [nombre.capitalize() for nombre in instrumentos]
+        if instrumento_actual in self.instrumentos_info:
+            self.combo_instrumentos.current(self.instrumentos_info.index(instrumento_actual))
+        else:
+            self.combo_instrumentos.current(0)
+    
+    # Establece la funcion callback para cuando se cambie el instrumento
+    def establecer_callback_cambio_instrumento(self, callback):
+        self.callback_cambio_instrumento = callback
+        self.combo_instrumentos.bind('<<ComboboxSelected>>', self._manejar_cambio_instrumento)
+    
+    # Maneja el evento de cambio de instrumento en el combobox
+    def _manejar_cambio_instrumento(self, evento):
+        if self.callback_cambio_instrumento:
+            indice_seleccionado = self.combo_instrumentos.current()
+            if 0 <= indice_seleccionado < len(self.instrumentos_info):
+                self.callback_cambio_instrumento(self.instrumentos_info[indice_seleccionado])
+    
+    # Establece la funcion callback para cuando se active o desactive el modo rasgueo
+    def establecer_callback_rasgueo(self, callback):
+        self.callback_rasgueo = callback
+    
+    # Maneja el cambio de la casilla de rasgueo
+    def _manejar_cambio_rasgueo(self):
+        if self.callback_rasgueo:
+            self.callback_rasgueo(self.variable_rasgueo.get())
+    
+    # Establece la funcion callback para cuando se active o desactive el modo estroboscopio
+    def establecer_callback_estroboscopio(self, callback):
+        self.callback_estroboscopio = callback
+    
+    # Maneja el cambio de la casilla del estroboscopio
+    def _manejar_cambio_estroboscopio(self):
+        if self.callback_estroboscopio:
+            self.callback_estroboscopio(self.variable_estroboscopio.get())
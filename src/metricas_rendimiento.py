@@ -0,0 +1,199 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class HistogramaTiempos:
+    """Histograma de duraciones con cubetas logarítmicas fijas.
+
+    Registrar una duración solo calcula el índice de su cubeta y suma uno: no
+    reserva memoria ni guarda muestras, así que el costo es constante y el
+    tamaño no crece aunque se deje activo indefinidamente. Los percentiles se
+    obtienen de las cubetas con una resolución de 1/cubetas_por_octava octavas
+    (≈19 % con 4 por octava).
+    """
+
+    def __init__(self, minimo=1e-6, maximo=10.0, cubetas_por_octava=4):
+        """
+        Args:
+            minimo: Duración en segundos del borde inferior de la primera cubeta
+            maximo: Duración a partir de la cual todo cae en la última cubeta
+            cubetas_por_octava: Resolución del histograma
+        """
+        self.minimo = minimo
+        self.cubetas_por_octava = cubetas_por_octava
+        self._log_minimo = math.log2(minimo)
+        total_cubetas = int(math.ceil(math.log2(maximo / minimo) * cubetas_por_octava)) + 1
+        self.conteos = np.zeros(total_cubetas, dtype=np.int64)
+        # Borde superior de cada cubeta (la última es abierta)
+        self.bordes = minimo * 2.0 ** (np.arange(1, total_cubetas + 1) / cubetas_por_octava)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vacía el histograma."""
+        self.conteos.fill(0)
+        self.total = 0
+        self.suma = 0.0
+        self.maximo_registrado = 0.0
+
+    def registrar(self, duracion):
+        """Suma una duración en segundos."""
+        if duracion <= self.minimo:
+            indice = 0
+        else:
+            indice = min(int((math.log2(duracion) - self._log_minimo) * self.cubetas_por_octava),
+                         len(self.conteos) - 1)
+        self.conteos[indice] += 1
+        self.total += 1
+        self.suma += duracion
+        if duracion > self.maximo_registrado:
+            self.maximo_registrado = duracion
+
+    def percentil(self, porcentaje):
+        """Duración (borde superior de la cubeta) bajo la que queda el porcentaje indicado."""
+        if self.total == 0:
+            return 0.0
+        acumulado = np.cumsum(self.conteos)
+        indice = int(np.searchsorted(acumulado, porcentaje / 100.0 * acumulado[-1]))
+        return float(min(self.bordes[min(indice, len(self.bordes) - 1)], self.maximo_registrado))
+
+    def resumen(self):
+        """Diccionario con conteo, media, percentiles y máximo en milisegundos."""
+        return {
+            'n': self.total,
+            'media_ms': 1000.0 * self.suma / self.total if self.total else 0.0,
+            'p50_ms': 1000.0 * self.percentil(50),
+            'p95_ms': 1000.0 * self.percentil(95),
+            'p99_ms': 1000.0 * self.percentil(99),
+            'max_ms': 1000.0 * self.maximo_registrado,
+        }
+
+
+class MetricasRendimiento:
+    """Tiempos por etapa del camino caliente y contadores de eventos.
+
+    Cada etapa tiene su HistogramaTiempos; las etapas de un ciclo con
+    presupuesto (el análisis de un salto, un cuadro de la interfaz) cuentan
+    además los excesos. Cada etapa debe registrarse desde un solo hilo; la
+    lectura del resumen desde otro hilo puede ver un ciclo a medias, lo cual es
+    aceptable para un reporte periódico y evita bloqueos en el camino caliente.
+
+    Uso típico sin context manager (lo más barato):
+        inicio = time.perf_counter()
+        ...
+        inicio = metricas.registrar('etapa', inicio)
+    """
+
+    def __init__(self):
+        self.etapas = {}
+        self.presupuestos = {}
+        self.contadores = {}
+        self.contadores_externos = {}
+        self.inicio = time.perf_counter()
+        self._hilo_volcado = None
+        self._detener_volcado = threading.Event()
+
+    def _histograma(self, nombre):
+        histograma = self.etapas.get(nombre)
+        if histograma is None:
+            histograma = self.etapas[nombre] = HistogramaTiempos()
+        return histograma
+
+    def definir_presupuesto(self, nombre, segundos):
+        """Duración máxima esperada de una etapa; cada registro que la supere cuenta como exceso."""
+        self.presupuestos[nombre] = segundos
+        self.contadores.setdefault(f'excesos_{nombre}', 0)
+
+    def registrar(self, nombre, inicio):
+        """
+        Registra la duración de una etapa que empezó en `inicio` (perf_counter).
+
+        Returns:
+            El instante actual, para encadenar la etapa siguiente
+        """
+        ahora = time.perf_counter()
+        duracion = ahora - inicio
+        self._histograma(nombre).registrar(duracion)
+        presupuesto = self.presupuestos.get(nombre)
+        if presupuesto is not None and duracion > presupuesto:
+            self.contadores[f'excesos_{nombre}'] += 1
+        return ahora
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide la duración del bloque como una etapa."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, inicio)
+
+    def contar(self, nombre, cantidad=1):
+        """Suma a un contador de eventos (tramas descartadas, desbordes, ...)."""
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def agregar_contador_externo(self, nombre, funcion):
+        """Contador que ya lleva otro componente; `funcion()` se consulta solo al generar el resumen."""
+        self.contadores_externos[nombre] = funcion
+
+    def reiniciar(self):
+        """Vacía histogramas y contadores propios."""
+        for histograma in self.etapas.values():
+            histograma.reiniciar()
+        for nombre in self.contadores:
+            self.contadores[nombre] = 0
+        self.inicio = time.perf_counter()
+
+    def resumen(self):
+        """Diccionario serializable con los tiempos de cada etapa y los contadores."""
+        contadores = dict(self.contadores)
+        contadores.update((nombre, funcion()) for nombre, funcion in self.contadores_externos.items())
+        return {
+            'tiempo_s': round(time.perf_counter() - self.inicio, 3),
+            'etapas': {nombre: histograma.resumen() for nombre, histograma in list(self.etapas.items())},
+            'presupuestos_ms': {nombre: 1000.0 * segundos for nombre, segundos in self.presupuestos.items()},
+            'contadores': contadores,
+        }
+
+    def texto(self):
+        """Resumen compacto de varias líneas para mostrar en pantalla."""
+        resumen = self.resumen()
+        lineas = [f"{'etapa':<16}{'media':>7}{'p95':>7}{'max':>7}  ms"]
+        for nombre, datos in resumen['etapas'].items():
+            lineas.append(f"{nombre:<16}{datos['media_ms']:7.2f}{datos['p95_ms']:7.2f}{datos['max_ms']:7.1f}")
+        lineas.extend(f"{nombre}: {valor}" for nombre, valor in sorted(resumen['contadores'].items()))
+        return '\n'.join(lineas)
+
+    def volcar_json(self, ruta):
+        """Escribe el resumen en un archivo JSON de forma atómica (archivo temporal y reemplazo)."""
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self.resumen(), archivo, indent=2)
+        os.replace(temporal, ruta)
+
+    def iniciar_volcado(self, ruta, periodo=5.0):
+        """Vuelca el resumen a `ruta` cada `periodo` segundos desde un hilo en segundo plano."""
+        self.detener_volcado()
+        self._detener_volcado.clear()
+
+        def volcar_periodicamente():
+            while not self._detener_volcado.wait(periodo):
+                try:
+                    self.volcar_json(ruta)
+                except OSError as e:
+                    print(f"Error al volcar las métricas: {e}")
+
+        self._hilo_volcado = threading.Thread(target=volcar_periodicamente, name="VolcadoMetricas", daemon=True)
+        self._hilo_volcado.start()
+
+    def detener_volcado(self):
+        """Detiene el volcado periódico (el último resumen queda en el archivo)."""
+        if self._hilo_volcado is not None:
+            self._detener_volcado.set()
+            self._hilo_volcado.join(1.0)
+            self._hilo_volcado = None
@@ -0,0 +1,140 @@
+import threading
+import time
+
+
+class MotorAnalisis:
+    """Ejecuta el analisis de audio en un hilo dedicado y publica el ultimo resultado.
+
+    La interfaz no espera al analisis: consulta el ultimo resultado publicado a
+    su propio ritmo. Si el analisis se atrasa respecto a la captura, las tramas
+    pendientes no se encolan sino que se descartan y se analiza solo la mas
+    reciente. Mientras la compuerta de energia de la captura esta cerrada
+    (silencio o solo ruido) no se ejecuta el analisis.
+    """
+
+    def __init__(self, funcion_analisis, captura, muestras_por_trama, periodo_espera=0.005, metricas=None):
+        """
+        Inicializa el motor de analisis.
+
+        Args:
+            funcion_analisis: Funcion sin argumentos que captura y analiza una trama
+            captura: Instancia de CapturaAudio que provee las muestras
+            muestras_por_trama: Muestras nuevas necesarias para lanzar un analisis
+            periodo_espera: Segundos entre consultas cuando no hay datos nuevos
+            metricas: MetricasRendimiento opcional; registra la espera de datos
+                ('espera_datos') y la duracion de cada analisis ('ciclo_analisis')
+        """
+        self.funcion_analisis = funcion_analisis
+        self.captura = captura
+        self.muestras_por_trama = muestras_por_trama
+        self.periodo_espera = periodo_espera
+        self.metricas = metricas
+
+        self.tramas_procesadas = 0
+        self.tramas_descartadas = 0
+        self.tramas_silencio = 0
+
+        # Ranura con el ultimo resultado: tupla (secuencia, resultado) que se
+        # reemplaza completa, por lo que su lectura es atomica
+        self._ultimo_resultado = (0, None)
+        self._ultimo_total = 0
+        self._en_silencio = False
+        self._fin_ultimo_analisis = None
+        self._suscriptores = []
+        self._activo = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        """Inicia el hilo de analisis."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._ultimo_total = self.captura.total_muestras()
+        self._activo.set()
+        self._hilo = threading.Thread(target=self._bucle, name="MotorAnalisis", daemon=True)
+        self._hilo.start()
+
+    def detener(self, tiempo_espera=1.0):
+        """Detiene el hilo de analisis y espera a que termine."""
+        self._activo.clear()
+        if self._hilo is not None:
+            self._hilo.join(tiempo_espera)
+            self._hilo = None
+
+    def reiniciar_posicion(self):
+        """Sincroniza el motor con el stream actual (p. ej. tras cambiar de dispositivo)."""
+        self._ultimo_total = self.captura.total_muestras()
+
+    def obtener_ultimo_resultado(self):
+        """Retorna la tupla (secuencia, resultado) publicada mas recientemente."""
+        return self._ultimo_resultado
+
+    def agregar_suscriptor(self, funcion):
+        """
+        Registra una funcion(secuencia, resultado) que se llama en cada publicacion.
+
+        Se ejecuta en el hilo de analisis, por lo que debe ser breve y segura
+        entre hilos (p. ej. solo delegar a otro bucle de eventos).
+        """
+        self._suscriptores.append(funcion)
+
+    def _publicar(self, resultado):
+        """Reemplaza la ranura del ultimo resultado con una secuencia nueva."""
+        secuencia = self._ultimo_resultado[0] + 1
+        self._ultimo_resultado = (secuencia, resultado)
+        for funcion in self._suscriptores:
+            try:
+                funcion(secuencia, resultado)
+            except Exception as e:
+                print(f"Error al notificar un resultado: {e}")
+
+    def _tramas_pendientes(self):
+        """Calcula cuantas tramas completas llegaron desde el ultimo analisis."""
+        total = self.captura.total_muestras()
+        if total < self._ultimo_total:
+            # El stream se reinicio
+            self._ultimo_total = 0
+        return (total - self._ultimo_total) // self.muestras_por_trama
+
+    def _bucle(self):
+        """Bucle del hilo: espera datos nuevos, analiza y publica el resultado."""
+        while self._activo.is_set():
+            if self.captura.stream_activo():
+                pendientes = self._tramas_pendientes()
+                if pendientes == 0:
+                    time.sleep(self.periodo_espera)
+                    continue
+
+                self._ultimo_total += pendientes * self.muestras_por_trama
+                if not self.captura.senial_presente():
+                    # Compuerta cerrada: no se analiza; se publica un unico resultado vacio
+                    self.tramas_silencio += pendientes
+                    if not self._en_silencio:
+                        self._en_silencio = True
+                        self._publicar((None, None, None))
+                    # La espera tras un silencio no es latencia del analisis
+                    self._fin_ultimo_analisis = None
+                    time.sleep(self.periodo_espera)
+                    continue
+                self._en_silencio = False
+
+                # Solo se analiza la trama mas reciente; las demas se descartan
+                self.tramas_descartadas += pendientes - 1
+
+            inicio = time.perf_counter()
+            if self.metricas is not None and self._fin_ultimo_analisis is not None:
+                self.metricas.registrar('espera_datos', self._fin_ultimo_analisis)
+            try:
+                resultado = self.funcion_analisis()
+            except Exception as e:
+                print(f"Error en el motor de análisis: {e}")
+                time.sleep(self.periodo_espera)
+                continue
+
+            self.tramas_procesadas += 1
+            self._publicar(resultado)
+            if self.metricas is not None:
+                self._fin_ultimo_analisis = self.metricas.registrar('ciclo_analisis', inicio)
+
+            if not self.captura.stream_activo():
+                # Sin stream la captura bloqueante marca el ritmo; evitar giro en vacio si falla
+                time.sleep(self.periodo_espera)
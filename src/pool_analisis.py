@@ -0,0 +1,326 @@
+import multiprocessing
+import os
+import queue
+import signal
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from buffer_circular import BufferCircular
+from procesador_senial import ProcesadorSenial, crear_decimador
+
+
+def _abrir_memoria(nombre):
+    """Abre la memoria compartida creada por el proceso principal (el único que la libera)."""
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Python < 3.13: el registro se comparte con el rastreador de recursos del principal
+        return shared_memory.SharedMemory(name=nombre)
+
+
+def _analizar_ventana(procesador, segmento, opciones):
+    """
+    Pitch y RMS de una ventana mono o de un lote (canales, n).
+
+    Args:
+        procesador: ProcesadorSenial del proceso
+        segmento: Ventana precedida del historial que necesita el decimador (solo mono)
+        opciones: Opciones vigentes del pool
+
+    Returns:
+        Tupla (frecuencia, rms) para una ventana mono (frecuencia None si no
+        hay señal); con varios canales, arrays con un valor por canal (NaN sin señal)
+    """
+    if segmento.ndim == 1:
+        ventana = segmento[procesador.historial_decimacion:]
+        rms = float(np.sqrt(np.dot(ventana, ventana) / len(ventana)))
+        frecuencia = None
+        if rms >= opciones['umbral_rms']:
+            frecuencia = procesador.detectar_frecuencia_fundamental(
+                procesador.trama_pitch_segmento(segmento), opciones['frecuencia_minima'],
+                opciones['frecuencia_maxima']
+            )
+        return frecuencia, rms
+
+    ventana = segmento
+    tamanio = ventana.shape[-1]
+
+    rms = np.sqrt(np.einsum('ij,ij->i', ventana, ventana, dtype=np.float64) / tamanio)
+    activos = rms >= opciones['umbral_rms']
+    frecuencias = np.full(len(ventana), np.nan)
+    if activos.any():
+        frecuencias[activos] = procesador.detectar_frecuencias_lote(
+            ventana if activos.all() else ventana[activos],
+            opciones['frecuencia_minima'], opciones['frecuencia_maxima']
+        )
+    return frecuencias, rms
+
+
+def _configurar_procesador(procesador, opciones, cambios):
+    """Aplica en un proceso los cambios enviados por PoolAnalisis.configurar()."""
+    opciones.update(cambios)
+    if 'cuerdas' in cambios:
+        procesador.configurar_instrumento(cambios['cuerdas'])
+    if 'tamanio_ventana' in cambios:
+        procesador.configurar_ventana(cambios['tamanio_ventana'])
+
+
+def _trabajador(nombre_memoria, capacidad, canales, opciones, tareas, resultados, barrera):
+    """Bucle de un proceso de análisis: lee cada ventana de la memoria compartida y devuelve su resultado."""
+    # Ctrl+C lo atiende el proceso principal, que cierra el pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    memoria = _abrir_memoria(nombre_memoria)
+    buffer = BufferCircular(capacidad, canales, memoria.buf)
+    # Con salto y decimar, la misma etapa multi-tasa que el modo deslizante del proceso principal
+    procesador = ProcesadorSenial(opciones['tasa_muestreo'], opciones['tamanio_ventana'],
+                                  opciones['metodo_deteccion'], opciones['salto'],
+                                  decimar=opciones['decimar'], frecuencia_maxima=opciones['frecuencia_maxima'])
+    try:
+        # Importaciones y caches del backend antes de la primera tarea
+        procesador.precalentar()
+    except Exception as e:
+        print(f"Error al precalentar el backend: {e}")
+    try:
+        while True:
+            tarea = tareas.get()
+            if tarea is None:
+                break
+            if isinstance(tarea, dict):
+                _configurar_procesador(procesador, opciones, tarea)
+                # Cada proceso toma exactamente un mensaje de configuración
+                barrera.wait()
+                continue
+            secuencia, posicion, seleccion = tarea
+            try:
+                segmento = buffer.leer_ultimas(opciones['tamanio_ventana'] + procesador.historial_decimacion,
+                                               hasta=posicion)
+                if seleccion is not None:
+                    segmento = segmento[list(seleccion)]
+                resultado = _analizar_ventana(procesador, segmento, opciones)
+            except Exception as e:
+                print(f"Error en el proceso de análisis: {e}")
+                resultado = None
+            # Siempre se responde: el proceso principal espera cada secuencia
+            resultados.put((secuencia, resultado))
+    finally:
+        # Las vistas deben liberarse antes de cerrar el mapeo
+        segmento = buffer = None
+        memoria.close()
+
+
+class PoolAnalisis:
+    """Detección de pitch en procesos trabajadores con el audio en memoria compartida.
+
+    Los backends pesados (librosa.piptrack) retienen el GIL durante mucho
+    tiempo y frenan a la interfaz y a la captura. Aquí cada proceso tiene su
+    propio ProcesadorSenial, y el audio no viaja por las colas: se escribe una
+    sola vez en un BufferCircular cuyo almacenamiento es un bloque de
+    multiprocessing.shared_memory, que los trabajadores mapean al iniciar y
+    del que leen cada ventana como vista del buffer espejado. Cada tarea es
+    solo (secuencia, posición final de la ventana, canales) y cada respuesta
+    (secuencia, resultado); los resultados se entregan en orden de secuencia
+    aunque terminen desordenados.
+
+    Para que una ventana no se sobrescriba antes de analizarla, escribir()
+    espera a los resultados pendientes cuando la escritura alcanzaría a la
+    ventana en vuelo más antigua, y enviar() limita las tareas en vuelo.
+
+    Con salto y decimar, cada proceso decima la ventana antes de detectar,
+    igual que el modo deslizante, leyendo además las muestras previas que
+    necesita el filtro. configurar() cambia las cuerdas del modo instrumento
+    o el tamaño de la ventana en todos los procesos.
+
+    Los procesos se inician con 'spawn' y no con fork: un fork mientras otro
+    hilo del proceso principal está a mitad de una importación (p. ej. de
+    librosa) copiaría sus locks tomados y el hijo podría bloquearse.
+    """
+
+    def __init__(self, tasa_muestreo, tamanio_ventana, metodo_deteccion='yin', procesos=None, canales=None,
+                 capacidad=None, en_vuelo=None, frecuencia_minima=50, frecuencia_maxima=2000, umbral_rms=0.0,
+                 salto=None, decimar=False):
+        """
+        Args:
+            tasa_muestreo: Frecuencia de muestreo del stream en Hz
+            tamanio_ventana: Muestras por ventana de análisis
+            metodo_deteccion: Backend de pitch de ProcesadorSenial en cada proceso
+            procesos: Procesos trabajadores (por defecto uno por núcleo)
+            canales: Canales del stream; None para mono
+            capacidad: Muestras por canal del buffer compartido
+            en_vuelo: Tareas enviadas sin resultado como máximo (por defecto dos por proceso)
+            frecuencia_minima: Frecuencia mínima a detectar en Hz
+            frecuencia_maxima: Frecuencia máxima a detectar en Hz
+            umbral_rms: RMS mínimo de una ventana (o canal) para detectar su pitch
+            salto: Salto entre ventanas del stream, divisor de la ventana (requerido para decimar)
+            decimar: Decimar cada ventana antes de la detección, como ProcesadorSenial (solo mono)
+        """
+        if salto is not None and tamanio_ventana % salto != 0:
+            raise ValueError("El tamaño de la ventana debe ser múltiplo del salto")
+        self.procesos = procesos or os.cpu_count()
+        self.tamanio_ventana = tamanio_ventana
+        decimador = crear_decimador(tasa_muestreo, tamanio_ventana, salto, frecuencia_maxima) \
+            if decimar and salto and canales is None else None
+        # Muestras previas a cada ventana que lee el proceso para el filtro del decimador
+        self.historial = len(decimador.coeficientes) - 1 if decimador is not None else 0
+        self.en_vuelo = en_vuelo or 2 * self.procesos
+        if capacidad is None:
+            capacidad = max(4 * tamanio_ventana, tasa_muestreo)
+        filas = 1 if canales is None else canales
+        self._memoria = shared_memory.SharedMemory(create=True, size=filas * 2 * capacidad * 4)
+        self.buffer = BufferCircular(capacidad, canales, self._memoria.buf)
+
+        opciones = {
+            'tasa_muestreo': tasa_muestreo,
+            'tamanio_ventana': tamanio_ventana,
+            'metodo_deteccion': metodo_deteccion,
+            'frecuencia_minima': frecuencia_minima,
+            'frecuencia_maxima': frecuencia_maxima,
+            'umbral_rms': umbral_rms,
+            'salto': salto,
+            'decimar': decimador is not None,
+        }
+        contexto = multiprocessing.get_context('spawn')
+        self._tareas = contexto.SimpleQueue()
+        self._resultados = contexto.Queue()
+        self._barrera = contexto.Barrier(self.procesos)
+        self._trabajadores = [
+            contexto.Process(target=_trabajador, name=f"PoolAnalisis-{indice}", daemon=True,
+                             args=(self._memoria.name, capacidad, canales, opciones, self._tareas, self._resultados,
+                                   self._barrera))
+            for indice in range(self.procesos)
+        ]
+        for trabajador in self._trabajadores:
+            trabajador.start()
+
+        self._secuencia = 0
+        self._siguiente = 1
+        # Secuencia -> primera muestra de su ventana, en orden de envío
+        self._pendientes = {}
+        self._listos = {}
+        self.tareas_descartadas = 0
+
+    @property
+    def total_escrito(self):
+        return self.buffer.total_escrito
+
+    @property
+    def tareas_en_vuelo(self):
+        """Tareas enviadas cuyo resultado aún no llegó."""
+        return len(self._pendientes)
+
+    def escribir(self, muestras):
+        """Copia muestras nuevas al buffer compartido, esperando si pisarían una ventana en vuelo."""
+        while self._pendientes:
+            inicio_mas_antiguo = next(iter(self._pendientes.values()))
+            if self.buffer.total_escrito + len(muestras) - inicio_mas_antiguo <= self.buffer.capacidad:
+                break
+            self._recibir()
+        self.buffer.escribir(muestras)
+
+    def enviar(self, posicion=None, canales=None, bloquear=True):
+        """
+        Encola el análisis de la ventana que termina en `posicion`.
+
+        Args:
+            posicion: Muestras del stream hasta el final de la ventana; por defecto todo lo escrito
+            canales: Índices de los canales a analizar (None = todos)
+            bloquear: Con el máximo de tareas en vuelo, esperar un resultado (o descartar si es False)
+
+        Returns:
+            Secuencia asignada, o None si la tarea se descartó
+        """
+        if posicion is None:
+            posicion = self.buffer.total_escrito
+        while len(self._pendientes) >= self.en_vuelo:
+            if not bloquear:
+                self.tareas_descartadas += 1
+                return None
+            self._recibir()
+        self._secuencia += 1
+        self._pendientes[self._secuencia] = posicion - self.tamanio_ventana - self.historial
+        self._tareas.put((self._secuencia, posicion, None if canales is None else tuple(int(c) for c in canales)))
+        return self._secuencia
+
+    def configurar(self, cuerdas=False, tamanio_ventana=None):
+        """
+        Cambia la configuración de todos los procesos. Espera las tareas en
+        vuelo y descarta sus resultados, que son de la configuración anterior.
+
+        Args:
+            cuerdas: Diccionario nota -> frecuencia del modo instrumento, None
+                para volver al backend general (False = sin cambios)
+            tamanio_ventana: Muestras por ventana de análisis (None = sin cambios)
+        """
+        cambios = {}
+        if cuerdas is not False:
+            cambios['cuerdas'] = cuerdas
+        if tamanio_ventana is not None:
+            cambios['tamanio_ventana'] = tamanio_ventana
+        if not cambios:
+            return
+        self.terminar()
+        if tamanio_ventana is not None:
+            self.tamanio_ventana = tamanio_ventana
+        for _ in self._trabajadores:
+            self._tareas.put(cambios)
+
+    def _recibir(self, esperar=True):
+        """Pasa un resultado de la cola a los listos; False si no había ninguno (sin esperar)."""
+        while True:
+            try:
+                if esperar:
+                    secuencia, resultado = self._resultados.get(timeout=1.0)
+                else:
+                    secuencia, resultado = self._resultados.get_nowait()
+                break
+            except queue.Empty:
+                if not esperar:
+                    return False
+                if not any(trabajador.is_alive() for trabajador in self._trabajadores):
+                    raise RuntimeError("Los procesos de análisis terminaron inesperadamente")
+        self._pendientes.pop(secuencia, None)
+        self._listos[secuencia] = resultado
+        return True
+
+    def recoger(self, minimo=0):
+        """
+        Resultados terminados, en orden de secuencia.
+
+        Args:
+            minimo: Esperar hasta tener al menos estos resultados (o ninguno en vuelo)
+
+        Returns:
+            Lista de tuplas (secuencia, resultado)
+        """
+        while self._recibir(esperar=False):
+            pass
+        entregados = []
+        while True:
+            while self._siguiente in self._listos:
+                entregados.append((self._siguiente, self._listos.pop(self._siguiente)))
+                self._siguiente += 1
+            if len(entregados) >= minimo or not self._pendientes:
+                return entregados
+            self._recibir()
+
+    def terminar(self):
+        """Espera todas las tareas en vuelo y retorna sus resultados en orden."""
+        return self.recoger(minimo=len(self._pendientes) + len(self._listos))
+
+    def cerrar(self):
+        """Detiene los procesos y libera la memoria compartida."""
+        if self._memoria is None:
+            return
+        for _ in self._trabajadores:
+            self._tareas.put(None)
+        for trabajador in self._trabajadores:
+            trabajador.join(2.0)
+            if trabajador.is_alive():
+                trabajador.terminate()
+        self.buffer = None
+        try:
+            self._memoria.close()
+        except BufferError:
+            print("Aviso: quedan vistas del buffer compartido abiertas")
+        self._memoria.unlink()
+        self._memoria = None
@@ -1,21 +1,441 @@
 import numpy as np
-import librosa
+
+from backends_pitch import crear_backend, refinar_periodo, BackendInstrumento
+from banco_goertzel import BancoGoertzel
+from buffer_circular import BufferCircular
+from decimador import DecimadorPolifasico
+from espacio_dsp import EspacioEspectro
+
+# Espacios de trabajo que rotan por forma de trama: el espectro publicado a la
+# interfaz o al servidor sigue intacto mientras se analizan los saltos siguientes
+ESPACIOS_POR_FORMA = 4
+
+
+def crear_decimador(tasa_muestreo, tamanio_ventana, salto, frecuencia_maxima):
+    """
+    Decimador de la etapa multi-tasa del modo deslizante.
+
+    Returns:
+        DecimadorPolifasico con el mayor factor que conserva frecuencia_maxima
+        y divide a la ventana y al salto, o None si no se puede decimar
+    """
+    factor = DecimadorPolifasico.factor_para(tasa_muestreo, frecuencia_maxima)
+    while factor > 1 and (tamanio_ventana % factor or salto % factor):
+        factor //= 2
+    if factor > 1:
+        return DecimadorPolifasico(factor, tasa_muestreo, frecuencia_maxima)
+    return None
+
+
+class TramaAnalisis:
+    """Trama de análisis de un buffer: calcula el espectro ventaneado una sola vez.
+
+    El espectro, sus magnitudes y los limites de banda se calculan bajo demanda
+    y quedan en cache, de modo que la detección de pitch y la visualización
+    consumen la misma transformada. Con muestras (canales, n) la trama es un
+    lote: todas las operaciones se aplican sobre el ultimo eje.
+
+    Con un EspacioEspectro la transformada se calcula en sus buffers
+    preasignados en lugar de reservar arrays nuevos; el espectro es entonces
+    válido hasta que el espacio se reutilice para otra trama.
+    """
+
+    def __init__(self, muestras, tasa_muestreo, ventana, frecuencias, origen=None, espacio=None):
+        """
+        Args:
+            muestras: Array de numpy con las muestras de audio
+            tasa_muestreo: Frecuencia de muestreo en Hz
+            ventana: Ventana de análisis (misma longitud que las muestras)
+            frecuencias: Eje de frecuencias de la rfft (compartido entre tramas)
+            origen: Trama de tasa completa de la que se derivó esta (tramas decimadas)
+            espacio: EspacioEspectro donde calcular la transformada (None = arrays nuevos)
+        """
+        self.origen = origen
+        self.espacio = espacio
+        self.muestras = muestras
+        self.tasa_muestreo = tasa_muestreo
+        self.ventana = ventana
+        self.frecuencias = frecuencias
+        self._espectro = None
+        self._magnitudes = None
+        self._limites_banda = {}
+
+    @property
+    def tamanio(self):
+        return self.muestras.shape[-1]
+    
+    @property
+    def canales(self):
+        return 1 if self.muestras.ndim == 1 else self.muestras.shape[0]
+    
+    def canal(self, indice):
+        """Trama de un solo canal de un lote; reutiliza el espectro si ya se calculó."""
+        if self.muestras.ndim == 1:
+            return self
+        trama = TramaAnalisis(self.muestras[indice], self.tasa_muestreo, self.ventana, self.frecuencias)
+        if self._espectro is not None:
+            trama._espectro = self._espectro[indice]
+        if self._magnitudes is not None:
+            trama._magnitudes = self._magnitudes[indice]
+        return trama
+
+    @property
+    def espectro(self):
+        """Espectro complejo de la señal ventaneada (rfft)."""
+        if self._espectro is None:
+            if self.espacio is not None:
+                self._espectro = self.espacio.calcular_espectro(self.muestras)
+            else:
+                self._espectro = np.fft.rfft(self.muestras * self.ventana)
+        return self._espectro
+
+    @property
+    def magnitudes(self):
+        """Magnitud del espectro ventaneado."""
+        if self._magnitudes is None:
+            if self.espacio is not None:
+                self._magnitudes = self.espacio.calcular_magnitudes(self.espectro)
+            else:
+                self._magnitudes = np.abs(self.espectro)
+        return self._magnitudes
+
+    def indice_limite(self, limite_frecuencia):
+        """Numero de bins con frecuencia <= limite (el eje es creciente, asi que la banda es un prefijo)."""
+        if self.espacio is not None:
+            return self.espacio.indice_limite(limite_frecuencia)
+        indice = self._limites_banda.get(limite_frecuencia)
+        if indice is None:
+            indice = int(np.searchsorted(self.frecuencias, limite_frecuencia, side='right'))
+            self._limites_banda[limite_frecuencia] = indice
+        return indice
+
+    def banda(self, limite_frecuencia):
+        """Retorna vistas (frecuencias, magnitudes) hasta el limite de frecuencia."""
+        indice = self.indice_limite(limite_frecuencia)
+        return self.frecuencias[:indice], self.magnitudes[..., :indice]
+
+
+class VentanaDeslizante:
+    """Ventana de análisis larga que avanza en saltos cortos sobre un stream de muestras.
+
+    Las muestras se acumulan en un buffer circular, asi que la ventana actual
+    es siempre una vista sin copia. La energia de la ventana se mantiene de
+    forma incremental por bloques de un salto: al avanzar solo se suma la
+    energia del bloque nuevo y se resta la del bloque que sale.
+    """
+
+    def __init__(self, tamanio_ventana, salto):
+        """
+        Args:
+            tamanio_ventana: Muestras de la ventana de análisis
+            salto: Muestras que avanza la ventana entre análisis (divisor de la ventana)
+        """
+        if tamanio_ventana % salto != 0:
+            raise ValueError("El tamaño de la ventana debe ser múltiplo del salto")
+        self.tamanio_ventana = tamanio_ventana
+        self.salto = salto
+        self.buffer = BufferCircular(tamanio_ventana + salto)
+
+        # Energia de cada bloque de un salto dentro de la ventana
+        self.energias_bloque = np.zeros(tamanio_ventana // salto)
+        self.indice_bloque = 0
+        self.energia_ventana = 0.0
+        self.energia_parcial = 0.0
+        self.muestras_parcial = 0
+        self.saltos_totales = 0
+
+    def agregar(self, muestras):
+        """
+        Agrega muestras nuevas al stream.
+
+        Returns:
+            Número de saltos completados con estas muestras
+        """
+        saltos = 0
+        posicion = 0
+        total = len(muestras)
+        while posicion < total:
+            tomar = min(self.salto - self.muestras_parcial, total - posicion)
+            bloque = muestras[posicion:posicion + tomar]
+            self.energia_parcial += float(np.dot(bloque, bloque))
+            self.muestras_parcial += tomar
+            posicion += tomar
+
+            if self.muestras_parcial == self.salto:
+                # Bloque completo: reemplaza la energia del bloque mas antiguo
+                self.energia_ventana += self.energia_parcial - self.energias_bloque[self.indice_bloque]
+                self.energias_bloque[self.indice_bloque] = self.energia_parcial
+                self.indice_bloque = (self.indice_bloque + 1) % len(self.energias_bloque)
+                if self.indice_bloque == 0:
+                    # Resincronizar una vez por vuelta para evitar deriva numerica
+                    self.energia_ventana = float(self.energias_bloque.sum())
+                self.energia_parcial = 0.0
+                self.muestras_parcial = 0
+                saltos += 1
+
+        self.buffer.escribir(muestras)
+        self.saltos_totales += saltos
+        return saltos
+
+    def llena(self):
+        """Indica si ya se acumularon muestras suficientes para una ventana completa."""
+        return self.buffer.total_escrito >= self.tamanio_ventana
+
+    def ventana(self):
+        """Vista de la ventana alineada al ultimo salto completado."""
+        return self.buffer.leer_ultimas(self.tamanio_ventana, hasta=self.posicion())
+
+    def posicion(self):
+        """Muestras del stream hasta el final de la ventana actual."""
+        return self.buffer.total_escrito - self.muestras_parcial
+
+    def rms(self):
+        """Valor RMS de la ventana actual, calculado de forma incremental."""
+        return float(np.sqrt(max(self.energia_ventana, 0.0) / self.tamanio_ventana))
+
+    def nivel_ultimo_salto_db(self):
+        """Nivel en dBFS del último bloque de un salto completado."""
+        energia = self.energias_bloque[self.indice_bloque - 1] / self.salto
+        return float(10.0 * np.log10(energia + 1e-12))
+
+    def reiniciar(self):
+        """Descarta el contenido del stream."""
+        self.buffer.reiniciar()
+        self.energias_bloque.fill(0.0)
+        self.indice_bloque = 0
+        self.energia_ventana = 0.0
+        self.energia_parcial = 0.0
+        self.muestras_parcial = 0
+        self.saltos_totales = 0
 
 
 class ProcesadorSenial:
-    """Procesador de señales de audio usando Librosa para detección de pitch."""
+    """Procesador de señales de audio con backends intercambiables para detección de pitch."""
     
-    def __init__(self, tasa_muestreo=44100, tamanio_buffer=4096):
-        """Inicializa el procesador de señal con parametros de configuracion."""
+    def __init__(self, tasa_muestreo=44100, tamanio_buffer=4096, metodo_deteccion='piptrack', salto=None,
+                 decimar=False, frecuencia_maxima=2000):
+        """
+        Inicializa el procesador de señal con parametros de configuracion.
+        
+        Args:
+            tasa_muestreo: Frecuencia de muestreo en Hz
+            tamanio_buffer: Numero de muestras por buffer
+            metodo_deteccion: Backend de pitch ('piptrack', 'yin', 'mpm' o 'espectral')
+            salto: Si se indica, activa el modo de ventana deslizante con este salto en muestras
+            decimar: En modo deslizante, decima la señal antes de la detección de pitch
+            frecuencia_maxima: Frecuencia máxima de búsqueda; determina el factor de decimación
+        """
         self.tasa_muestreo = tasa_muestreo
         self.tamanio_buffer = tamanio_buffer
+        self.metodo_deteccion = metodo_deteccion
+        self.backend = crear_backend(metodo_deteccion)
+        
+        # Espacios de trabajo por (forma, tasa): ventana, eje de frecuencias, plan de FFT y buffers
+        self._espacios = {}
+        self._turnos_espacio = {}
+        # Energía acumulada de refinar_frecuencia, por tamaño de trama
+        self._energias = {}
+        
+        self.salto = salto
+        self.ventana_deslizante = VentanaDeslizante(tamanio_buffer, salto) if salto else None
+        
+        # Etapa multi-tasa: la detección usa la señal decimada y el espectro la de tasa completa
+        self.decimador = None
+        self.ventana_decimada = None
+        if decimar and salto:
+            self.decimador = crear_decimador(tasa_muestreo, tamanio_buffer, salto, frecuencia_maxima)
+            if self.decimador is not None:
+                factor = self.decimador.factor
+                self.ventana_decimada = VentanaDeslizante(tamanio_buffer // factor, salto // factor)
+        
+        # Modo rasgueo: ventana larga propia (a la tasa de detección) y banco de cuerdas
+        self.banco_rasgueo = None
+        self.ventana_rasgueo = None
+    
+    def configurar_instrumento(self, cuerdas=None):
+        """
+        Activa el modo instrumento con las cuerdas indicadas (nota -> frecuencia)
+        o vuelve al backend general si cuerdas es None.
+        """
+        if cuerdas:
+            self.backend = BackendInstrumento(cuerdas)
+        else:
+            self.backend = crear_backend(self.metodo_deteccion)
+    
+    def configurar_ventana(self, tamanio_ventana):
+        """
+        Cambia el tamaño de la ventana deslizante (y de la decimada, en la
+        misma proporción). Las ventanas nuevas empiezan vacías: hasta llenarse
+        no se completan saltos.
+        
+        Args:
+            tamanio_ventana: Muestras de la ventana a tasa completa (múltiplo del salto)
+        """
+        if self.ventana_deslizante is None or tamanio_ventana == self.tamanio_buffer:
+            return
+        self.ventana_deslizante = VentanaDeslizante(tamanio_ventana, self.salto)
+        if self.decimador is not None:
+            factor = self.decimador.factor
+            self.decimador.reiniciar()
+            self.ventana_decimada = VentanaDeslizante(tamanio_ventana // factor, self.salto // factor)
+        if self.ventana_rasgueo is not None:
+            self.ventana_rasgueo.reiniciar()
+        self.tamanio_buffer = tamanio_ventana
+    
+    def configurar_rasgueo(self, cuerdas=None, tamanio_ventana=16384):
+        """
+        Activa el modo rasgueo (todas las cuerdas de un acorde a la vez) o lo
+        desactiva si cuerdas es None. Requiere el modo de ventana deslizante.
+        
+        Args:
+            cuerdas: Diccionario nota -> frecuencia de las cuerdas al aire
+            tamanio_ventana: Muestras de la ventana a tasa completa; la ventana
+                larga separa parciales cercanos de cuerdas distintas y, con
+                decimación, cuesta lo mismo que una corta a tasa completa
+        """
+        if not cuerdas or self.ventana_deslizante is None:
+            self.banco_rasgueo = None
+            self.ventana_rasgueo = None
+            return
+        factor = self.factor_decimacion
+        self.banco_rasgueo = BancoGoertzel(cuerdas)
+        self.ventana_rasgueo = VentanaDeslizante(tamanio_ventana // factor, self.salto // factor)
+    
+    @property
+    def factor_decimacion(self):
+        return self.decimador.factor if self.decimador is not None else 1
+    
+    def agregar_muestras(self, muestras):
+        """
+        Alimenta el modo de ventana deslizante con muestras nuevas del stream.
+        
+        Returns:
+            Número de saltos completados (0 si la ventana aun no esta llena)
+        """
+        saltos = self.ventana_deslizante.agregar(muestras)
+        muestras_deteccion = muestras
+        if self.decimador is not None:
+            # El filtro conserva su estado entre bloques: el stream decimado es continuo
+            muestras_deteccion = self.decimador.procesar(muestras)
+            self.ventana_decimada.agregar(muestras_deteccion)
+        if self.ventana_rasgueo is not None:
+            self.ventana_rasgueo.agregar(muestras_deteccion)
+        return saltos if self.ventana_deslizante.llena() else 0
+    
+    def ventana_actual(self):
+        """Vista de la ventana deslizante alineada al ultimo salto."""
+        return self.ventana_deslizante.ventana()
+    
+    def ventana_deteccion(self):
+        """
+        Ventana deslizante a la tasa de detección (decimada si corresponde).
+        
+        Returns:
+            Tupla (muestras, tasa de muestreo, posición del final de la ventana en el stream)
+        """
+        if self.ventana_decimada is not None:
+            return self.ventana_decimada.ventana(), self.decimador.tasa_salida, self.ventana_decimada.posicion()
+        return self.ventana_deslizante.ventana(), self.tasa_muestreo, self.ventana_deslizante.posicion()
+    
+    def trama_pitch_actual(self, trama_espectro=None):
+        """
+        Trama para la detección de pitch de la ventana deslizante actual.
+        
+        Con decimación activa es la ventana decimada a su tasa reducida; si no,
+        se reutiliza la trama de tasa completa (la misma del espectro).
+        """
+        if trama_espectro is None:
+            trama_espectro = self.crear_trama(self.ventana_actual())
+        if self.decimador is None:
+            return trama_espectro
+        return self.crear_trama(self.ventana_decimada.ventana(), self.decimador.tasa_salida, trama_espectro)
+    
+    @property
+    def historial_decimacion(self):
+        """Muestras previas a una ventana que necesita el decimador para reproducir el stream decimado."""
+        return len(self.decimador.coeficientes) - 1 if self.decimador is not None else 0
+    
+    def trama_pitch_segmento(self, segmento):
+        """
+        Trama de detección de una ventana suelta (p. ej. leída por un proceso de
+        análisis), igual a la que trama_pitch_actual arma en modo deslizante.
+        
+        Args:
+            segmento: historial_decimacion muestras previas seguidas de la
+                ventana a tasa completa, que termina en un salto
+        """
+        historial = self.historial_decimacion
+        trama = self.crear_trama(segmento[historial:])
+        if self.decimador is None:
+            return trama
+        # Salidas alineadas al final de la ventana, como en el stream decimado
+        self.decimador.historia[:] = segmento[:historial]
+        self.decimador.fase = 0
+        decimada = self.decimador.procesar(segmento[historial:])
+        return self.crear_trama(decimada, self.decimador.tasa_salida, trama)
+    
+    def detectar_cuerdas(self):
+        """
+        Afinación de cada cuerda en la ventana larga del modo rasgueo.
+        
+        Returns:
+            Diccionario nota -> frecuencia en Hz (None si la cuerda no suena),
+            o None si el modo no está activo o la ventana aún no se llenó
+        """
+        if self.ventana_rasgueo is None or not self.ventana_rasgueo.llena():
+            return None
+        tasa = self.decimador.tasa_salida if self.decimador is not None else self.tasa_muestreo
+        return self.banco_rasgueo.detectar_cuerdas(self.ventana_rasgueo.ventana(), tasa)
+    
+    def reiniciar_stream(self):
+        """Descarta las muestras acumuladas y el estado del decimador."""
+        self.ventana_deslizante.reiniciar()
+        if self.decimador is not None:
+            self.decimador.reiniciar()
+            self.ventana_decimada.reiniciar()
+        if self.ventana_rasgueo is not None:
+            self.ventana_rasgueo.reiniciar()
+    
+    def rms_ventana(self):
+        """RMS de la ventana deslizante, mantenido de forma incremental."""
+        return self.ventana_deslizante.rms()
+    
+    def nivel_salto_db(self):
+        """Nivel del último salto de la ventana deslizante, para detectar ataques."""
+        return self.ventana_deslizante.nivel_ultimo_salto_db()
+    
+    def crear_trama(self, buffer_audio, tasa_muestreo=None, origen=None):
+        """Crea la trama de análisis compartida por la detección y la visualización."""
+        if isinstance(buffer_audio, TramaAnalisis):
+            return buffer_audio
+        if tasa_muestreo is None:
+            tasa_muestreo = self.tasa_muestreo
+        
+        espacio = self._espacio(np.shape(buffer_audio), tasa_muestreo)
+        return TramaAnalisis(buffer_audio, tasa_muestreo, espacio.ventana, espacio.frecuencias, origen, espacio)
+    
+    def _espacio(self, forma, tasa_muestreo):
+        """Siguiente espacio de trabajo de la rotación para tramas de esta forma y tasa."""
+        clave = (forma, tasa_muestreo)
+        espacios = self._espacios.get(clave)
+        if espacios is None:
+            tamanio = forma[-1]
+            # Ventana de Hann periodica y eje de frecuencias, compartidos por toda la rotación
+            ventana = np.hanning(tamanio + 1)[:-1]
+            frecuencias = np.fft.rfftfreq(tamanio, 1.0 / tasa_muestreo)
+            espacios = [EspacioEspectro(forma, tasa_muestreo, ventana, frecuencias) for _ in range(ESPACIOS_POR_FORMA)]
+            self._espacios[clave] = espacios
+            self._turnos_espacio[clave] = 0
+        turno = self._turnos_espacio[clave]
+        self._turnos_espacio[clave] = (turno + 1) % len(espacios)
+        return espacios[turno]
     
     def detectar_frecuencia_fundamental(self, buffer_audio, frecuencia_minima=50, frecuencia_maxima=2000):
         """
-        Detecta la frecuencia fundamental del audio usando librosa.piptrack.
+        Detecta la frecuencia fundamental del audio usando el backend configurado.
         
         Args:
-            buffer_audio: Array de numpy con las muestras de audio
+            buffer_audio: Array de numpy con las muestras de audio o TramaAnalisis
             frecuencia_minima: Frecuencia mínima a detectar en Hz
             frecuencia_maxima: Frecuencia máxima a detectar en Hz
             
@@ -23,52 +443,89 @@ class ProcesadorSenial:
             Frecuencia detectada en Hz o None si no se detecta señal
         """
         try:
-            # Usar piptrack de librosa para detección de pitch
-            pitches, magnitudes = librosa.piptrack(
-                y=buffer_audio, 
-                sr=self.tasa_muestreo,
-                fmin=frecuencia_minima,
-                fmax=frecuencia_maxima,
-                threshold=0.1
-            )
-            
-            # Obtener el pitch con mayor magnitud en cada frame
-            frecuencias_detectadas = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                mag = magnitudes[index, t]
-                
-                # Solo considerar pitches con magnitud significativa
-                if pitch > 0 and mag > 0.01:
-                    frecuencias_detectadas.append(pitch)
-            
-            if len(frecuencias_detectadas) > 0:
-                # Usar la mediana para reducir ruido
-                return np.median(frecuencias_detectadas)
-            
-            return None
-            
+            trama = self.crear_trama(buffer_audio)
+            frecuencia = self.backend.detectar(trama, frecuencia_minima, frecuencia_maxima)
+            if frecuencia is not None and trama.origen is not None and self.backend.refinar_tasa_completa:
+                # Trama decimada: la estimación gruesa se refina sobre la señal de tasa completa
+                radio = int(np.ceil(trama.origen.tasa_muestreo / trama.tasa_muestreo)) + 1
+                frecuencia = self.refinar_frecuencia(trama.origen, frecuencia, radio)
+            return frecuencia
         except Exception as e:
             print(f"Error en detección de frecuencia: {e}")
             return None
     
+    def detectar_frecuencias_lote(self, buffer_audio, frecuencia_minima=50, frecuencia_maxima=2000):
+        """
+        Detecta la frecuencia fundamental de varios canales en una sola pasada.
+        
+        Args:
+            buffer_audio: Array (canales, muestras) o TramaAnalisis de lote
+            frecuencia_minima: Frecuencia mínima a detectar en Hz
+            frecuencia_maxima: Frecuencia máxima a detectar en Hz
+            
+        Returns:
+            Array con una frecuencia por canal en Hz (NaN donde no se detecta señal)
+        """
+        trama = self.crear_trama(buffer_audio)
+        try:
+            return self.backend.detectar_lote(trama, frecuencia_minima, frecuencia_maxima)
+        except Exception as e:
+            print(f"Error en detección de frecuencia por lote: {e}")
+            return np.full(trama.canales, np.nan)
+    
+    def refinar_frecuencia(self, trama, frecuencia, radio):
+        """
+        Refina una frecuencia aproximada evaluando la función de diferencia de
+        YIN solo en los retardos cercanos a su periodo, sobre la trama indicada.
+        
+        Args:
+            trama: TramaAnalisis de tasa completa
+            frecuencia: Estimación aproximada en Hz
+            radio: Retardos a evaluar a cada lado del periodo aproximado
+            
+        Returns:
+            Frecuencia refinada en Hz (la aproximada si el mínimo queda en el borde)
+        """
+        x = trama.muestras
+        return refinar_periodo(x, trama.tasa_muestreo, frecuencia, radio, self._energia_acumulada(x))
+    
+    def _energia_acumulada(self, x):
+        """Suma acumulada de x² con un cero inicial, en buffers reutilizados entre llamadas."""
+        buffers = self._energias.get(len(x))
+        if buffers is None:
+            buffers = self._energias[len(x)] = (np.empty(len(x)), np.zeros(len(x) + 1))
+        cuadrados, energia_acumulada = buffers
+        np.copyto(cuadrados, x)
+        np.multiply(cuadrados, cuadrados, out=cuadrados)
+        np.cumsum(cuadrados, out=energia_acumulada[1:])
+        return energia_acumulada
+    
+    def precalentar(self, frecuencia=220.0):
+        """
+        Ejecuta el backend sobre un buffer sintético para pagar por adelantado
+        importaciones, compilación JIT y caches antes de la primera lectura real.
+        """
+        tiempo = np.arange(self.tamanio_buffer) / self.tasa_muestreo
+        buffer_sintetico = sum(
+            np.sin(2 * np.pi * frecuencia * armonico * tiempo) / armonico
+            for armonico in range(1, 4)
+        ).astype(np.float32)
+        
+        trama = self.crear_trama(buffer_sintetico)
+        self.detectar_frecuencia_fundamental(trama)
+        self.obtener_espectro_completo(trama)
+    
     def obtener_espectro_completo(self, buffer_audio, limite_frecuencia=1000):
         """
         Calcula el espectro de frecuencias para visualización.
         
         Args:
-            buffer_audio: Array de numpy con las muestras de audio
+            buffer_audio: Array de numpy con las muestras de audio o TramaAnalisis
             limite_frecuencia: Frecuencia máxima a mostrar en Hz
             
         Returns:
             Tupla (frecuencias, magnitudes)
         """
-        # Calcular FFT para visualización
-        fft_resultado = np.fft.rfft(buffer_audio)
-        magnitud_fft = np.abs(fft_resultado)
-        frecuencias = np.fft.rfftfreq(self.tamanio_buffer, 1.0 / self.tasa_muestreo)
-        
-        # Filtrar hasta el límite de frecuencia
-        mascara = frecuencias <= limite_frecuencia
-        return frecuencias[mascara], magnitud_fft[mascara]
+        # Reutiliza el espectro de la trama si ya fue calculado para la detección
+        trama = self.crear_trama(buffer_audio)
+        return trama.banda(limite_frecuencia)
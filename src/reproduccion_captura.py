@@ -0,0 +1,145 @@
+import threading
+import time
+
+import numpy as np
+
+from analisis_offline import abrir_audio
+from captura_audio import CapturaAudio
+from grabador_captura import leer_metadatos
+
+
+def tasa_grabacion(ruta, tasa_defecto=None):
+    """Tasa de muestreo de una grabación: la de sus metadatos, la del archivo o la indicada."""
+    metadatos = leer_metadatos(ruta)
+    if metadatos is not None:
+        return metadatos['tasa_muestreo']
+    try:
+        tasa, _ = abrir_audio(ruta, 1, tasa_raw=tasa_defecto, dtype_raw='float32')
+        return tasa
+    except ValueError:
+        return tasa_defecto
+
+
+class ReproduccionCaptura(CapturaAudio):
+    """Fuente de audio que reproduce una grabación con la interfaz de CapturaAudio.
+
+    Los bloques del archivo pasan por el mismo buffer circular y la misma
+    compuerta de energía que el audio en vivo, por lo que el resto del
+    pipeline (MotorAnalisis, ventana deslizante, seguidor) no distingue la
+    diferencia. Los bloques que la grabación tuvo que descartar se reproducen
+    como silencio de la misma duración, así que la línea de tiempo es la del
+    stream original. En tiempo real un hilo entrega cada bloque a su hora,
+    como lo haría el callback del dispositivo. Sin tiempo real no hay hilo:
+    quien consume llama a avanzar() para entregar el bloque siguiente, lo que
+    hace la ejecución determinista y tan rápida como el análisis.
+    """
+
+    def __init__(self, ruta, tasa_muestreo=None, tamanio_buffer=4096, tamanio_bloque=512,
+                 tiempo_real=True, repetir=False, capacidad_stream=None, compuerta=None):
+        """
+        Args:
+            ruta: Grabación cruda (.f32 de GrabadorCaptura), WAV u otro formato soportado
+            tasa_muestreo: Tasa de archivos crudos sin metadatos
+            tamanio_buffer: Muestras por ventana de lectura
+            tamanio_bloque: Muestras por bloque entregado (como el blocksize del dispositivo)
+            tiempo_real: Entregar los bloques al ritmo de la tasa de muestreo
+            repetir: Volver al inicio al terminar el archivo
+            capacidad_stream: Muestras que conserva el buffer circular
+            compuerta: CompuertaEnergia a alimentar con cada bloque
+        """
+        tasa_muestreo = tasa_grabacion(ruta, tasa_muestreo)
+        if tasa_muestreo is None:
+            raise ValueError(f"No se conoce la tasa de muestreo de {ruta}")
+        super().__init__(tasa_muestreo, tamanio_buffer, capacidad_stream, compuerta)
+        self.ruta = ruta
+        self.tamanio_bloque = tamanio_bloque
+        self.tiempo_real = tiempo_real
+        self.repetir = repetir
+        self.dispositivo_entrada = ruta
+        self.bloques_entregados = 0
+        self._bloques = None
+        self._activa = False
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def obtener_dispositivos_entrada(self):
+        return [{'indice': self.ruta, 'nombre': f"Reproducción: {self.ruta}"}]
+
+    def configurar_dispositivo(self, indice_dispositivo=None):
+        """La única fuente es el archivo; se conserva la interfaz de CapturaAudio."""
+        pass
+
+    def _abrir(self):
+        _, bloques = abrir_audio(self.ruta, self.tamanio_bloque, tasa_raw=self.tasa_muestreo, dtype_raw='float32')
+        return bloques
+
+    def iniciar_stream(self):
+        """Vuelve al inicio del archivo y, en tiempo real, lanza el hilo de entrega."""
+        self.detener_stream()
+        self.buffer_stream.reiniciar()
+        self.indice_lectura = 0
+        self.compuerta.reiniciar()
+        self.bloques_entregados = 0
+        try:
+            self._bloques = self._abrir()
+        except (OSError, ValueError) as e:
+            print(f"Error al abrir la grabación: {e}")
+            return False
+        self._activa = True
+        if self.tiempo_real:
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._entregar_en_tiempo_real, name="ReproduccionCaptura",
+                                          daemon=True)
+            self._hilo.start()
+        return True
+
+    def detener_stream(self):
+        """Detiene la entrega de bloques."""
+        if self._hilo is not None:
+            self._detener.set()
+            self._hilo.join(1.0)
+            self._hilo = None
+        self._activa = False
+
+    def stream_activo(self):
+        return self._activa
+
+    def avanzar(self):
+        """
+        Entrega el bloque siguiente al buffer y a la compuerta.
+
+        Returns:
+            False cuando la grabación terminó (y no se repite)
+        """
+        if not self._activa:
+            return False
+        bloque = next(self._bloques, None)
+        if bloque is None and self.repetir:
+            self._bloques = self._abrir()
+            bloque = next(self._bloques, None)
+        if bloque is None or len(bloque) == 0:
+            self._activa = False
+            return False
+        self.buffer_stream.escribir(bloque)
+        self.compuerta.procesar(bloque)
+        if self.grabador is not None:
+            self.grabador.agregar(bloque)
+        self.bloques_entregados += 1
+        return True
+
+    def _entregar_en_tiempo_real(self):
+        """Hilo de entrega: un bloque por período, contra plazos absolutos para no acumular deriva."""
+        periodo = self.tamanio_bloque / self.tasa_muestreo
+        plazo = time.perf_counter()
+        while not self._detener.is_set() and self.avanzar():
+            plazo += periodo
+            espera = plazo - time.perf_counter()
+            if espera > 0:
+                self._detener.wait(espera)
+
+    def capturar_buffer(self):
+        """Ventana más reciente, o None si aún no se entregó nada o la grabación terminó."""
+        if not self._activa or self.buffer_stream.total_escrito == 0:
+            return None
+        self.buffer_actual = self.leer_ultimas_muestras(self.tamanio_buffer)
+        return self.buffer_actual
@@ -0,0 +1,150 @@
+import numpy as np
+
+
+# Saltos típicos de los detectores de pitch (octava, octava + quinta, dos octavas) en cents
+INTERVALOS_ARMONICOS = np.array([1200.0, 1901.955, 2400.0])
+
+
+class SeguidorPitch:
+    """Seguimiento del pitch entre análisis consecutivos de la ventana deslizante.
+
+    Cada lectura se convierte a cents y se suaviza con un filtro one-euro: con
+    el pitch estable el corte es bajo y elimina el temblor de la detección;
+    cuando el pitch se mueve (vibrato, ajuste de la clavija) el corte sube con
+    la velocidad y el retardo se mantiene pequeño.
+
+    Una lectura a una octava (o a otro intervalo armónico) del estado se toma
+    como error del detector y se pliega al registro actual; solo si el salto se
+    repite varias veces seguidas se acepta como cambio real. Otros saltos
+    grandes se aceptan cuando dos lecturas seguidas coinciden. Un inicio de
+    nota (compuerta que se abre o subida brusca de energía) reinicia el estado.
+    """
+
+    def __init__(self, tasa_analisis, corte_minimo=1.0, beta=0.01, corte_derivada=1.0,
+                 tolerancia_armonica=50.0, confirmaciones_armonicas=4, umbral_salto=60.0,
+                 umbral_inicio_db=6.0, lecturas_perdidas=4):
+        """
+        Args:
+            tasa_analisis: Lecturas por segundo (tasa de muestreo / salto)
+            corte_minimo: Frecuencia de corte del filtro con el pitch quieto (Hz)
+            beta: Aumento del corte por cada cent/s de velocidad del pitch
+            corte_derivada: Frecuencia de corte del estimador de velocidad (Hz)
+            tolerancia_armonica: Distancia máxima en cents a un intervalo armónico
+                para considerar la lectura un error de octava
+            confirmaciones_armonicas: Lecturas seguidas en el registro nuevo para aceptarlo
+            umbral_salto: Cents a partir de los cuales una lectura es otra nota
+            umbral_inicio_db: Subida de energía por salto que indica un ataque
+            lecturas_perdidas: Lecturas sin detección durante las que se mantiene el valor
+        """
+        self.periodo = 1.0 / tasa_analisis
+        self.corte_minimo = corte_minimo
+        self.beta = beta
+        self.corte_derivada = corte_derivada
+        self.tolerancia_armonica = tolerancia_armonica
+        self.confirmaciones_armonicas = confirmaciones_armonicas
+        self.umbral_salto = umbral_salto
+        self.umbral_inicio_db = umbral_inicio_db
+        self.lecturas_perdidas = lecturas_perdidas
+        self.inicios = 0
+        self.errores_armonicos = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve al estado inicial (p. ej. al cambiar de dispositivo o de instrumento)."""
+        self._olvidar_pitch()
+        self.niveles_db = []
+
+    def _olvidar_pitch(self):
+        """Olvida el pitch actual; la siguiente lectura se toma tal cual."""
+        self.cents = None
+        self.velocidad = 0.0
+        self.perdidas = 0
+        self.salto_pendiente = None
+        self.repeticiones_salto = 0
+
+    def _frecuencia(self):
+        """Frecuencia en Hz del estado actual."""
+        return float(440.0 * 2.0 ** (self.cents / 1200.0))
+
+    def _alfa(self, corte):
+        """Coeficiente de un filtro de un polo para la frecuencia de corte dada."""
+        tau = 1.0 / (2.0 * np.pi * corte)
+        return 1.0 / (1.0 + tau / self.periodo)
+
+    def _detectar_inicio(self, nivel_db):
+        """Ataque: el nivel del último salto supera en umbral_inicio_db al mínimo reciente."""
+        if nivel_db is None:
+            return False
+        ataque = bool(self.niveles_db) and nivel_db - min(self.niveles_db) > self.umbral_inicio_db
+        # Al detectar un ataque se vacía la historia: no se vuelve a disparar en los saltos siguientes
+        self.niveles_db = [] if ataque else (self.niveles_db + [nivel_db])[-3:]
+        return ataque
+
+    def _confirmar_salto(self, cents):
+        """Cuenta las lecturas seguidas que saltan al mismo registro y retorna cuántas van."""
+        if self.salto_pendiente is not None and abs(self.salto_pendiente - cents) < self.tolerancia_armonica:
+            self.repeticiones_salto += 1
+        else:
+            self.salto_pendiente = cents
+            self.repeticiones_salto = 1
+        return self.repeticiones_salto
+
+    def actualizar(self, frecuencia, nivel_db=None, inicio=False):
+        """
+        Incorpora la lectura de un análisis y retorna la frecuencia seguida.
+
+        Args:
+            frecuencia: Frecuencia detectada en Hz (None si no hubo detección)
+            nivel_db: Nivel del último salto en dBFS, para detectar ataques
+            inicio: True si se sabe que empezó una nota (p. ej. la compuerta se abrió)
+
+        Returns:
+            Frecuencia suavizada en Hz, o None si no hay pitch que seguir
+        """
+        if self._detectar_inicio(nivel_db) or inicio:
+            self.inicios += 1
+            self._olvidar_pitch()
+
+        if frecuencia is None or frecuencia <= 0:
+            self.perdidas += 1
+            if self.cents is None or self.perdidas > self.lecturas_perdidas:
+                self._olvidar_pitch()
+                return None
+            return self._frecuencia()
+        self.perdidas = 0
+
+        cents = 1200.0 * np.log2(frecuencia / 440.0)
+        if self.cents is None:
+            self.cents = cents
+            return frecuencia
+
+        diferencia = cents - self.cents
+        if abs(diferencia) > self.umbral_salto:
+            distancias = np.abs(np.abs(diferencia) - INTERVALOS_ARMONICOS)
+            if distancias.min() < self.tolerancia_armonica:
+                # Error armónico del detector: se pliega al registro actual salvo que persista
+                if self._confirmar_salto(cents) < self.confirmaciones_armonicas:
+                    self.errores_armonicos += 1
+                    cents -= np.sign(diferencia) * INTERVALOS_ARMONICOS[np.argmin(distancias)]
+                    diferencia = cents - self.cents
+                else:
+                    self._olvidar_pitch()
+                    self.cents = cents
+                    return frecuencia
+            else:
+                # Otra nota sin ataque (ligado): se acepta cuando dos lecturas coinciden
+                if self._confirmar_salto(cents) < 2:
+                    return self._frecuencia()
+                self._olvidar_pitch()
+                self.cents = cents
+                return frecuencia
+        else:
+            self.salto_pendiente = None
+            self.repeticiones_salto = 0
+
+        # Filtro one-euro en cents: el corte crece con la velocidad suavizada del pitch
+        velocidad = diferencia / self.periodo
+        self.velocidad += self._alfa(self.corte_derivada) * (velocidad - self.velocidad)
+        corte = self.corte_minimo + self.beta * abs(self.velocidad)
+        self.cents += self._alfa(corte) * diferencia
+        return self._frecuencia()
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import math
+import struct
+import time
+
+import numpy as np
+
+
+# Cabecera binaria: secuencia, tiempo, frecuencia, referencia, cents, estado, nota, bins de espectro
+FORMATO_CABECERA = '<IdfffB4sH'
+TAMANIO_CABECERA = struct.calcsize(FORMATO_CABECERA)
+CODIGOS_ESTADO = {'afinado': 0, 'cerca': 1, 'desafinado': 2, 'sin_audio': 3}
+ESTADOS_POR_CODIGO = {codigo: estado for estado, codigo in CODIGOS_ESTADO.items()}
+
+
+def reducir_espectro(frecuencias, magnitudes, bins):
+    """Reduce el espectro a `bins` valores tomando el máximo de cada grupo contiguo."""
+    if frecuencias is None or magnitudes is None or len(magnitudes) == 0 or bins <= 0:
+        return None
+    inicios = np.linspace(0, len(magnitudes), min(bins, len(magnitudes)), endpoint=False).astype(np.intp)
+    return np.maximum.reduceat(magnitudes, inicios)
+
+
+def codificar_json(secuencia, tiempo, info, espectro=None):
+    """Trama JSON de una línea (terminada en salto de línea)."""
+    trama = {
+        'secuencia': secuencia,
+        'tiempo': round(tiempo, 4),
+        'nota': info['nota'],
+        'frecuencia': info['frecuencia_detectada'],
+        'referencia': info['frecuencia_referencia'],
+        'cents': round(float(info['cents']), 2),
+        'estado': info['estado'],
+    }
+    if espectro is not None:
+        trama['espectro'] = np.round(espectro, 4).tolist()
+    return (json.dumps(trama, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def codificar_binario(secuencia, tiempo, info, espectro=None):
+    """Trama binaria con prefijo de longitud (uint32) y espectro en float16."""
+    frecuencia = info['frecuencia_detectada']
+    referencia = info['frecuencia_referencia']
+    nota = (info['nota'] or '').encode('ascii')[:4]
+    bins = 0 if espectro is None else len(espectro)
+    cuerpo = struct.pack(
+        FORMATO_CABECERA, secuencia & 0xFFFFFFFF, tiempo,
+        math.nan if frecuencia is None else frecuencia,
+        math.nan if referencia is None else referencia,
+        float(info['cents']), CODIGOS_ESTADO.get(info['estado'], 3), nota, bins
+    )
+    if bins:
+        cuerpo += np.asarray(espectro, dtype='<f2').tobytes()
+    return struct.pack('<I', len(cuerpo)) + cuerpo
+
+
+def decodificar_binario(cuerpo):
+    """Decodifica el cuerpo de una trama binaria (sin el prefijo de longitud)."""
+    secuencia, tiempo, frecuencia, referencia, cents, estado, nota, bins = struct.unpack_from(
+        FORMATO_CABECERA, cuerpo
+    )
+    espectro = np.frombuffer(cuerpo, dtype='<f2', count=bins, offset=TAMANIO_CABECERA) if bins else None
+    return {
+        'secuencia': secuencia,
+        'tiempo': tiempo,
+        'nota': nota.rstrip(b'\0').decode('ascii') or None,
+        'frecuencia': None if math.isnan(frecuencia) else frecuencia,
+        'referencia': None if math.isnan(referencia) else referencia,
+        'cents': cents,
+        'estado': ESTADOS_POR_CODIGO.get(estado, 'sin_audio'),
+        'espectro': espectro,
+    }
+
+
+class ClienteAfinacion:
+    """Conexión de un cliente con una ranura de una sola trama pendiente.
+
+    Si el cliente no alcanza a leer, la trama pendiente se reemplaza por la
+    más nueva en lugar de encolarse: cada cliente recibe siempre el estado más
+    reciente y uno lento no retrasa a los demás.
+    """
+
+    def __init__(self, escritor):
+        self.escritor = escritor
+        self.pendiente = None
+        self.hay_pendiente = asyncio.Event()
+        self.enviadas = 0
+        self.descartadas = 0
+
+    def entregar(self, trama):
+        """Deja la trama para enviar, descartando la anterior si no se envió."""
+        if self.pendiente is not None:
+            self.descartadas += 1
+        self.pendiente = trama
+        self.hay_pendiente.set()
+
+    async def enviar(self):
+        """Envía las tramas pendientes hasta que el cliente se desconecte."""
+        try:
+            while True:
+                await self.hay_pendiente.wait()
+                self.hay_pendiente.clear()
+                trama, self.pendiente = self.pendiente, None
+                self.escritor.write(trama)
+                # Mientras el socket está lleno, las tramas nuevas reemplazan a la pendiente
+                await self.escritor.drain()
+                self.enviadas += 1
+        except ConnectionError:
+            pass
+
+
+class ServidorAfinacion:
+    """Servidor asyncio que difunde las tramas de afinación a clientes locales.
+
+    El análisis sigue corriendo en el hilo de MotorAnalisis; cada resultado
+    publicado se serializa una sola vez y se entrega a todos los clientes
+    conectados por TCP o por socket Unix.
+    """
+
+    def __init__(self, formato='json', bins_espectro=0, host='127.0.0.1', puerto=8765, ruta_unix=None):
+        """
+        Args:
+            formato: 'json' (una línea por trama) o 'binario' (prefijo de longitud)
+            bins_espectro: Valores de espectro por trama (0 = sin espectro)
+            host: Interfaz TCP de escucha
+            puerto: Puerto TCP (None para no abrir TCP)
+            ruta_unix: Ruta de un socket Unix adicional (opcional)
+        """
+        if formato not in ('json', 'binario'):
+            raise ValueError(f"Formato de trama desconocido: '{formato}'")
+        self.codificar = codificar_json if formato == 'json' else codificar_binario
+        self.formato = formato
+        self.bins_espectro = bins_espectro
+        self.host = host
+        self.puerto = puerto
+        self.ruta_unix = ruta_unix
+        self.clientes = set()
+        self.tramas_difundidas = 0
+        self._bucle = None
+        self._conexiones = set()
+
+    async def _atender(self, lector, escritor):
+        """Corrutina por conexión: envía tramas hasta que el cliente cierra."""
+        cliente = ClienteAfinacion(escritor)
+        self.clientes.add(cliente)
+        conexion = asyncio.current_task()
+        self._conexiones.add(conexion)
+        tarea_envio = asyncio.ensure_future(cliente.enviar())
+        try:
+            # El cliente no envía nada; leer solo sirve para detectar el cierre
+            await lector.read()
+        except ConnectionError:
+            pass
+        finally:
+            tarea_envio.cancel()
+            self.clientes.discard(cliente)
+            self._conexiones.discard(conexion)
+            escritor.close()
+
+    def publicar(self, secuencia, resultado):
+        """Punto de entrada desde el hilo de análisis (seguro entre hilos)."""
+        if self._bucle is not None:
+            self._bucle.call_soon_threadsafe(self._difundir, secuencia, resultado, time.time())
+
+    def _difundir(self, secuencia, resultado, tiempo):
+        if not self.clientes:
+            return
+        info, frecuencias, magnitudes = resultado if resultado is not None else (None, None, None)
+        if info is None:
+            info = {'nota': None, 'frecuencia_detectada': None, 'frecuencia_referencia': None,
+                    'cents': 0.0, 'estado': 'sin_audio'}
+        espectro = reducir_espectro(frecuencias, magnitudes, self.bins_espectro) if self.bins_espectro else None
+        trama = self.codificar(secuencia, tiempo, info, espectro)
+        for cliente in self.clientes:
+            cliente.entregar(trama)
+        self.tramas_difundidas += 1
+
+    async def ejecutar(self, detener=None):
+        """
+        Abre los sockets y atiende clientes hasta que se active `detener`.
+
+        Args:
+            detener: asyncio.Event opcional para terminar el servidor
+        """
+        self._bucle = asyncio.get_running_loop()
+        servidores = []
+        if self.puerto is not None:
+            servidores.append(await asyncio.start_server(self._atender, self.host, self.puerto))
+            print(f"Servidor de afinación en tcp://{self.host}:{self.puerto} ({self.formato})")
+        if self.ruta_unix is not None:
+            servidores.append(await asyncio.start_unix_server(self._atender, self.ruta_unix))
+            print(f"Servidor de afinación en unix:{self.ruta_unix} ({self.formato})")
+
+        detener = detener or asyncio.Event()
+        try:
+            await detener.wait()
+        finally:
+            self._bucle = None
+            # abort descarta lo pendiente: un cliente bloqueado no impide el cierre
+            for cliente in list(self.clientes):
+                cliente.escritor.transport.abort()
+            # Esperar a que cada conexión vea el cierre y termine limpiamente
+            await asyncio.gather(*self._conexiones, return_exceptions=True)
+            for servidor in servidores:
+                servidor.close()
+                await servidor.wait_closed()
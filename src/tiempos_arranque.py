@@ -0,0 +1,46 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TiemposArranque:
+    """Registra la duración de cada fase del arranque para detectar regresiones."""
+
+    def __init__(self, inicio=None):
+        """Crea el registro tomando como referencia el instante de inicio indicado."""
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.fases = {}
+        self._bloqueo = threading.Lock()
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide la duración del bloque y la guarda bajo el nombre de la fase."""
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - comienzo)
+
+    def registrar(self, nombre, duracion):
+        """Guarda la duración en segundos de una fase (puede llamarse desde otros hilos)."""
+        with self._bloqueo:
+            self.fases[nombre] = (duracion, time.perf_counter() - self.inicio)
+
+    def marcar(self, nombre):
+        """Registra un hito: tiempo transcurrido desde el inicio del programa."""
+        self.registrar(nombre, 0.0)
+
+    def reporte(self):
+        """Retorna un diccionario fase -> {'duracion_ms', 'fin_ms'} ordenado por finalizacion."""
+        with self._bloqueo:
+            fases = sorted(self.fases.items(), key=lambda item: item[1][1])
+        return {
+            nombre: {'duracion_ms': duracion * 1000.0, 'fin_ms': fin * 1000.0}
+            for nombre, (duracion, fin) in fases
+        }
+
+    def imprimir(self):
+        """Imprime el desglose de tiempos de arranque."""
+        print("Tiempos de arranque:")
+        for nombre, tiempos in self.reporte().items():
+            print(f"  {nombre:<20} {tiempos['duracion_ms']:8.1f} ms  (t = {tiempos['fin_ms']:.1f} ms)")